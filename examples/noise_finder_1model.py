@@ -33,8 +33,9 @@ FILTERS_2_FRADARS = [MultiplePeriodRadarsFilterCV,
                      MultiplePeriodRadarsFilterTA]
 
 # Initialization of our components:
-## Writer
+## Writer (the best values are written at once at the end)
 writer = CSVWriter()
+rows   = []
 ## Radars
 ## For 1&2 radars same data rate
 radar1 = Radar(x = -6000, y = 10000)
@@ -64,7 +65,7 @@ for filter in FILTERS_1_RADAR:
     noise_finder.launch_benchmark()
     best_value   = noise_finder.best_value()
     print(('Best value for '+ name +'-1Radar:{0}').format(best_value))
-    writer.write_row(name+'-1Radar',str(best_value))
+    rows.append((name+'-1Radar',str(best_value)))
 
 for filter in FILTERS_2_RADARS:
     name = filter.__name__[-2:]
@@ -74,7 +75,7 @@ for filter in FILTERS_2_RADARS:
     noise_finder.launch_benchmark()
     best_value   = noise_finder.best_value()
     print(('Best value for '+ name +'-2Radars:{0}').format(best_value))
-    writer.write_row(name+'-2Radars',str(best_value))
+    rows.append((name+'-2Radars',str(best_value)))
 
 for filter in FILTERS_2_FRADARS:
     name = filter.__name__[-2:]
@@ -84,4 +85,6 @@ for filter in FILTERS_2_FRADARS:
     noise_finder.launch_benchmark()
     best_value   = noise_finder.best_value()
     print(('Best value for '+ name +'-2PRadars:{0}').format(best_value))
-    writer.write_row(name+'-2PRadars',str(best_value))
+    rows.append((name+'-2PRadars',str(best_value)))
+
+writer.write_rows(rows)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 11:32:50 2026
+
+@author: qde
+"""
+
+import sys
+import argparse
+from fdia_simulation.benchmarks import load_scenarios, run_batch
+
+def main(argv = None):
+    '''
+    Command line of the headless runner: simulates the scenarios of JSON/YAML
+    files and writes their results.
+    '''
+    parser = argparse.ArgumentParser(prog = 'python -m fdia_simulation',
+                                     description = 'Runs FDIA simulation scenarios')
+    parser.add_argument('scenarios', nargs = '+',
+                        help = 'JSON or YAML files of scenarios')
+    parser.add_argument('-o', '--output', default = 'results/scenarios',
+                        help = 'Folder of the results (default: %(default)s)')
+    parser.add_argument('-w', '--workers', type = int, default = 1,
+                        help = 'Number of processes, 0 for one per CPU (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    scenarios = []
+    for path in args.scenarios:
+        scenarios += load_scenarios(path)
+    summaries = run_batch(scenarios, output_dir = args.output,
+                          nb_workers = args.workers or None)
+    for summary in summaries:
+        print(' '.join('{0}={1}'.format(key,value) for key,value in summary.items()))
+    print('{0} scenario(s) written in {1}'.format(len(summaries),args.output))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
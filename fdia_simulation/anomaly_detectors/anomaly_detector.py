@@ -6,7 +6,6 @@ Created on Mon Jun 17 11:06:32 2019
 """
 import numpy as np
 from abc         import ABC, abstractmethod
-from scipy.stats import chi2
 
 class AnomalyDetector(ABC):
     '''Abstract class defining the use of anomaly detectors. Designed to be a
@@ -70,6 +69,7 @@ class AnomalyDetector(ABC):
         error_rate: float
             Probability of a measurement to be an error. Default value of 5%.
         '''
+        from scipy.stats import chi2
         if error_rate is None:
             error_rate = self.error_rate
         threshold = chi2.ppf(1-error_rate,dim_z)
@@ -5,10 +5,8 @@ Created on Mon Jul 01 09:10:06 2019
 @author: qde
 """
 import numpy             as np
-import matplotlib.pyplot as plt
 from math                            import sqrt
 from pprint                          import pprint
-from scipy.stats                     import chi2
 from numpy.random                    import randn
 from filterpy.common                 import kinematic_kf
 from fdia_simulation.helpers         import plot_measurements
@@ -36,6 +34,7 @@ class EuclidianDetector(AnomalyDetector):
         return test_quantity
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
     # Example Kalman filter for a kinematic model
     kinematic_test_kf = kinematic_kf(dim=1,order=1,dt=1)
     x         = [0.,2.]
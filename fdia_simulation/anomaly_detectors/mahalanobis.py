@@ -5,7 +5,6 @@ Created on Fri Jun 28 09:10:02 2019
 @author: qde
 """
 import numpy             as np
-import matplotlib.pyplot as plt
 from math                              import sqrt
 from pprint                            import pprint
 from numpy.linalg                      import inv
@@ -59,6 +58,7 @@ class MahalanobisDetector(AnomalyDetector):
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
     # Example Kalman filter for a kinematic model
     kinematic_test_kf = kinematic_kf(dim=1,order=1,dt=1)
     x         = [0.,2.]
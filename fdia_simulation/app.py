@@ -5,493 +5,296 @@ Created on Wed Aug 21 11:44:23 2019
 @author: qde
 """
 
+import json
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk
-import numpy as np
-from fdia_simulation.models            import Radar, PeriodRadar, Track
-from fdia_simulation.filters           import  (RadarFilterCA, MultipleRadarsFilterCA, MultiplePeriodRadarsFilterCA,
-                                               RadarFilterCV, MultipleRadarsFilterCV, MultiplePeriodRadarsFilterCV,
-                                               RadarFilterCT, MultipleRadarsFilterCT, MultiplePeriodRadarsFilterCT,
-                                               RadarFilterTA, MultipleRadarsFilterTA, MultiplePeriodRadarsFilterTA,
-                                               RadarIMM)
-from fdia_simulation.attackers         import (Attacker,DOSAttacker,DriftAttacker, CumulativeDriftAttacker,
-                                               PeriodAttacker,DOSPeriodAttacker,DriftPeriodAttacker,CumulativeDriftPeriodAttacker)
-from fdia_simulation.benchmarks        import Benchmark
-from fdia_simulation.anomaly_detectors import MahalanobisDetector,EuclidianDetector
-
-# ==============================================================================
-# ================================ Window Generation ===========================
-window = tk.Tk()
-window.title("False Data Injection an Air Traffic Control Tower")
-window.geometry("650x500")
-
-# ==============================================================================
-# ============================= Frames Definitions =============================
-
-traj_frame   = tk.Frame(window,padx = 3, pady = 10)
-rad_frame    = tk.Frame(window,padx = 3, pady = 10)
-filt_frame   = tk.Frame(window,padx = 3, pady = 10)
-att_frame    = tk.Frame(window,padx = 3, pady = 10)
-launch_frame = tk.Frame(window,padx = 3, pady = 10)
-
-window.grid_rowconfigure(1, weight=1)
-window.grid_columnconfigure(0, weight=1)
-
-traj_frame.grid(row = 0, sticky="n")
-rad_frame.grid(row = 1, sticky="n")
-filt_frame.grid(row = 2, sticky="n")
-att_frame.grid(row = 3, sticky="n")
-launch_frame.grid(row = 4, sticky="n")
-
-# ==============================================================================
-# ============================== Trajectory Frame ==============================
-
-label_traj = tk.Label(traj_frame,text = "Trajectory")
-label_traj.grid(column = 0, row = 0)
-
-trajectories = [ "Take off", "Landing"]
-traj_combobox = ttk.Combobox(traj_frame,values = trajectories)
-traj_combobox.current(1)
-traj_combobox.grid(column = 0, row = 1)
-
-# ==============================================================================
-# =============================== Radar(s) Frame ===============================
-label_rad = tk.Label(rad_frame,text = "Radar(s)")
-label_rad.grid(column = 0, columnspan = 10,row = 0)
-
-# Radar type selection
-type_label = tk.Label(rad_frame,text = "Radar type:")
-type_label.grid(column = 3, row = 1)
-types = [ "Radar","PeriodRadar"]
-rad_combobox = ttk.Combobox(rad_frame,values = types)
-rad_combobox.current(0)
-rad_combobox.grid(column = 4, row = 1)
-
-std_var = tk.IntVar()
-prec_var = tk.IntVar()
-std_var.set(1)
-prec_var.set(1)
-# Radar Selection
-std_rad_check  = tk.Checkbutton(rad_frame, text="Standard",variable = std_var)
-std_rad_check.grid(column = 0, row = 2)
-std_rad_x_label = tk.Label(rad_frame,text = "x: ")
-std_rad_x_label.grid(column = 1, row = 2)
-std_rad_x_entry = tk.Entry(rad_frame)
-std_rad_x_entry.insert("end","-6000")
-std_rad_x_entry.grid(column = 2, row = 2)
-std_rad_y_label = tk.Label(rad_frame,text = "y: ")
-std_rad_y_label.grid(column = 3, row = 2)
-std_rad_y_entry = tk.Entry(rad_frame)
-std_rad_y_entry.insert("end","1000")
-std_rad_y_entry.grid(column = 4, row = 2)
-std_rad_dt_label = tk.Label(rad_frame,text = "dt: ")
-std_rad_dt_label.grid(column = 5, row = 2)
-std_rad_dt_entry = tk.Entry(rad_frame)
-std_rad_dt_entry.insert("end","0.2")
-std_rad_dt_entry.grid(column = 6, row = 2)
-
-
-
-prec_rad_check = tk.Checkbutton(rad_frame, text="Precision",variable = prec_var)
-prec_rad_check.grid(column = 0, row = 3)
-prec_rad_x_label = tk.Label(rad_frame,text = "x: ")
-prec_rad_x_label.grid(column = 1, row = 3)
-prec_rad_x_entry = tk.Entry(rad_frame)
-prec_rad_x_entry.insert("end","1000")
-prec_rad_x_entry.grid(column = 2, row = 3)
-prec_rad_y_label = tk.Label(rad_frame,text = "y: ")
-prec_rad_y_label.grid(column = 3, row = 3)
-prec_rad_y_entry = tk.Entry(rad_frame)
-prec_rad_y_entry.insert("end","4000")
-prec_rad_y_entry.grid(column = 4, row = 3)
-prec_rad_dt_label = tk.Label(rad_frame,text = "dt: ")
-prec_rad_dt_label.grid(column = 5, row = 3)
-prec_rad_dt_entry = tk.Entry(rad_frame)
-prec_rad_dt_entry.insert("end","0.05")
-prec_rad_dt_entry.grid(column = 6, row = 3)
-
-
-# ==============================================================================
-# ================================ Filter Frame ================================
-
-label_filter = tk.Label(filt_frame,text = "Filters")
-label_filter.grid(column = 2, row = 0)
-
-ca_var = tk.IntVar()
-cv_var = tk.IntVar()
-ct_var = tk.IntVar()
-ta_var = tk.IntVar()
-ca_var.set(1)
-cv_var.set(1)
-ct_var.set(1)
-ta_var.set(1)
-
-detec_models = [ "None", "Mahalanobis", "Euclidian"]
-
-##### Constant Velocity filter
-cv_check  = tk.Checkbutton(filt_frame, text="Constant Velocity", variable = cv_var)
-cv_check.grid(column = 0, row = 1)
-# q selection: Label + Entry
-pn_cv_label = tk.Label(filt_frame,text = "Process noise: ")
-pn_cv_label.grid(column = 1, row = 1)
-pn_cv_entry = tk.Entry(filt_frame)
-pn_cv_entry.insert("end","10")
-pn_cv_entry.grid(column = 2, row = 1)
-# Detector selection : Label + Combobox
-cv_detec_label = tk.Label(filt_frame,text = "Detector model: ")
-cv_detec_label.grid(column = 3, row = 1)
-cv_detec_combobox = ttk.Combobox(filt_frame,values = detec_models)
-cv_detec_combobox.current(0)
-cv_detec_combobox.grid(column = 4, row = 1)
-
-##### Constant Acceleration filter
-ca_check  = tk.Checkbutton(filt_frame, text="Constant Acceleration", variable = ca_var)
-ca_check.grid(column = 0, row = 2)
-# q selection: Label + Entry
-pn_ca_label = tk.Label(filt_frame,text = "Process noise: ")
-pn_ca_label.grid(column = 1, row = 2)
-pn_ca_entry = tk.Entry(filt_frame)
-pn_ca_entry.insert("end","400")
-pn_ca_entry.grid(column = 2, row = 2)
-# Detector selection : Label + Combobox
-ca_detec_label = tk.Label(filt_frame,text = "Detector model: ")
-ca_detec_label.grid(column = 3, row = 2)
-ca_detec_combobox = ttk.Combobox(filt_frame,values = detec_models)
-ca_detec_combobox.current(0)
-ca_detec_combobox.grid(column = 4, row = 2)
-
-##### Constant Turn filter
-ct_check  = tk.Checkbutton(filt_frame, text="Constant Turn", variable = ct_var)
-ct_check.grid(column = 0, row = 3)
-# q selection: Label + Entry
-pn_ct_label = tk.Label(filt_frame,text = "Process noise: ")
-pn_ct_label.grid(column = 1, row = 3)
-pn_ct_entry = tk.Entry(filt_frame)
-pn_ct_entry.insert("end","25")
-pn_ct_entry.grid(column = 2, row = 3)
-# Detector selection : Label + Combobox
-ct_detec_label = tk.Label(filt_frame,text = "Detector model: ")
-ct_detec_label.grid(column = 3, row = 3)
-ct_detec_combobox = ttk.Combobox(filt_frame,values = detec_models)
-ct_detec_combobox.current(0)
-ct_detec_combobox.grid(column = 4, row = 3)
-
-##### Thrust Acceleration filter
-ta_check  = tk.Checkbutton(filt_frame, text="Thrust Acceleration", variable = ta_var)
-ta_check.grid(column = 0, row = 4)
-# q selection: Label + Entry
-pn_ta_label = tk.Label(filt_frame,text = "Process noise: ")
-pn_ta_label.grid(column = 1, row = 4)
-pn_ta_entry = tk.Entry(filt_frame)
-pn_ta_entry.insert("end","350")
-pn_ta_entry.grid(column = 2, row = 4)
-# Detector selection : Label + Combobox
-ta_detec_label = tk.Label(filt_frame,text = "Detector model: ")
-ta_detec_label.grid(column = 3, row = 4)
-ta_detec_combobox = ttk.Combobox(filt_frame,values = detec_models)
-ta_detec_combobox.current(0)
-ta_detec_combobox.grid(column = 4, row = 4)
-
-
-
-
-
-# ==============================================================================
-# =============================== Attacker Frame ===============================
-
-label_att = tk.Label(att_frame,text = "Attacker")
-label_att.grid(column = 0, columnspan = 10, row = 0)
-
-label_att_type = tk.Label(att_frame,text = "Attacker Type:")
-label_att_type.grid(column = 0, row = 1)
-att_models = [ "None","DOS", "Constant Drift", "Cumulative Drift"]
-att_combobox = ttk.Combobox(att_frame,values = att_models)
-att_combobox.current(3)
-att_combobox.grid(column = 0, row = 2)
-
-label_type = tk.Label(att_frame,text = "Attacked Radar:")
-label_type.grid(column = 1, row = 1)
-rad_models = [ "Standard", "Precision"]
-att_rad_combobox = ttk.Combobox(att_frame,values = rad_models)
-att_rad_combobox.current(0)
-att_rad_combobox.grid(column = 1, row = 2)
-
-# Attaker t0 label & entry
-t0_label = tk.Label(att_frame,text = "t0:")
-t0_label.grid(column = 2, row = 1)
-t0_entry = tk.Entry(att_frame, width = 20)
-t0_entry.insert("end","300")
-t0_entry.grid(column = 3, row = 1)
-# New radar y label & entry
-time_label = tk.Label(att_frame,text = "time:")
-time_label.grid(column = 2, row = 2)
-time_entry = tk.Entry(att_frame, width = 20)
-time_entry.insert("end","500")
-time_entry.grid(column = 3, row = 2)
-# New radar dt label & entry
-drift_label = tk.Label(att_frame,text = "drift:")
-drift_label.grid(column = 2, row = 3)
-drift_entry = tk.Entry(att_frame, width = 20)
-drift_entry.insert("end","0 0 1")
-drift_entry.grid(column = 3, row = 3)
-
-
-# ==============================================================================
-# ============================== Launching Frame ===============================
-#Dictionaries initialization
-
-# Current radar button config
-def prepare_launch_benchmark():
-    refresh_globals()
-    generate_dicts()
-    trajectory = traj_combobox.get()
-    generate_states(trajectory)
-    radar_type = rad_combobox.get()
-    generate_radars(radar_type)
-    generate_filters(radar_type)
-    generate_attacker(radar_type)
-    with_nees =  nees_var.get()
-    launch_benchmark(with_nees)
-
-nees_var = tk.IntVar()
-nees_check = tk.Checkbutton(launch_frame, text="Normalized Estimated Error Squared", variable = nees_var)
-nees_check.grid(column = 0, row = 0)
-
-launch_button = tk.Button(launch_frame,text = "Launch Benchmark!",command = prepare_launch_benchmark)
-launch_button.grid(column = 0, row = 1)
-
-
-##### Values needed by the benchmark
-
-std_dict  = {}
-prec_dict = {}
-ca_dict   = {}
-ct_dict   = {}
-ta_dict   = {}
-cv_dict   = {}
-att_dict  = {}
-states = []
-radars = []
-filter = None
-filters = []
-attacker = None
-x0,y0,z0 = 0,0,0
-
-def refresh_globals():
-    global std_dict,prec_dict,ca_dict,ct_dict,ta_dict,cv_dict,att_dict
-    global states,radars,filter,filters,attacker,x0,y0,z0
-    std_dict  = {}
-    prec_dict = {}
-    ca_dict   = {}
-    ct_dict   = {}
-    ta_dict   = {}
-    cv_dict   = {}
-    att_dict  = {}
-    states = []
-    radars = []
-    filter = None
-    filters = []
-    attacker = None
-    x0,y0,z0 = 0,0,0
-
-
-def generate_dicts():
-    # Radars dictionaries
-    global std_dict
-    std_dict = {
-        "is_chosen":std_var.get(),
-        "x":std_rad_x_entry.get(),
-        "y":std_rad_y_entry.get(),
-        "dt":std_rad_dt_entry.get()
-    }
-    global prec_dict
-    prec_dict = {
-        "is_chosen":prec_var.get(),
-        "x":prec_rad_x_entry.get(),
-        "y":prec_rad_y_entry.get(),
-        "dt":prec_rad_dt_entry.get()
-    }
-    # Filters dictionaries
-    global ca_dict
-    ca_dict = {
-        "is_chosen": ca_var.get(),
-        "q": pn_ca_entry.get(),
-        "detector": ca_detec_combobox.get(),
-        "name":RadarFilterCA,
-        "mname":MultipleRadarsFilterCA,
-        "mpname":MultiplePeriodRadarsFilterCA
-    }
-    global cv_dict
-    cv_dict = {
-        "is_chosen": cv_var.get(),
-        "q": pn_cv_entry.get(),
-        "detector": cv_detec_combobox.get(),
-        "name":RadarFilterCV,
-        "mname":MultipleRadarsFilterCV,
-        "mpname":MultiplePeriodRadarsFilterCV
-    }
-    global ct_dict
-    ct_dict = {
-        "is_chosen": ct_var.get(),
-        "q": pn_ct_entry.get(),
-        "detector": ct_detec_combobox.get(),
-        "name":RadarFilterCT,
-        "mname":MultipleRadarsFilterCT,
-        "mpname":MultiplePeriodRadarsFilterCT
-    }
-    global ta_dict
-    ta_dict = {
-        "is_chosen": ta_var.get(),
-        "q": pn_ta_entry.get(),
-        "detector": ta_detec_combobox.get(),
-        "name":RadarFilterTA,
-        "mname":MultipleRadarsFilterTA,
-        "mpname":MultiplePeriodRadarsFilterTA
-    }
-    # Attacker dictionary
-    global att_dict
-    att_dict = {
-        "type": att_combobox.get(),
-        "att_radar": att_rad_combobox.get(),
-        "t0": t0_entry.get(),
-        "time": time_entry.get(),
-        "drift": drift_entry.get()
-    }
-#### Benchmark useful values
-
-def generate_states(traj_name):
-    global states, x0, y0, z0
-    trajectory = Track()
-    method_name = getattr(trajectory,"gen_"+ traj_name.replace(" ","").lower())
-    states = method_name()
-    x0, y0, z0 = trajectory.initial_position(states)
-
-def generate_radars(radar_type):
-    global std_dict
-    global prec_dict
-    global radars
-    if radar_type == "Radar":
-        if std_dict["is_chosen"]:
-            x = int(std_dict["x"])
-            y = int(std_dict["y"])
-            std_radar = Radar(x = x, y = y, r_std = 5., theta_std = 0.005, phi_std = 0.005)
-            radars.append(std_radar)
-        if prec_dict["is_chosen"]:
-            x = int(prec_dict["x"])
-            y = int(prec_dict["y"])
-            prec_radar = Radar(x = x, y = y)
-            radars.append(prec_radar)
-
-    elif radar_type == "PeriodRadar":
-        if std_dict["is_chosen"]:
-            x = int(std_dict["x"])
-            y = int(std_dict["y"])
-            dt = float(std_dict["dt"])
-            std_radar = PeriodRadar(x = x, y = y, r_std = 5., theta_std = 0.005,
-                                    phi_std = 0.005, dt = dt)
-            radars.append(std_radar)
-        if prec_dict["is_chosen"]:
-            x = int(prec_dict["x"])
-            y = int(prec_dict["y"])
-            dt = float(prec_dict["dt"])
-            prec_radar = PeriodRadar(x = x, y = y, dt = dt)
-            radars.append(prec_radar)
-
-def generate_filters(radar_type):
-    global ca_dict, cv_dict, ct_dict, ta_dict, filter, filters, radars, x0, y0, z0
-    filter_dicts = [cv_dict, ca_dict, ct_dict, ta_dict]
-    current_filters = []
-    for filter_dict in filter_dicts:
-        if filter_dict["is_chosen"]:
-            current_filters.append(filter_dict)
-    # Filter instanciation
-    for filter_dict in current_filters:
-        detector = None
-        if not(filter_dict["detector"] == "None"):
-            detector_type = globals()[filter_dict["detector"]+"Detector"]
-            detector = detector_type()
-        q = float(filter_dict["q"])
-        if radar_type == "Radar" and len(radars)==1:
-            filter_class = filter_dict["name"]
-        elif radar_type == "Radar" and len(radars)==2:
-            filter_class = filter_dict["mname"]
-        elif radar_type == "PeriodRadar" and len(radars)==2:
-            filter_class = filter_dict["mpname"]
-        current_filter = filter_class(radars = radars, q = q, detector = detector,
-                                      x0 = x0, y0 = y0, z0 = z0)
-        filters.append(current_filter)
-
-    # IMM Generation
-    if len(filters)==1:
-        filter = filters[0]
-    if len(filters)==2:
-        mu = [0.5, 0.5]
-        trans = np.array([[0.998, 0.02],
-                          [0.100, 0.900]])
-        filter = RadarIMM(filters, mu, trans)
-    if len(filters)==3:
-        mu = [0.33, 0.33, 0.33]
-        trans = np.array([[0.998, 0.001, 0.001],
-                          [0.050, 0.900, 0.050],
-                          [0.001, 0.001, 0.998]])
-        filter = RadarIMM(filters, mu, trans)
-    if len(filters)==4:
-        mu = [0.25, 0.25, 0.25, 0.25]
-        trans = np.array([[0.997, 0.001, 0.001, 0.001],
-                          [0.050, 0.850, 0.050, 0.050],
-                          [0.001, 0.001, 0.997, 0.001],
-                          [0.001, 0.001, 0.001, 0.997]])
-        filter = RadarIMM(filters, mu, trans)
-
-def generate_attacker(radar_type):
-    global att_dict, filter, attacker, radars
-    # T0 argument
-    t0 = int(att_dict["t0"])
-    # Time argument
-    time = int(att_dict["time"])
-    # Drift argument
-    drift = att_dict["drift"].split(" ")
-    attack_drift = np.array([[int(drift[0]),int(drift[1]),int(drift[2])]]).T
-    if att_dict["att_radar"] == "Standard":
-        attacked_radar = radars[0]
-        radar_position = 0
-    if att_dict["att_radar"] == "Precision":
-        attacked_radar = radars[1]
-        radar_position = 1
-
-    # Attacker class
-    attacker = None
-    if radar_type == "Radar":
-        if att_dict["type"] == "DOS":
-            attacker = DOSAttacker(filter = filter, t0 = t0, time = time,
-                                   radar = attacked_radar, radar_pos = radar_position)
-        elif att_dict["type"] == "Constant Drift":
-            attacker = DriftAttacker(filter = filter, t0 = t0, time = time,
-                                     attack_drift = attack_drift,
-                                     radar = attacked_radar, radar_pos = radar_position)
-        elif att_dict["type"] == "Cumulative Drift":
-            attacker = CumulativeDriftAttacker(filter = filter, t0 = t0, time = time,
-                                               delta_drift = attack_drift,
-                                               radar = attacked_radar, radar_pos = radar_position)
-    if radar_type == "PeriodRadar":
-        if att_dict["type"] == "DOS":
-            attacker = DOSPeriodAttacker(filter = filter, t0 = t0, time = time,
-                                         radar = attacked_radar, radar_pos = radar_position)
-        elif att_dict["type"] == "Constant Drift":
-            attacker = DriftPeriodAttacker(filter = filter, t0 = t0, time = time,
-                                           attack_drift = attack_drift,
-                                           radar = attacked_radar, radar_pos = radar_position)
-        elif att_dict["type"] == "Cumulative Drift":
-            attacker = CumulativeDriftPeriodAttacker(filter = filter, t0 = t0, time = time,
-                                                     delta_drift = attack_drift,
-                                                     radar = attacked_radar, radar_pos = radar_position)
-
-
-def launch_benchmark(with_nees):
-    global radars, filter, attacker, states
-    benchmark = Benchmark(radars = radars,radar_filter = filter,
-                          states = states, attacker = attacker)
-    benchmark.launch_benchmark(with_nees = with_nees)
-
-## Main loop
-window.mainloop()
+from tkinter import ttk, filedialog
+from fdia_simulation.benchmarks import DEFAULT_SCENARIO, ProgressMonitor, simulate_scenario
+
+class ScenarioApp(object):
+    '''
+    Implements the graphical front-end of the scenario runner: the widgets
+    describe a scenario (see complete_scenario()) that is simulated or saved
+    as a JSON file for the command line runner (python -m fdia_simulation).
+    The simulation runs in a background thread: its progress is sent through
+    a queue polled by the Tk loop and it can be cancelled.
+    Parameters
+    ----------
+    window: tk.Tk
+        Main window of the application.
+    '''
+
+    # Delay between two polls of the progress queue (ms)
+    POLL_DELAY = 100
+
+    TRAJECTORIES = ["Take off", "Landing"]
+    RADAR_TYPES  = ["Radar", "PeriodRadar"]
+    DETECTORS    = ["None", "Mahalanobis", "Euclidian"]
+    ATTACKERS    = ["None", "DOS", "Constant Drift", "Cumulative Drift"]
+    # Radars of the application: name, parameters, default values
+    RADARS  = [("Standard",  {'r_std': 5., 'theta_std': 0.005, 'phi_std': 0.005}, DEFAULT_SCENARIO['radars'][0]),
+               ("Precision", {}, DEFAULT_SCENARIO['radars'][1])]
+    FILTERS = [("Constant Velocity",     DEFAULT_SCENARIO['filters'][0]),
+               ("Constant Acceleration", DEFAULT_SCENARIO['filters'][1]),
+               ("Constant Turn",         DEFAULT_SCENARIO['filters'][2]),
+               ("Thrust Acceleration",   DEFAULT_SCENARIO['filters'][3])]
+
+    def __init__(self,window):
+        self.window   = window
+        self.worker   = None
+        self.monitor  = None
+        self.messages = queue.Queue()
+        window.title("False Data Injection an Air Traffic Control Tower")
+        window.geometry("650x500")
+        window.grid_rowconfigure(1, weight=1)
+        window.grid_columnconfigure(0, weight=1)
+        frames = [tk.Frame(window,padx = 3, pady = 10) for _ in range(5)]
+        for row,frame in enumerate(frames):
+            frame.grid(row = row, sticky="n")
+        traj_frame, rad_frame, filt_frame, att_frame, launch_frame = frames
+        self.build_trajectory_frame(traj_frame)
+        self.build_radars_frame(rad_frame)
+        self.build_filters_frame(filt_frame)
+        self.build_attacker_frame(att_frame)
+        self.build_launch_frame(launch_frame)
+
+    # ==========================================================================
+    # ============================== Widgets ===================================
+
+    @staticmethod
+    def add_entry(frame,text,value,column,row,width = None):
+        '''
+        Adds a label and its entry (filled with a value) to a frame.
+        '''
+        tk.Label(frame,text = text).grid(column = column, row = row)
+        entry = tk.Entry(frame) if width is None else tk.Entry(frame,width = width)
+        entry.insert("end",str(value))
+        entry.grid(column = column + 1, row = row)
+        return entry
+
+    @staticmethod
+    def add_combobox(frame,values,current,column,row):
+        combobox = ttk.Combobox(frame,values = values)
+        combobox.current(current)
+        combobox.grid(column = column, row = row)
+        return combobox
+
+    def build_trajectory_frame(self,frame):
+        tk.Label(frame,text = "Trajectory").grid(column = 0, row = 0)
+        self.traj_combobox = self.add_combobox(frame,self.TRAJECTORIES,1,0,1)
+
+    def build_radars_frame(self,frame):
+        tk.Label(frame,text = "Radar(s)").grid(column = 0, columnspan = 10,row = 0)
+        tk.Label(frame,text = "Radar type:").grid(column = 3, row = 1)
+        self.rad_combobox = self.add_combobox(frame,self.RADAR_TYPES,0,4,1)
+        self.radar_widgets = []
+        for row,(name,_,defaults) in enumerate(self.RADARS,2):
+            chosen = tk.IntVar()
+            chosen.set(1)
+            tk.Checkbutton(frame, text = name, variable = chosen).grid(column = 0, row = row)
+            self.radar_widgets.append({"is_chosen": chosen,
+                                       "x" : self.add_entry(frame,"x: ",defaults['x'],1,row),
+                                       "y" : self.add_entry(frame,"y: ",defaults['y'],3,row),
+                                       "dt": self.add_entry(frame,"dt: ",defaults['dt'],5,row)})
+
+    def build_filters_frame(self,frame):
+        tk.Label(frame,text = "Filters").grid(column = 2, row = 0)
+        self.filter_widgets = []
+        for row,(name,defaults) in enumerate(self.FILTERS,1):
+            chosen = tk.IntVar()
+            chosen.set(1)
+            tk.Checkbutton(frame, text = name, variable = chosen).grid(column = 0, row = row)
+            q_entry = self.add_entry(frame,"Process noise: ",int(defaults['q']),1,row)
+            tk.Label(frame,text = "Detector model: ").grid(column = 3, row = row)
+            detector_combobox = self.add_combobox(frame,self.DETECTORS,0,4,row)
+            self.filter_widgets.append({"is_chosen": chosen, "model": defaults['model'],
+                                        "q": q_entry, "detector": detector_combobox})
+
+    def build_attacker_frame(self,frame):
+        defaults = DEFAULT_SCENARIO['attacker']
+        tk.Label(frame,text = "Attacker").grid(column = 0, columnspan = 10, row = 0)
+        tk.Label(frame,text = "Attacker Type:").grid(column = 0, row = 1)
+        self.att_combobox = self.add_combobox(frame,self.ATTACKERS,self.ATTACKERS.index(defaults['type']),0,2)
+        tk.Label(frame,text = "Attacked Radar:").grid(column = 1, row = 1)
+        self.att_rad_combobox = self.add_combobox(frame,[name for name,_,_ in self.RADARS],defaults['radar'],1,2)
+        self.t0_entry    = self.add_entry(frame,"t0:",defaults['t0'],2,1,width = 20)
+        self.time_entry  = self.add_entry(frame,"time:",defaults['time'],2,2,width = 20)
+        self.drift_entry = self.add_entry(frame,"drift:",' '.join(str(value) for value in defaults['drift']),
+                                          2,3,width = 20)
+
+    def build_launch_frame(self,frame):
+        self.nees_var = tk.IntVar()
+        tk.Checkbutton(frame, text="Normalized Estimated Error Squared",
+                       variable = self.nees_var).grid(column = 0, row = 0)
+        self.launch_button = tk.Button(frame,text = "Launch Benchmark!",command = self.launch)
+        self.launch_button.grid(column = 0, row = 1)
+        self.cancel_button = tk.Button(frame,text = "Cancel",command = self.cancel,state = "disabled")
+        self.cancel_button.grid(column = 1, row = 1)
+        tk.Button(frame,text = "Save scenario",command = self.save).grid(column = 2, row = 1)
+        self.progressbar = ttk.Progressbar(frame,length = 300,mode = "determinate")
+        self.progressbar.grid(column = 0, columnspan = 3, row = 2)
+        self.status_label = tk.Label(frame,text = "")
+        self.status_label.grid(column = 0, columnspan = 3, row = 3)
+
+    # ==========================================================================
+    # ============================== Scenario ==================================
+
+    def gather_scenario(self):
+        '''
+        Reads the scenario described by the widgets.
+        Returns
+        -------
+        scenario: dictionary
+            Scenario (see complete_scenario()).
+
+        Raises
+        ------
+        ValueError
+            If an entry is not a number or the drift does not have 3 values.
+        '''
+        radar_type = self.rad_combobox.get()
+        radars, positions = [], {}
+        for (name,parameters,_),widgets in zip(self.RADARS,self.radar_widgets):
+            if widgets["is_chosen"].get():
+                positions[name] = len(radars)
+                radars.append(dict(parameters, x = int(widgets["x"].get()), y = int(widgets["y"].get()),
+                                   dt = float(widgets["dt"].get())))
+        filters = [{"model": widgets["model"], "q": float(widgets["q"].get()),
+                    "detector": widgets["detector"].get()}
+                   for widgets in self.filter_widgets if widgets["is_chosen"].get()]
+        attacker = None
+        attacked_radar = self.att_rad_combobox.get()
+        if self.att_combobox.get() != "None" and attacked_radar in positions:
+            drift = [float(value) for value in self.drift_entry.get().split()]
+            if len(drift) != 3:
+                raise ValueError("the drift needs 3 values (x y z)")
+            attacker = {"type" : self.att_combobox.get(),
+                        "radar": positions[attacked_radar],
+                        "t0"   : int(self.t0_entry.get()),
+                        "time" : int(self.time_entry.get()),
+                        "drift": drift}
+        return {"name"      : self.traj_combobox.get().replace(" ","").lower(),
+                "trajectory": self.traj_combobox.get(),
+                "radar_type": radar_type,
+                "radars"    : radars,
+                "filters"   : filters,
+                "attacker"  : attacker,
+                "with_nees" : bool(self.nees_var.get())}
+
+    # ==========================================================================
+    # =========================== Background worker ============================
+
+    def launch(self):
+        '''
+        Starts the simulation of the scenario in a background thread.
+        '''
+        if not(self.worker is None):
+            return
+        try:
+            scenario = self.gather_scenario()
+        except ValueError as error:
+            self.status_label.config(text = "Invalid entry: {0}".format(error))
+            return
+        self.monitor = ProgressMonitor(callback = lambda progress: self.messages.put(('progress',progress)))
+        self.worker  = threading.Thread(target = self.work, args = (scenario,self.monitor), daemon = True)
+        self.launch_button.config(state = "disabled")
+        self.cancel_button.config(state = "normal")
+        self.progressbar["value"] = 0
+        self.status_label.config(text = "Generating the measurements...")
+        self.worker.start()
+        self.window.after(self.POLL_DELAY,self.poll)
+
+    def work(self,scenario,monitor):
+        '''
+        Body of the background thread: simulates the scenario and sends the
+        results (or the error) through the queue.
+        '''
+        try:
+            benchmark, summary = simulate_scenario(scenario, monitor = monitor)
+            self.messages.put(('done',(benchmark,summary)))
+        except Exception as error:
+            self.messages.put(('error',error))
+
+    def poll(self):
+        '''
+        Processes the messages of the background thread (called by the Tk
+        loop until the simulation ends).
+        '''
+        while True:
+            try:
+                kind, content = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.show_progress(content)
+            else:
+                self.finish(kind,content)
+                return
+        self.window.after(self.POLL_DELAY,self.poll)
+
+    def show_progress(self,progress):
+        '''
+        Displays the partial results of the simulation.
+        '''
+        self.progressbar["maximum"] = progress['nb_steps']
+        self.progressbar["value"]   = progress['step']
+        text = "Step {0}/{1} - NEES: {2:.2f} (mean: {3:.2f})".format(progress['step'],progress['nb_steps'],
+                                                                    progress['nees'],progress['nees_mean'])
+        if not(progress['position'] is None):
+            text += " - Position: ({0:.0f}, {1:.0f}, {2:.0f})".format(*progress['position'])
+        self.status_label.config(text = text)
+
+    def finish(self,kind,content):
+        '''
+        Ends a simulation: restores the buttons and plots the results if it
+        was neither cancelled nor aborted by the NEES monitor (diverging run).
+        '''
+        cancelled    = self.monitor.cancelled
+        self.worker  = None
+        self.monitor = None
+        self.launch_button.config(state = "normal")
+        self.cancel_button.config(state = "disabled")
+        if kind == 'error':
+            self.status_label.config(text = "Error: {0}".format(content))
+            return
+        benchmark, summary = content
+        if cancelled:
+            self.status_label.config(text = "Cancelled after {0} steps".format(summary['nb_steps']))
+            return
+        if summary['aborted']:
+            self.status_label.config(text = "Aborted (diverged) after {0} steps".format(summary['nb_steps']))
+            return
+        self.status_label.config(text = "Done: {0} steps, {1} anomalies, {2:.1f}s".format(
+            summary['nb_steps'],summary['anomalies'],summary['duration']))
+        benchmark.generate_plotting_labels()
+        benchmark.plot()
+
+    def cancel(self):
+        '''
+        Requests the cancellation of the running simulation.
+        '''
+        if not(self.monitor is None):
+            self.monitor.cancel()
+            self.status_label.config(text = "Cancelling...")
+
+    def save(self):
+        '''
+        Saves the scenario as a JSON file.
+        '''
+        try:
+            scenario = self.gather_scenario()
+        except ValueError as error:
+            self.status_label.config(text = "Invalid entry: {0}".format(error))
+            return
+        path = filedialog.asksaveasfilename(defaultextension = ".json",
+                                            filetypes = [("Scenario", "*.json")])
+        if path:
+            with open(path,'w') as scenario_file:
+                json.dump(scenario,scenario_file,indent = 2)
+
+
+if __name__ == "__main__":
+    window = tk.Tk()
+    app = ScenarioApp(window)
+    window.mainloop()
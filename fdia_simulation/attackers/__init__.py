@@ -8,6 +8,7 @@ Created on Wed Jul 17 11:17:53 2019
 from __future__ import absolute_import
 
 __all__ = ["mo_attacker",
+           "online_mo_attacker",
            "yang_attacker",
            "attacker_model",
            "attacker_types",
@@ -15,6 +16,7 @@ __all__ = ["mo_attacker",
            "period_attacker_types"]
 
 from .mo_attacker           import *
+from .online_mo_attacker    import *
 from .yang_attacker         import *
 from .attacker_model        import *
 from .attacker_types        import *
@@ -131,7 +131,8 @@ class Attacker(object):
         beginning_reached = self.t0 <= self.current_time
         end_reached       = (self.current_time - self.t0) >= self.time
         if beginning_reached and not(end_reached):
-            measurement = np.reshape(measurement,(-(self.dim_z-1),1))
+            # Copy: the measurement may belong to a shared measurement set
+            measurement = np.reshape(measurement,(-(self.dim_z-1),1)).copy()
             measurement = self.attack_measurement(measurement)
         self.current_time += 1
         return measurement
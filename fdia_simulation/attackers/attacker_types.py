@@ -48,22 +48,32 @@ class DriftAttacker(Attacker):
         self.radar_pos    = radar_pos
         Attacker.__init__(self,radar_pos = radar_pos,*args,**kwargs)
 
-    def attack_measurement(self, measurement):
+    def attack_measurement(self, measurement, attack_drift = None):
         '''
         Modifies the measurement following these three steps:
             - Computation of the position from the radar's measurements
             - Application of the attack_drift on the position.
             - Reconversion of the modified position in radar values.
+        Parameters
+        ----------
+        measurement: float numpy array (dim_z,n)
+            One or several column-stacked measurements.
+
+        attack_drift: float numpy array (3,1) or (3,n)
+            Drift to apply, one column per measurement if needed. Default value
+            is the attack_drift attribute.
         '''
+        if attack_drift is None:
+            attack_drift = self.attack_drift
         # Conversion of the radar values in the corresponding position
         r     = measurement[self.radar_pos*3    ,:]
         theta = measurement[self.radar_pos*3 + 1,:]
         phi   = measurement[self.radar_pos*3 + 2,:]
         x,y,z = self.radar.gen_position_vals(r,theta,phi)
-        position = np.reshape(np.array([[x,y,z]]),(-2,1))
+        position = np.vstack((x,y,z))
 
         # Applying the attack drift
-        modified_position = position + self.attack_drift
+        modified_position = position + attack_drift
         mod_x = modified_position[0,:]
         mod_y = modified_position[1,:]
         mod_z = modified_position[2,:]
@@ -101,13 +111,17 @@ class CumulativeDriftAttacker(DriftAttacker):
         with every step that goes by.
         Parameters
         ----------
-        measurement: float numpy array
-            Raw measurement coming from the attacked radar
+        measurement: float numpy array (dim_z,n)
+            Raw measurement(s) coming from the attacked radar, each column being
+            one step of the attack.
 
         Returns
         -------
         modified_measurement: float numpy array
             Compromised measurement (added the cumulative drift)
         '''
-        self.attack_drift += self.delta_drift
-        return DriftAttacker.attack_measurement(self,measurement)
+        nb_steps = np.shape(measurement)[1]
+        # One drift per column: attack_drift + delta_drift, + 2*delta_drift...
+        drifts = self.attack_drift + self.delta_drift*np.arange(1,nb_steps+1)
+        self.attack_drift = drifts[:,-1:]
+        return DriftAttacker.attack_measurement(self,measurement,attack_drift = drifts)
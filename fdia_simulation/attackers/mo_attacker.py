@@ -6,7 +6,8 @@ Created on Fri Jun 21 16:45:28 2019
 """
 
 import numpy as np
-from numpy.linalg              import inv, norm
+from itertools                 import combinations
+from numpy.linalg              import inv, norm, pinv
 from scipy.linalg              import solve_discrete_are,lstsq
 from numpy.random              import randn
 from filterpy.common           import pretty_str
@@ -39,6 +40,51 @@ class UnstableData(object):
             pretty_str('position', self.position)])
 
 
+class AttackCandidate(object):
+    '''Implements a model for storing one entry of the attack table: an
+    unstable direction attacked through a given subset of sensors.
+    Parameters
+    ----------
+    unst_data: UnstableData
+        Unstable eigenvalue, eigenvector and position of the direction.
+
+    Gamma: float numpy array
+        Attack matrix, diagonal matrix of the compromised sensors.
+
+    ya0, ya1: float numpy arrays
+        Two first elements of the attack sequence (before normalization).
+
+    residual: float
+        Relative residual of the least squares initialization. The attack is
+        feasible if this residual is null (the attacker can reach the direction).
+
+    M: float
+        Maximal norm of the attack sequence.
+
+    feasible: boolean
+        True if the residual is under the tolerance of the table.
+    '''
+    def __init__(self,unst_data,Gamma,ya0,ya1,residual,M,feasible):
+        self.unst_data = unst_data
+        self.Gamma     = Gamma
+        self.sensors   = tuple(np.flatnonzero(np.diag(Gamma)))
+        self.ya0       = ya0
+        self.ya1       = ya1
+        self.residual  = residual
+        self.M         = M
+        self.feasible  = feasible
+
+    def __repr__(self):
+        return '\n'.join([
+            'AttackCandidate object',
+            pretty_str('value', self.unst_data.value),
+            pretty_str('position', self.unst_data.position),
+            pretty_str('sensors', self.sensors),
+            pretty_str('residual', self.residual),
+            pretty_str('M', self.M),
+            pretty_str('feasible', self.feasible)])
+
+
 class MoAttacker(object):
     '''
     Implements an attack simulation based on the research article Mo et al.
@@ -59,13 +105,30 @@ class MoAttacker(object):
         Column-stacked array as np.array([[ y0 | y1 | ... | y_attsize ]])
         corresponding to the values the attacker will have to inject in the
         system to compromise it.
+
+    attack_table: AttackCandidate list
+        Ranked list of the possible attacks (see compute_attack_table()).
     '''
     def __init__(self,kf,fb = False):
         super().__init__()
         self.unst_data = []
         self.attack_sequence = np.zeros((kf.dim_z,0))
+        self.attack_table = []
         self.kf = kf
         self.fb = fb
+        # Last solution of the Riccati equation and the (F,H,Q,R) it solves
+        self._ss_P_key = None
+        self._ss_P     = None
+
+    def compute_H(self):
+        '''
+        Returns the measurement matrix of the attacked estimator.
+        Returns
+        -------
+        H: float numpy array
+            Measurement matrix.
+        '''
+        return self.kf.H
 
     def add_false_measurement(self,yai):
         '''
@@ -120,9 +183,14 @@ class MoAttacker(object):
         -----
         This function should be used if the system is equiped with some kind of
         feedback linearization.
+        The solution is kept and reused as long as F, H, Q and R are unchanged.
         '''
-        ss_P = solve_discrete_are(self.kf.F.T, self.kf.H.T, self.kf.Q, self.kf.R)
-        return ss_P
+        kf  = self.kf
+        key = tuple((np.shape(M), np.asarray(M).tobytes()) for M in (kf.F, kf.H, kf.Q, kf.R))
+        if key != self._ss_P_key:
+            self._ss_P     = solve_discrete_are(kf.F.T, kf.H.T, kf.Q, kf.R)
+            self._ss_P_key = key
+        return self._ss_P
 
     def compute_steady_state_K(self):
         '''
@@ -256,6 +324,53 @@ class MoAttacker(object):
         return attack_val,attack_vect,Gamma
 
 
+    def fill_attack_sequence(self, attack_size, ya0, ya1, attack_val, ystar, M):
+        '''
+        Computes the whole attack sequence from its two first elements.
+        Parameters
+        ----------
+        attack_size: int
+            Duration of the attack (number of steps).
+
+        ya0, ya1: float numpy arrays
+            Two first steps of the attack sequence (before normalization).
+
+        attack_val: float
+            Eigen value under which the attack is being made.
+
+        ystar: float numpy array
+            Measurement of the eigen vector under which the attack is being made.
+
+        M: float
+            Maximal norm of the attack sequence.
+
+        Returns
+        -------
+        attack_sequence: float numpy array
+            Column-stacked array as np.array([[ y0 | y1 | ... | y_attsize ]]).
+
+        Notes
+        -----
+        The recurrence y_i = y_(i-2) - attack_val^(i-2)/M * ystar is evaluated
+        in closed form: y_i = y_(i%2) - S_i/M * ystar where S_i is the sum of the
+        powers attack_val^j for j < i-1 and j of the same parity as i.
+        '''
+        attack_size = max(attack_size,2)
+        powers      = np.zeros(attack_size, dtype = np.result_type(attack_val,float))
+        powers[2:]  = attack_val**np.arange(attack_size-2)
+        # Sums of the powers for the even and odd parts of the sequence
+        sums        = np.empty_like(powers)
+        sums[0::2]  = np.cumsum(powers[0::2])
+        sums[1::2]  = np.cumsum(powers[1::2])
+
+        dtype = np.result_type(ya0, ya1, ystar, powers)
+        attack_sequence = np.empty((np.shape(ya0)[0],attack_size), dtype = dtype)
+        attack_sequence[:,0::2] = ya0/M
+        attack_sequence[:,1::2] = ya1/M
+        attack_sequence -= ystar/M * sums
+        self.attack_sequence = attack_sequence
+        return attack_sequence
+
     def compute_attack_sequence(self, attack_size, pos_value = 0, logs=False):
         '''
         Creates the attack sequence (aka the falsified measurements passed to the filter).
@@ -312,22 +427,122 @@ class MoAttacker(object):
         #2. Initialization of the first "real" measurements -> to determine the max norm
         M = self.compute_max_norm(Gamma,ya0,ya1)
 
-        ya0 = ya0/M
-        ya1 = ya1/M
-
-        self.add_false_measurement(ya0)
-        self.add_false_measurement(ya1)
-
         ystar = kf.H@attack_vect
-
-        for i in range(2,attack_size):
-            yai = self.attack_sequence[:,i-2].reshape((kf.dim_z,1)) - attack_val**(i-2)/M * ystar
-            self.add_false_measurement(yai)
+        self.fill_attack_sequence(attack_size, ya0, ya1, attack_val, ystar, M)
 
         if logs: print("Attack Sequence: \n{0}\n".format(self.attack_sequence))
 
         return self.attack_sequence, Gamma
 
+    def compute_sensor_subsets(self,group_size = 1,max_size = None):
+        '''
+        Generates the attack matrices of all the subsets of sensors.
+        Parameters
+        ----------
+        group_size: int
+            Number of consecutive measurements compromised together (3 to
+            consider whole radars [r,theta,phi]). Default value: 1.
+
+        max_size: int
+            Maximal number of compromised groups. Default value: all of them.
+
+        Returns
+        -------
+        Gammas: float numpy array (n_subsets,dim_z,dim_z)
+            Stacked diagonal attack matrices.
+        '''
+        dim_z    = self.kf.dim_z
+        nb_group = dim_z//group_size
+        if max_size is None:
+            max_size = nb_group
+        Gammas = []
+        for size in range(1,max_size+1):
+            for subset in combinations(range(nb_group),size):
+                diagonal = np.zeros(dim_z)
+                for group in subset:
+                    diagonal[group*group_size:(group+1)*group_size] = 1
+                Gammas.append(np.diag(diagonal))
+        return np.array(Gammas)
+
+    def compute_attack_table(self,Gammas = None,tol = 1e-6,logs = False):
+        '''
+        Computes every possible attack on the system: all the unstable directions
+        attacked through all the candidate subsets of sensors.
+        Parameters
+        ----------
+        Gammas: float numpy array (n_subsets,dim_z,dim_z)
+            Candidate attack matrices. Default value: every subset of sensors
+            (see compute_sensor_subsets()).
+
+        tol: float
+            Tolerance on the relative residual of the initialization under which
+            the attack is considered feasible.
+
+        logs: boolean
+            Displays the logs of the different steps if True. Default value: False
+
+        Returns
+        -------
+        attack_table: AttackCandidate list
+            Candidates ranked by feasibility, number of compromised sensors
+            (ascending), magnitude of the eigenvalue (descending) and maximal
+            norm M (ascending).
+
+        Notes
+        -----
+        The eigen decomposition and the steady state gain are only computed once,
+        the least squares initializations are then solved for all directions and
+        subsets at once.
+        '''
+        kf = self.kf
+        H  = self.compute_H()
+        unst_data = self.compute_unstable_eig(kf.F)
+        if not unst_data:
+            return []
+        if Gammas is None:
+            Gammas = self.compute_sensor_subsets()
+        Gammas = np.asarray(Gammas,dtype = float)
+        dim_z  = kf.dim_z
+        ss_K   = self.compute_steady_state_K()
+        if logs: print("Steady State K: \n{0}\n".format(ss_K))
+
+        # Gamma being diagonal, K@Gamma is a masking of the columns of K
+        masks = np.diagonal(Gammas,axis1 = 1,axis2 = 2)[:,np.newaxis,:]
+        A_KGamma = (-(kf.F - ss_K@H@kf.F)@ss_K)[np.newaxis]*masks
+        KGamma   = (-ss_K)[np.newaxis]*masks
+        attackers_inputs = np.concatenate((A_KGamma,KGamma),axis=2)
+
+        # Least squares initialization of all directions for all subsets
+        vectors = np.stack([data.vector for data in unst_data],axis=1)
+        false_measurements = pinv(attackers_inputs)@vectors
+        residuals = norm(attackers_inputs@false_measurements - vectors,axis=1)
+        residuals = residuals/norm(vectors,axis=0)
+        ya0s = false_measurements[:,:dim_z,:]
+        ya1s = false_measurements[:,dim_z:,:]
+
+        # Maximal norms (see compute_max_norm())
+        K      = kf.K
+        Gya0s  = masks.transpose((0,2,1))*ya0s
+        Gya1s  = masks.transpose((0,2,1))*ya1s
+        e0s    = -K@Gya0s
+        z1s    = H@kf.F@e0s + Gya1s
+        Ms     = np.maximum(norm(Gya0s,axis=1),norm(z1s,axis=1))
+
+        attack_table = []
+        for i,Gamma in enumerate(Gammas):
+            for j,data in enumerate(unst_data):
+                attack_table.append(AttackCandidate(unst_data = data, Gamma = Gamma,
+                                                    ya0 = ya0s[i,:,j:j+1],
+                                                    ya1 = ya1s[i,:,j:j+1],
+                                                    residual = residuals[i,j],
+                                                    M = Ms[i,j],
+                                                    feasible = residuals[i,j] < tol))
+        attack_table.sort(key = lambda c: (not c.feasible, len(c.sensors),
+                                           -abs(c.unst_data.value), c.M))
+        self.attack_table = attack_table
+        if logs: print("Attack table: \n{0}\n".format(attack_table))
+        return attack_table
+
     def attack_measurement(self):
         '''
         Alters the measurements with the attack sequence
@@ -337,6 +552,17 @@ class MoAttacker(object):
 
 class ExtendedMoAttacker(MoAttacker):
 
+    def compute_H(self):
+        '''
+        Returns the Jacobian of the measurement function at the current state
+        of the attacked estimator.
+        Returns
+        -------
+        H: float numpy array
+            Measurement matrix.
+        '''
+        return self.kf.HJacob(self.kf.x)
+
     def compute_steady_state_K(self):
         '''
         Computes the process to get K (Kalman gain) in steady state as the
@@ -473,17 +699,8 @@ class ExtendedMoAttacker(MoAttacker):
         #2. Initialization of the first "real" measurements -> to determine the max norm
         M = self.compute_max_norm(Gamma,ya0,ya1)
 
-        ya0 = ya0/M
-        ya1 = ya1/M
-
-        self.add_false_measurement(ya0)
-        self.add_false_measurement(ya1)
-
         ystar = H@attack_vect
-
-        for i in range(2,attack_size):
-            yai = self.attack_sequence[:,i-2].reshape((kf.dim_z,1)) - attack_val**(i-2)/M * ystar
-            self.add_false_measurement(yai)
+        self.fill_attack_sequence(attack_size, ya0, ya1, attack_val, ystar, M)
 
         if logs: print("Attack Sequence: \n{0}\n".format(self.attack_sequence))
 
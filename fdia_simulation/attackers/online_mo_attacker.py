@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:12:45 2026
+
+@author: qde
+"""
+
+import warnings
+import numpy as np
+from numpy.linalg              import norm
+from filterpy.kalman           import KalmanFilter, IMMEstimator
+from fdia_simulation.models    import LabeledMeasurement
+from fdia_simulation.filters   import MultipleRadarsFilterModel, MultiplePeriodRadarsFilterModel
+from fdia_simulation.attackers import MoAttacker
+
+class OnlineMoAttacker(MoAttacker):
+    '''
+    Implements the attack of Mo et al. 2010 against a running extended Kalman
+    filter (or IMM of extended Kalman filters). The attacker is plugged in the
+    listen_measurement hook of the benchmark and injects its attack sequence
+    step by step.
+    Parameters
+    ----------
+    filter: RadarFilterModel or RadarIMM
+        Filter of the attacked system.
+
+    t0: int
+        Time of beginning of the attack (number of update steps).
+
+    time: int
+        Duration of the attack (number of update steps).
+
+    radar_pos: int
+        Position of the attacked radar in the measurement vector. Used to build
+        gamma if it is not specified.
+
+    gamma: float numpy array
+        Attack matrix: diagonal square matrix with n = measurement (z) dimension.
+
+    pos_value: int
+        Position (in the eigenvalues of F, see UnstableData.position) of the
+        unstable value along which the attacker should attack. Default value:
+        the best feasible candidate of the attack table. Only real eigenvalues
+        can be attacked (the injected sequence is real).
+
+    mag: float
+        Magnitude multiplying the (normalized) attack sequence.
+
+    tol: float
+        Relative change of F or H after which the filter is linearized again.
+
+    fb: boolean
+        See MoAttacker.
+
+    Attributes
+    ----------
+    Same as parameters +
+    kf: KalmanFilter
+        Linearization of the attacked filter the attack sequence is computed on.
+
+    injections: float numpy array
+        Column-stacked values injected in the measurements during the attack,
+        computed on the last linearization used.
+
+    nb_linearizations: int
+        Number of times the attack sequence has been computed.
+
+    current_time: int
+        Progression of the attack (from t0 to time)
+    '''
+    def __init__(self, filter, t0, time, radar_pos = None, gamma = None,
+                 pos_value = None, mag = 1., tol = 0.05, fb = False):
+        self.filter = filter
+        self.is_imm = isinstance(filter,IMMEstimator)
+        model = self.current_model()
+        MoAttacker.__init__(self, KalmanFilter(dim_x = model.dim_x, dim_z = model.dim_z), fb = fb)
+        self.dim_z = model.dim_z
+
+        # If gamma is not specified but the attacked radar position (in the
+        # measurement matrix) is
+        if gamma is None:
+            if radar_pos is None:
+                raise ValueError('Either gamma or radar_pos should be specified')
+            gamma = np.zeros((self.dim_z,self.dim_z))
+            gamma[radar_pos*3  , radar_pos*3]   = 1 # Attacked r
+            gamma[radar_pos*3+1, radar_pos*3+1] = 1 # Attacked theta
+            gamma[radar_pos*3+2, radar_pos*3+2] = 1 # Attacked phi
+
+        if np.shape(gamma) != (self.dim_z,self.dim_z):
+            raise ValueError('Gamma should be a square matrix with n=dim_z')
+
+        self.gamma     = gamma
+        self.pos_value = pos_value
+        self.mag       = mag
+        self.tol       = tol
+
+        # Linearization cache: model id -> (F, H, injections)
+        self._linearizations   = {}
+        self.injections        = np.zeros((self.dim_z,time))
+        self.nb_linearizations = 0
+
+        # Time attributes
+        self.t0           = t0
+        self.time         = time
+        self.current_time = 0
+
+    def current_model(self):
+        '''
+        Returns the extended Kalman filter the attack is computed on: the filter
+        itself or the most probable model of the IMM.
+        Returns
+        -------
+        model: RadarFilterModel
+            Attacked model.
+        '''
+        if self.is_imm:
+            return self.filter.filters[np.argmax(self.filter.mu)]
+        return self.filter
+
+    def compute_model_H(self,model):
+        '''
+        Computes the Jacobian of the measurement function of a model at its
+        current state. Period models are linearized for all their radars.
+        Parameters
+        ----------
+        model: RadarFilterModel
+            Attacked model.
+
+        Returns
+        -------
+        H: float numpy array
+            Measurement matrix of the model.
+        '''
+        if isinstance(model,MultiplePeriodRadarsFilterModel):
+            return MultipleRadarsFilterModel.HJacob(model,model.x)
+        return model.HJacob(model.x)
+
+    def needs_linearization(self,model,H):
+        '''
+        Checks if the operating point of the model moved beyond the tolerance
+        since its last linearization.
+        Parameters
+        ----------
+        model: RadarFilterModel
+            Attacked model.
+
+        H: float numpy array
+            Current measurement matrix of the model.
+
+        Returns
+        -------
+        res: boolean
+            True if the attack sequence needs to be computed again.
+        '''
+        if id(model) not in self._linearizations:
+            return True
+        lin_F, lin_H, _ = self._linearizations[id(model)]
+        moved_H = norm(H - lin_H)       > self.tol*norm(lin_H)
+        moved_F = norm(model.F - lin_F) > self.tol*norm(lin_F)
+        return moved_H or moved_F
+
+    def linearize(self,model,H):
+        '''
+        Linearizes the model at its current state and computes the attack
+        sequence over the whole attack duration.
+        Parameters
+        ----------
+        model: RadarFilterModel
+            Attacked model.
+
+        H: float numpy array
+            Current measurement matrix of the model.
+
+        Notes
+        -----
+        The Riccati solution and the eigen decomposition are only computed here
+        and reused until the next linearization. In the case of an IMM, one
+        linearization is kept for each model.
+        '''
+        kf   = self.kf
+        kf.x = model.x.copy()
+        kf.F = model.F.copy()
+        kf.H = H
+        kf.Q = model.Q.copy()
+        kf.R = np.asarray(model.R)
+        kf.P = model.P.copy()
+        kf.K = self.compute_steady_state_K()
+        self.nb_linearizations += 1
+
+        attack_table = self.compute_attack_table(Gammas = [self.gamma])
+        if not(self.pos_value is None):
+            attack_table = [candidate for candidate in attack_table
+                            if candidate.unst_data.position == self.pos_value]
+            if not attack_table:
+                raise ValueError('pos_value is not the position of an unstable value')
+            if not np.isreal(attack_table[0].unst_data.value):
+                raise ValueError('The unstable value at pos_value is complex and cannot be attacked')
+        # The sequence along a complex direction has no real counterpart and
+        # the attacker cannot reach the infeasible directions: both are skipped
+        attack_table = [candidate for candidate in attack_table
+                        if np.isreal(candidate.unst_data.value) and candidate.feasible]
+        if not attack_table:
+            warnings.warn('No real feasible unstable values available for attack',Warning)
+            self.injections = np.zeros((self.dim_z,self.time))
+            self._linearizations[id(model)] = (kf.F, H, self.injections)
+            return
+
+        chosen = attack_table[0]
+        attack_val  = chosen.unst_data.value
+        attack_vect = chosen.unst_data.vector.reshape((kf.dim_x,1))
+        sequence    = self.fill_attack_sequence(self.time, chosen.ya0, chosen.ya1,
+                                                attack_val, H@attack_vect, chosen.M)
+        self.injections = self.mag*np.real(self.gamma@sequence)
+        self._linearizations[id(model)] = (kf.F, H, self.injections)
+
+    def listen_measurement(self,measurement):
+        '''
+        Monitors the duration (beginning and end) of the attack and injects the
+        corresponding step of the attack sequence.
+        Parameters
+        ----------
+        measurement: float numpy array or LabeledMeasurement
+            Measurement
+
+        Returns
+        -------
+        measurement: float numpy array or LabeledMeasurement
+            Measurement with the injected false data during the attack.
+        '''
+        step = self.current_time - self.t0
+        self.current_time += 1
+        if not(0 <= step < self.time):
+            return measurement
+
+        model = self.current_model()
+        H = self.compute_model_H(model)
+        if self.needs_linearization(model,H):
+            self.linearize(model,H)
+        self.injections = self._linearizations[id(model)][2]
+        injection = self.injections[:,step:step+1]
+
+        # Period radars: only the block of the tagged radar is received
+        if isinstance(measurement,LabeledMeasurement):
+            tag   = measurement.tag
+            value = np.reshape(measurement.value,(-1,1)) + injection[3*tag:3*tag+3]
+            return LabeledMeasurement(tag = tag, time = measurement.time, value = value)
+        return np.reshape(measurement,(-1,1)) + injection
@@ -35,6 +35,12 @@ class PeriodAttacker(Attacker):
     radar: Radar object
         Attacked radar itself.
 
+    in_seconds: boolean
+        If True, t0 and time are expressed in seconds and compared to the time
+        of the measurements instead of the number of update steps. The attack
+        window is then independent from the data rates of the other radars.
+        Default value: False.
+
     Attributes
     ----------
     Same as parameters +
@@ -45,7 +51,7 @@ class PeriodAttacker(Attacker):
         Progression of the attack (from t0 to time)
     '''
     def __init__(self, filter, t0, time, radar, radar_pos,
-                 gamma = None, mag_vector = None):
+                 gamma = None, mag_vector = None, in_seconds = False):
         # Store the filter and its dimension
         self.filter = filter
         self.is_imm = isinstance(filter,IMMEstimator)
@@ -93,6 +99,7 @@ class PeriodAttacker(Attacker):
         self.t0           = t0
         self.time         = time
         self.current_time = 0
+        self.in_seconds   = in_seconds
 
     def listen_measurement(self,measurement):
         '''
@@ -101,16 +108,59 @@ class PeriodAttacker(Attacker):
         ----------
         measurement: LabeledMeasurement object
             Measurement
+
+        Returns
+        -------
+        measurement: LabeledMeasurement object
+            The measurement itself if it is not attacked, a new labeled
+            measurement with the modified value otherwise.
         '''
-        tag   = measurement.tag
-        time  = measurement.time
-        value = measurement.value
-        beginning_reached = self.t0 <= self.current_time
-        end_reached       = (self.current_time - self.t0) >= self.time
+        tag  = measurement.tag
+        time = measurement.time
+        if self.in_seconds:
+            instant = time
+        else:
+            instant = self.current_time
+        beginning_reached = self.t0 <= instant
+        end_reached       = (instant - self.t0) >= self.time
         in_attack         = beginning_reached and not(end_reached)
+        self.current_time += 1
         if in_attack and (tag == self.radar_tag):
-            value = np.reshape(value,(-2,1))
+            # Copy: the measurement may belong to a shared measurement set
+            value = np.reshape(measurement.value,(-2,1)).copy()
             value = self.attack_measurement(value)
-        self.current_time += 1
-        modified_measurement = LabeledMeasurement(time = time, tag = tag, value = value)
-        return modified_measurement
+            measurement = LabeledMeasurement(time = time, tag = tag, value = value)
+        return measurement
+
+    def listen_tagged_measurements(self,tagged_values):
+        '''
+        Monitors the duration of the attack over a whole set of measurements and
+        attacks the ones of the attacked radar inside the attack window.
+        Parameters
+        ----------
+        tagged_values: float numpy array (n,5)
+            Time-sorted measurements where each row is [tag, time, r, theta, phi].
+            The array is modified in place.
+
+        Returns
+        -------
+        tagged_values: float numpy array (n,5)
+            The same array with the attacked measurements modified.
+
+        Notes
+        -----
+        The rows are considered as n consecutive update steps so that this
+        function behaves as n calls of listen_measurement().
+        '''
+        n = len(tagged_values)
+        if self.in_seconds:
+            instants = tagged_values[:,1]
+        else:
+            instants = self.current_time + np.arange(n)
+        in_attack = (self.t0 <= instants) & ((instants - self.t0) < self.time)
+        mask      = in_attack & (tagged_values[:,0] == self.radar_tag)
+        if mask.any():
+            values = tagged_values[mask,2:].T
+            tagged_values[mask,2:] = self.attack_measurement(values).T
+        self.current_time += n
+        return tagged_values
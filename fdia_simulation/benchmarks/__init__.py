@@ -7,8 +7,22 @@ Created on Wed Jul 17 11:19:28 2019
 
 from __future__ import absolute_import
 
-__all__ = ["benchmark",
-           "process_noise_finder"]
+__all__ = ["measurement_set",
+           "benchmark",
+           "process_noise_finder",
+           "process_noise_finder_imm",
+           "instrumentation",
+           "monte_carlo",
+           "pipeline",
+           "realtime",
+           "scenario_runner"]
 
-from .benchmark            import *
-from .process_noise_finder import *
+from .measurement_set          import *
+from .benchmark                import *
+from .process_noise_finder     import *
+from .process_noise_finder_imm import *
+from .instrumentation          import *
+from .monte_carlo              import *
+from .pipeline                 import *
+from .realtime                 import *
+from .scenario_runner          import *
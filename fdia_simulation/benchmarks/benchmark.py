@@ -5,11 +5,86 @@ Created on Mon Jul 15 15:06:12 2019
 @author: qde
 """
 import numpy             as np
-import matplotlib.pyplot as plt
-from copy                    import deepcopy
-from numpy.linalg            import inv
+from time                    import perf_counter
+from numpy.linalg            import cholesky, LinAlgError
+from scipy.linalg            import solve_triangular
 from fdia_simulation.filters import RadarIMM
-from fdia_simulation.models  import Radar, PeriodRadar, Track
+from fdia_simulation.models  import Radar, PeriodRadar, Track, tagged2labeled
+from fdia_simulation.helpers.decimation         import minmax_envelope, stride_indices, spatial_subsample
+from fdia_simulation.benchmarks.measurement_set import MeasurementSet
+
+class NEESMonitor(object):
+    '''
+    Implements a streaming monitor of the Normalized Estimated Error Squared
+    (NEES) used to stop diverging runs early.
+    Parameters
+    ----------
+    bound: float
+        Bound of the running mean of the NEES above which the run is aborted.
+
+    burn_in: int
+        Number of first steps during which the bound is not checked (the NEES
+        of the initialization transient is usually large).
+
+    Attributes
+    ----------
+    Same as parameters +
+    count: int
+        Number of monitored steps.
+
+    aborted: boolean
+        True if the running NEES went above the bound or non-finite.
+
+    Notes
+    -----
+    A non-finite NEES aborts the run whatever the burn-in.
+    '''
+
+    # Score of an aborted run
+    SENTINEL = np.inf
+
+    def __init__(self,bound = np.inf,burn_in = 0):
+        self.bound   = bound
+        self.burn_in = burn_in
+        self.count   = 0
+        self.total   = 0.
+        self.aborted = False
+
+    def update(self,nees):
+        '''
+        Adds the NEES of a new step.
+        Parameters
+        ----------
+        nees: float
+            NEES of the step.
+
+        Returns
+        -------
+        res: boolean
+            False if the run should be aborted.
+        '''
+        self.count += 1
+        self.total += nees
+        if not np.isfinite(nees):
+            self.aborted = True
+        elif self.count > self.burn_in and self.total > self.bound*self.count:
+            self.aborted = True
+        return not self.aborted
+
+    @property
+    def mean(self):
+        '''
+        Running mean of the NEES.
+        '''
+        return self.total/self.count if self.count else 0.
+
+    @property
+    def score(self):
+        '''
+        Running mean of the NEES or SENTINEL if the run was aborted.
+        '''
+        return self.SENTINEL if self.aborted else self.mean
+
 
 class Benchmark(object):
     '''Implements a benchmark to create an estimation of a trajectory detected
@@ -24,8 +99,20 @@ class Benchmark(object):
 
     states numpy array iterable
         List of the true states of the observed system.
+
+    attacker: Attacker
+        Attacker altering the measurements before they reach the filter.
+
+    measurement_set: MeasurementSet
+        Measurements of the states by the radars. If specified, they are used
+        instead of generating new ones in launch_benchmark().
+
+    instrumentation: Instrumentation
+        Timers and counters of the stages of the benchmark. If None (default),
+        nothing is measured.
     '''
-    def __init__(self,radars,radar_filter,states,attacker = None):
+    def __init__(self,radars,radar_filter,states,attacker = None,measurement_set = None,
+                 instrumentation = None):
         # Checks if there are multiple radars or simply one
         if isinstance(radars,(Radar,PeriodRadar)):
             self.radars = [radars]
@@ -44,69 +131,55 @@ class Benchmark(object):
         if type(self.radar_filter) == RadarIMM:
             self.filter_is_imm = True
 
-        self.attacker = attacker
+        self.attacker        = attacker
+        self.instrumentation = instrumentation
         # Actual values to be plotted
         self.measured_values     = []
         self.labeled_values      = []
+        self.tagged_values       = np.zeros((0,5))
         self.measured_positions  = []
+        self.estimated_states    = []
         self.estimated_positions = []
         self.nees                = []
         self.probs               = []
+        self.cov_diags           = []
+        self.state_ids           = []
         # IMM model names
         self.radar_filters_names = []
+        self.measurement_set = measurement_set
+        if not(measurement_set is None):
+            self.load_measurement_set(measurement_set)
 
     def gen_data_set(self):
         '''
         Generates the measured data from the radars.
-        Returns
-        -------
-        measured_values: numpy array.
-            Array of the different measurements made by the radar [r,theta,phi].
 
         Notes
         -----
         The function adds measurement noise to the measurements from the radars.
         It also fills the computed positions to allow plotting of the sensed
-        positions.
+        positions. See MeasurementSet.generate().
         '''
-        # The length of the sampled position is needed in case of multiple radars
-        # with the same data rates for the concatenation.
-        first_radar = self.radars[0]
-        sampled_position_data = first_radar.sample_position_data(self.pos_data)
-        self.measured_values = np.reshape(np.array([[]]),(len(sampled_position_data),0))
-
-
-        for i,radar in enumerate(self.radars):
-            sampled_position_data = radar.sample_position_data(self.pos_data)
-            # Data generation for the radar
-            rs, thetas, phis = radar.gen_data(sampled_position_data)
-            # Addition of white noise
-            noisy_rs, noisy_thetas, noisy_phis = radar.sense(rs, thetas, phis)
-            # Conversion in positions (for plotting purposes)
-            xs, ys, zs = radar.radar2cartesian(noisy_rs, noisy_thetas, noisy_phis)
-            # Addition of the measurements from the radar to the global measurements
-            current_measured_values = np.array(list(zip(noisy_rs,noisy_thetas,noisy_phis)))
-            # Addition of the computed positions to the
-            self.measured_positions.append(np.array(list(zip(xs,ys,zs))))
-            # print('measured positions ({1}): \n{0}\n'.format(self.measured_positions,np.shape(self.measured_positions)))
-
-            # If the radars do not have different data rates, the measurement
-            # vector consists of the concatenation of the different measurements
-            if not self.radar_is_period:
-                self.measured_values = np.concatenate((self.measured_values,current_measured_values),axis=1)
-
-            # If the radars have different data rates, the measurement vector
-            # consists of labeled measurements
-            else:
-                current_labeled_measurement = radar.compute_measurements(sampled_position_data)
-                self.labeled_values += current_labeled_measurement
+        self.load_measurement_set(MeasurementSet.generate(self.radars,self.states))
 
-        # The labeled measrurements (in case of perioduency radars) are sorted by time
-        self.labeled_values = sorted(self.labeled_values)
-
-
-
-    def process_filter(self,measurements = None,with_nees = False):
+    def load_measurement_set(self,measurement_set):
+        '''
+        Uses the measurements of a given set. The set is shared, not copied.
+        Parameters
+        ----------
+        measurement_set: MeasurementSet
+            Measurements of the states by the radars.
+        '''
+        if measurement_set.radar_is_period != self.radar_is_period:
+            raise ValueError('The measurement set does not match the radars data rates')
+        self.measured_values    = measurement_set.measured_values
+        self.tagged_values      = measurement_set.tagged_values
+        self.measured_positions = measurement_set.measured_positions
+        if self.radar_is_period:
+            self.labeled_values = measurement_set.labeled_values
+
+    def process_filter(self,measurements = None,with_nees = False,with_cov = False,
+                       monitor = None):
         '''
         Launches the filter cycles of predict/update.
         Parameters
@@ -114,59 +187,208 @@ class Benchmark(object):
         with_nees: boolean
             Triggers the computation of NEES (Normalized Estimated Error Squared).
 
-        Returns
-        -------
-        est_states: numpy array
-            Estimated states of the observed system.
+        with_cov: boolean
+            Triggers the capture of the diagonal of the covariance matrix P at
+            each step.
+
+        monitor: NEESMonitor
+            Monitor of the NEES (triggers its computation) aborting the run if
+            it diverges. The results are then truncated to the processed steps.
+
+        Notes
+        -----
+        The results are written step by step in preallocated arrays:
+        estimated_states (N,dim_x), nees (N,1), probs (N,nb_models) and
+        cov_diags (N,dim_x). If the nees is computed, state_ids (N,) stores
+        the position of the true state corresponding to each estimation.
+        With an instrumentation, the stages are timed by wrapping the called
+        functions: the loop itself is the same.
+        '''
+        if self.instrumentation is None:
+            return self._process_filter(measurements,with_nees,with_cov,monitor)
+        instrumentation = self.instrumentation
+        models    = getattr(self.radar_filter,'filters',[self.radar_filter])
+        anomalies = sum(model.anomaly_counter for model in models)
+        begin     = perf_counter()
+        with instrumentation.timing_detectors(self.radar_filter):
+            self._process_filter(measurements,with_nees,with_cov,monitor,
+                                 instrumentation = instrumentation)
+        instrumentation.add('process_filter',perf_counter() - begin)
+        instrumentation.count('steps',len(self.estimated_states))
+        instrumentation.count('anomalies',sum(model.anomaly_counter for model in models) - anomalies)
+        if not(monitor is None) and monitor.aborted:
+            instrumentation.count('aborted_runs')
+
+    def _process_filter(self,measurements,with_nees,with_cov,monitor,instrumentation = None):
         '''
+        Implements process_filter(), with the stages timed by an
+        instrumentation if specified.
+        '''
+        attacker = self.attacker
+        if not(monitor is None):
+            with_nees = True
         if measurements is None:
             # Default values for PeriodRadars
             if self.radar_is_period:
                 measurements = self.labeled_values
+                # Period attackers alter the whole columnar set at once
+                if hasattr(attacker,'listen_tagged_measurements'):
+                    tagged_values = attacker.listen_tagged_measurements(self.tagged_values.copy())
+                    measurements  = tagged2labeled(tagged_values)
+                    attacker      = None
             # Default values for radars with the same data rates
             else:
                 measurements = self.measured_values
 
-        # Initialization of the lists of:
+        radar_filter = self.radar_filter
+        nb_steps     = len(measurements)
+        dim_x        = len(radar_filter.x)
+        last_state   = len(self.states)-1
+        true_states  = self.states.reshape((len(self.states),-1))
+        # Initialization of the arrays of:
         # estimated states: results of the estimator on state space vector
         # nees: Normalized Estimated Error Squared (if mode triggered)
-        est_states, nees, probs = [],[],[]
+        # probs: Probabilities of the models (if the filter is an IMM)
+        # cov_diags: Diagonal of the covariance matrix (if mode triggered)
+        est_states = np.empty((nb_steps,dim_x))
+        nees       = np.empty((nb_steps if with_nees else 0,1))
+        state_ids  = np.empty(nb_steps if with_nees else 0, dtype = int)
+        probs      = np.empty((nb_steps,len(radar_filter.mu)) if self.filter_is_imm else (0,))
+        cov_diags  = np.empty((nb_steps if with_cov else 0,dim_x))
+        # Stages of the cycle
+        listen_measurement = None if attacker is None else attacker.listen_measurement
+        predict            = radar_filter.predict
+        update             = radar_filter.update
+        compute_nees       = self.compute_nees
+        if not(instrumentation is None):
+            if not(attacker is None):
+                listen_measurement = instrumentation.wrap('attacker',listen_measurement)
+            predict      = instrumentation.wrap('predict',predict)
+            update       = instrumentation.wrap('update',update)
+            compute_nees = instrumentation.wrap('nees',compute_nees)
         # Scrolling through the measurements
         for i,measurement in enumerate(measurements):
             # Attack_phase
-            if not(self.attacker is None):
-                measurement = self.attacker.listen_measurement(measurement)
+            if not(attacker is None):
+                measurement = listen_measurement(measurement)
             # Filter cycle
-            self.radar_filter.predict()
-            self.radar_filter.update(measurement)
-            current_state = deepcopy(self.radar_filter.x)
-            est_states.append(current_state)
+            predict()
+            update(measurement)
+            est_states[i] = radar_filter.x[:,0]
             if with_nees:
                 if not self.radar_is_period:
                     # The corresponding real state to the estimated one
                     state_id = int(self.radars[0].step * i)
                 else:
                     # The corresponding real state to the estimated one
-                    state_id = min(int(measurement.time//Track.DT_TRACK),len(self.states)-1)
+                    state_id = min(int(measurement.time//Track.DT_TRACK),last_state)
                 # Computation of the error between true and estimated states
-                states_tilde = np.subtract(est_states[i],np.reshape(self.states[state_id,:],(-8,1)))
-                nees.append(*(states_tilde.T@inv(self.radar_filter.P)@states_tilde))
+                state_ids[i] = state_id
+                states_tilde = est_states[i] - true_states[state_id]
+                nees[i,0]    = compute_nees(states_tilde,radar_filter.P)
             if self.filter_is_imm:
-                probs.append(self.radar_filter.mu)
-
-        # Conversion to arrays
-        est_states = np.array(est_states)
-        nees       = np.array(nees)
-        probs      = np.array(probs)
+                probs[i] = radar_filter.mu
+            if with_cov:
+                cov_diags[i] = np.diagonal(radar_filter.P)
+            # Diverging run: the results are truncated to the processed steps
+            if not(monitor is None) and not monitor.update(nees[i,0]):
+                est_states, nees, state_ids = est_states[:i+1], nees[:i+1], state_ids[:i+1]
+                probs, cov_diags = probs[:i+1], cov_diags[:i+1]
+                break
 
         # Extraction of the position (for plotting)
-        est_xs     = est_states[:,0,:]
-        est_ys     = est_states[:,3,:]
-        est_zs     = est_states[:,6,:]
+        self.estimated_states    = est_states
+        self.estimated_positions = est_states[:,[0,3,6]]
+        self.nees      = nees
+        self.state_ids = state_ids
+        self.probs     = probs
+        self.cov_diags = cov_diags
+
+    def launch_pipeline(self,sinks,states = None,with_nees = True):
+        '''
+        Launches the benchmark as a chain of generators: radars sensing,
+        attack injection and filtering (with detection) are processed step by
+        step and each step result is emitted to the sinks. Nothing is stored
+        by the benchmark, the memory used does not depend on the duration.
+        Parameters
+        ----------
+        sinks: Sink iterable
+            Receivers of the step results (see pipeline.py).
+
+        states: float numpy array iterable
+            States of the observed system, e.g. a generator. Default value:
+            the states of the benchmark.
 
-        self.estimated_positions = np.concatenate((est_xs,est_ys,est_zs),axis=1)
-        self.nees  = nees
-        self.probs = probs
+        with_nees: boolean
+            Triggers the computation of the NEES.
+
+        Returns
+        -------
+        sinks: Sink iterable
+            The closed sinks.
+
+        Notes
+        -----
+        The anomaly detectors keep their reviewed values: their memory still
+        grows with the number of detections.
+        '''
+        # Imported here: the pipeline module depends on Benchmark
+        from fdia_simulation.benchmarks.pipeline import (sense_states, attack_measurements,
+                                                         filter_measurements, run_pipeline)
+        if states is None:
+            states = self.states
+        measurements = sense_states(states,self.radars)
+        if not(self.attacker is None):
+            measurements = attack_measurements(measurements,self.attacker)
+        results = filter_measurements(measurements,self.radar_filter,with_nees)
+        return run_pipeline(results,sinks)
+
+    def compute_rmse(self):
+        '''
+        Computes the Root Mean Squared Error on the position of the estimations.
+        Returns
+        -------
+        rmse: float
+            RMSE between the estimated and true positions.
+
+        Notes
+        -----
+        Needs process_filter() to be run with with_nees = True.
+        '''
+        true_positions = self.pos_data[self.state_ids]
+        errors = self.estimated_positions - true_positions
+        return np.sqrt(np.mean(np.sum(errors**2,axis=1)))
+
+    @staticmethod
+    def compute_nees(states_tilde,P):
+        '''
+        Computes the Normalized Estimated Error Squared of one estimation.
+        Parameters
+        ----------
+        states_tilde: float numpy array
+            Error between the estimated and the true states.
+
+        P: float numpy array
+            Covariance matrix of the estimation.
+
+        Returns
+        -------
+        nees: float
+            states_tilde' * inv(P) * states_tilde
+
+        Notes
+        -----
+        P is decomposed with Cholesky (P = LL') and the quantity is obtained as
+        the squared norm of the solution of L*w = states_tilde. A covariance
+        that is not numerically positive definite means the filter diverged:
+        NEESMonitor.SENTINEL is returned so the monitor aborts the run.
+        '''
+        try:
+            L = cholesky(P)
+        except LinAlgError:
+            return NEESMonitor.SENTINEL
+        w = solve_triangular(L,states_tilde,lower = True,check_finite = False)
+        return w@w
 
     def generate_plotting_labels(self):
         '''
@@ -189,7 +411,7 @@ class Benchmark(object):
             self.radar_filters_names.append(model_name)
 
 
-    def plot(self):
+    def plot(self, max_points = 2000, max_scatter = 5000):
         '''
         Plots all the computed data sets:
         - Real system positions
@@ -198,33 +420,48 @@ class Benchmark(object):
         - Final estimated positions
         if the filter is an IMM:
         - Model probabilities
-        '''
-        real_xs = self.pos_data[:,0]
-        real_ys = self.pos_data[:,1]
-        real_zs = self.pos_data[:,2]
+        Parameters
+        ----------
+        max_points: int
+            Maximal number of points of each curve: the trajectories are
+            decimated evenly and the NEES/probabilities keep the minimum and
+            maximum of each bucket of steps (see minmax_envelope()).
 
-        estimated_xs = self.estimated_positions[:,0]
-        estimated_ys = self.estimated_positions[:,1]
-        estimated_zs = self.estimated_positions[:,2]
+        max_scatter: int
+            Maximal number of plotted measurements per radar (subsampled over
+            a spatial grid, see spatial_subsample()).
+
+        Notes
+        -----
+        None as max_points or max_scatter plots every point.
+        '''
+        import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d import Axes3D
+        no_limit = np.iinfo(np.int64).max
+        max_points  = no_limit if max_points is None else max_points
+        max_scatter = no_limit if max_scatter is None else max_scatter
+        real_positions      = self.pos_data[stride_indices(len(self.pos_data),max_points)]
+        estimated_positions = self.estimated_positions[stride_indices(len(self.estimated_positions),max_points)]
 
         fig = plt.figure(1)
         plt.rc('font', family='serif')
-        ax = fig.gca(projection='3d')
-        ax.plot(real_xs, real_ys, real_zs, label='Real trajectory',color='k',linestyle='dashed')
+        ax = fig.add_subplot(projection='3d')
+        ax.plot(real_positions[:,0], real_positions[:,1], real_positions[:,2],
+                label='Real trajectory',color='k',linestyle='dashed')
         # Radar measurements
         for i,radar in enumerate(self.radars):
             # Measured values by the ith radar
-            measured_xs = self.measured_positions[i][:,0]
-            measured_ys = self.measured_positions[i][:,1]
-            measured_zs = self.measured_positions[i][:,2]
-            ax.scatter(measured_xs, measured_ys, measured_zs,
+            measured_positions = np.asarray(self.measured_positions[i])
+            measured_positions = measured_positions[spatial_subsample(measured_positions,max_scatter)]
+            ax.scatter(measured_positions[:,0], measured_positions[:,1], measured_positions[:,2],
                        marker='o',alpha = 0.3, label = 'Radar n°'+str(i+1)+' measurements')
 
             # Radar position
             ax.scatter(radar.x,radar.y,radar.z, marker = 'x', label = 'Radar n°'+str(i+1))
 
         # Estimated positions
-        ax.plot(estimated_xs, estimated_ys, estimated_zs, color='orange', label= 'Estimated trajectory')
+        ax.plot(estimated_positions[:,0], estimated_positions[:,1], estimated_positions[:,2],
+                color='orange', label= 'Estimated trajectory')
 
         # Axis labels
         ax.set_xlabel('X axis')
@@ -237,14 +474,14 @@ class Benchmark(object):
         if len(self.nees)>0:
             fig2 = plt.figure(2)
             plt.title('Normalized Estimation Error Squared (NEES)')
-            plt.plot(self.nees)
+            plt.plot(*minmax_envelope(self.nees,max_points))
             fig2.show()
 
         # Plotting the model probabilities
         if self.filter_is_imm:
             fig3 = plt.figure(3)
             for i in range(len(self.probs[0,:])):
-                plt.plot(self.probs[:,i],label = self.radar_filters_names[i])
+                plt.plot(*minmax_envelope(self.probs[:,i],max_points),label = self.radar_filters_names[i])
             plt.xlabel('Time')
             plt.ylabel('Model probability')
             plt.title('Probabilities of the different models')
@@ -253,7 +490,7 @@ class Benchmark(object):
 
         plt.show()
 
-    def launch_benchmark(self, with_nees = False, plot = True):
+    def launch_benchmark(self, with_nees = False, plot = True, report_path = None):
         '''
         Launches the usual benchmark procedure:
         - Generates radar's data set
@@ -263,8 +500,16 @@ class Benchmark(object):
         ----------
         with_nees: boolean
             Triggers the display of the evolution of the NEES.
+
+        report_path: str
+            Path of the JSON file where the report of the instrumentation is
+            written (if the benchmark has one).
         '''
-        self.gen_data_set()
+        if self.measurement_set is None:
+            if self.instrumentation is None:
+                self.gen_data_set()
+            else:
+                self.instrumentation.wrap('data_generation',self.gen_data_set)()
         self.process_filter(with_nees = with_nees)
         self.generate_plotting_labels()
         if not(self.filter_is_imm):
@@ -275,4 +520,6 @@ class Benchmark(object):
                     print("{0} anomalies out of {1} measurements for {2} filter".format(filter.anomaly_counter,len(self.estimated_positions),self.radar_filters_names[i][-2:]))
         if with_nees:
             print("NEES mean: {0}\nNEES max: {1}".format(np.mean(self.nees[200:]),*max(self.nees[200:])))
+        if not(self.instrumentation is None) and not(report_path is None):
+            self.instrumentation.write_report(report_path)
         if plot: self.plot()
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:08:52 2026
+
+@author: qde
+"""
+
+import json
+import numpy as np
+from contextlib      import contextmanager
+from time            import perf_counter
+from filterpy.common import pretty_str
+
+class StageStatistics(object):
+    '''
+    Implements the statistics of the durations of a stage: count, total,
+    extrema and a histogram with logarithmic bins (fixed memory) from which
+    the percentiles are estimated.
+    Attributes
+    ----------
+    count: int
+        Number of measured durations.
+
+    total: float
+        Sum of the durations (seconds).
+
+    min, max: floats
+        Extrema of the durations (seconds).
+
+    histogram: int numpy array
+        Number of durations in each bin.
+    '''
+
+    # Bins of the histogram: 20 per decade from 100ns to 100s
+    BINS_PER_DECADE = 20
+    LOG_MIN         = -7
+    LOG_MAX         = 2
+
+    def __init__(self):
+        self.count     = 0
+        self.total     = 0.
+        self.min       = np.inf
+        self.max       = 0.
+        nb_bins        = (self.LOG_MAX - self.LOG_MIN)*self.BINS_PER_DECADE
+        self.histogram = np.zeros(nb_bins, dtype = int)
+
+    def add(self,duration):
+        '''
+        Adds a duration to the statistics.
+        Parameters
+        ----------
+        duration: float
+            Duration of the stage (seconds).
+        '''
+        self.count += 1
+        self.total += duration
+        self.min    = min(self.min,duration)
+        self.max    = max(self.max,duration)
+        log_duration = np.log10(max(duration,10.**self.LOG_MIN))
+        position = int((log_duration - self.LOG_MIN)*self.BINS_PER_DECADE)
+        self.histogram[min(position,len(self.histogram) - 1)] += 1
+
+    @property
+    def mean(self):
+        return self.total/self.count if self.count else 0.
+
+    def percentile(self,q):
+        '''
+        Estimates a percentile of the durations from the histogram.
+        Parameters
+        ----------
+        q: float
+            Percentile to compute (between 0 and 100).
+
+        Returns
+        -------
+        duration: float
+            Upper edge of the bin containing the percentile (seconds), bounded
+            by the extrema.
+        '''
+        if self.count == 0:
+            return 0.
+        position = np.searchsorted(np.cumsum(self.histogram), q/100*self.count)
+        upper_edge = 10.**(self.LOG_MIN + (position + 1)/self.BINS_PER_DECADE)
+        return float(min(max(upper_edge,self.min),self.max))
+
+    def to_dict(self):
+        '''
+        Summarizes the statistics.
+        Returns
+        -------
+        summary: dictionary
+            count, total, mean, min, p50, p99 and max (seconds).
+        '''
+        return {'count': self.count,
+                'total': self.total,
+                'mean' : self.mean,
+                'min'  : self.min if self.count else 0.,
+                'p50'  : self.percentile(50),
+                'p99'  : self.percentile(99),
+                'max'  : self.max}
+
+    def __repr__(self):
+        return '\n'.join([
+            'StageStatistics object',
+            pretty_str('count', self.count),
+            pretty_str('mean', self.mean),
+            pretty_str('p50', self.percentile(50)),
+            pretty_str('p99', self.percentile(99))])
+
+
+class Instrumentation(object):
+    '''
+    Implements the timers and counters of the stages of a benchmark. Pass an
+    instance to Benchmark(instrumentation = ...) to measure the stages of
+    process_filter(): "attacker", "predict", "update" (detection included),
+    "detector" and "nees". Without instrumentation, the benchmark runs its
+    usual code.
+    Attributes
+    ----------
+    stages: dictionary(key:str, value:StageStatistics)
+        Statistics of the durations of each stage.
+
+    counters: dictionary(key:str, value:int)
+        Event counters (e.g. "steps", "anomalies").
+
+    Notes
+    -----
+    The throughput of the report is the number of "steps" per second of the
+    "process_filter" stage (the whole loop).
+    '''
+    def __init__(self):
+        self.stages   = {}
+        self.counters = {}
+
+    def add(self,stage,duration):
+        '''
+        Adds the duration of a stage.
+        Parameters
+        ----------
+        stage: str
+            Name of the stage.
+
+        duration: float
+            Duration (seconds).
+        '''
+        if not(stage in self.stages):
+            self.stages[stage] = StageStatistics()
+        self.stages[stage].add(duration)
+
+    def count(self,counter,n = 1):
+        '''
+        Increments a counter.
+        Parameters
+        ----------
+        counter: str
+            Name of the counter.
+
+        n: int
+            Increment.
+        '''
+        self.counters[counter] = self.counters.get(counter,0) + n
+
+    def wrap(self,stage,function):
+        '''
+        Wraps a function so that each of its calls is timed as a stage.
+        Parameters
+        ----------
+        stage: str
+            Name of the stage.
+
+        function: callable
+            Function to be timed.
+
+        Returns
+        -------
+        timed_function: callable
+            Function with the same behavior, adding its durations to the stage.
+        '''
+        add = self.add
+        def timed_function(*args,**kwargs):
+            begin  = perf_counter()
+            result = function(*args,**kwargs)
+            add(stage,perf_counter() - begin)
+            return result
+        return timed_function
+
+    @contextmanager
+    def timing_detectors(self,radar_filter):
+        '''
+        Times the reviews of the detectors of a filter (or of the models of an
+        IMM) as the "detector" stage while in the context.
+        Parameters
+        ----------
+        radar_filter: RadarFilterModel or RadarIMM
+            Filter whose detectors are timed.
+        '''
+        models    = getattr(radar_filter,'filters',[radar_filter])
+        detectors = {id(model.detector): model.detector for model in models
+                     if not(getattr(model,'detector',None) is None)}
+        for detector in detectors.values():
+            detector.review_measurement = self.wrap('detector',detector.review_measurement)
+        try:
+            yield self
+        finally:
+            for detector in detectors.values():
+                del detector.review_measurement
+
+    def report(self):
+        '''
+        Summarizes the stages and counters.
+        Returns
+        -------
+        report: dictionary
+            {"stages": {stage: summary}, "counters": {counter: value},
+             "throughput": steps per second (None if unknown)}
+        '''
+        throughput = None
+        loop = self.stages.get('process_filter')
+        if not(loop is None) and loop.total > 0 and 'steps' in self.counters:
+            throughput = self.counters['steps']/loop.total
+        return {'stages'    : {stage: statistics.to_dict() for stage,statistics in self.stages.items()},
+                'counters'  : dict(self.counters),
+                'throughput': throughput}
+
+    def write_report(self,path):
+        '''
+        Writes the report as a JSON file.
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+        '''
+        with open(path,'w') as report_file:
+            json.dump(self.report(),report_file,indent = 2)
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 16:48:12 2026
+
+@author: qde
+"""
+
+import os
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from fdia_simulation.models import Radar, PeriodRadar, tagged2labeled
+
+class MeasurementSet(object):
+    '''
+    Implements the noisy measurements of a trajectory by a set of radars. The
+    set is generated once and can be processed by any number of benchmarks
+    (e.g. to compare filters, detectors or process noises on the same data).
+    Parameters
+    ----------
+    measured_values: float numpy array
+        Measurements of radars with the same data rate, one row per step being
+        the concatenation of the [r,theta,phi] of each radar.
+
+    tagged_values: float numpy array (n,5)
+        Measurements of radars with different data rates, sorted by time, each
+        row being [tag, time, r, theta, phi].
+
+    measured_positions: float numpy array iterable
+        Positions corresponding to the measurements of each radar (plotting).
+
+    radar_is_period: boolean
+        True if the measurements come from PeriodRadars.
+
+    seed: int
+        Seed the set was generated with (None if unknown).
+
+    Attributes
+    ----------
+    Same as parameters +
+    labeled_values: LabeledMeasurement iterable
+        Measurements of radars with different data rates as LabeledMeasurements.
+
+    measurements: float numpy array or LabeledMeasurement iterable
+        Measurements processed by the filter.
+    '''
+
+    # Number of sets kept in the in-memory cache (least recently used first out)
+    CACHE_SIZE = 8
+
+    # In-memory cache of the generated sets (key: see compute_key())
+    _cache = OrderedDict()
+
+    def __init__(self,measured_values,tagged_values,measured_positions,
+                 radar_is_period,seed = None):
+        self.measured_values    = measured_values
+        self.tagged_values      = tagged_values
+        self.measured_positions = measured_positions
+        self.radar_is_period    = radar_is_period
+        self.seed               = seed
+        self._labeled_values    = None
+
+    @property
+    def labeled_values(self):
+        '''
+        Tagged values as LabeledMeasurements (created on first access).
+        '''
+        if self._labeled_values is None:
+            self._labeled_values = tagged2labeled(self.tagged_values)
+        return self._labeled_values
+
+    @property
+    def measurements(self):
+        '''
+        Measurements processed by the filter: labeled values for PeriodRadars,
+        measured values otherwise.
+        '''
+        return self.labeled_values if self.radar_is_period else self.measured_values
+
+    def __len__(self):
+        return len(self.measurements)
+
+    @classmethod
+    def generate(cls,radars,states,seed = None):
+        '''
+        Generates the noisy measurements of the states by the radars.
+        Parameters
+        ----------
+        radars: Radar or Radar iterable
+            Radars observing the system.
+
+        states: float numpy array
+            States of the observed system.
+
+        seed: int
+            Seed of the random number generator. If not specified, the current
+            state of the generator is used.
+
+        Returns
+        -------
+        measurement_set: MeasurementSet
+            Generated measurements.
+
+        Notes
+        -----
+        The measurements of PeriodRadars are tagged with the position of the
+        radar in the radars list (as done by MultiplePeriodRadarsFilterModel).
+        The radars themselves are not modified. The target is measured at
+        every step: a ValueError is raised for radars with missed detections
+        or clutter (see Radar.check_full_detection()).
+        '''
+        if isinstance(radars,(Radar,PeriodRadar)):
+            radars = [radars]
+        for radar in radars:
+            radar.check_full_detection()
+        if not(seed is None):
+            np.random.seed(seed)
+        pos_data        = states[:,[0,3,6]]
+        radar_is_period = isinstance(radars[0],PeriodRadar)
+        # The length of the sampled position is needed in case of multiple radars
+        # with the same data rates for the concatenation.
+        sampled_position_data = radars[0].sample_position_data(pos_data)
+        measured_values    = np.zeros((len(sampled_position_data),0))
+        tagged_values      = np.zeros((0,5))
+        measured_positions = []
+
+        for i,radar in enumerate(radars):
+            sampled_position_data = radar.sample_position_data(pos_data)
+            # Data generation for the radar
+            rs, thetas, phis = radar.gen_data(sampled_position_data)
+            # Addition of white noise
+            noisy_rs, noisy_thetas, noisy_phis = radar.sense(rs, thetas, phis)
+            # Conversion in positions (for plotting purposes)
+            xs, ys, zs = radar.radar2cartesian(noisy_rs, noisy_thetas, noisy_phis)
+            measured_positions.append(np.column_stack((xs,ys,zs)))
+
+            # If the radars do not have different data rates, the measurement
+            # vector consists of the concatenation of the different measurements
+            if not radar_is_period:
+                current_measured_values = np.column_stack((noisy_rs,noisy_thetas,noisy_phis))
+                measured_values = np.concatenate((measured_values,current_measured_values),axis=1)
+
+            # If the radars have different data rates, the measurement vector
+            # consists of tagged measurements
+            else:
+                current_tagged_values = radar.compute_tagged_measurements(sampled_position_data)
+                current_tagged_values[:,0] = i
+                tagged_values = np.concatenate((tagged_values,current_tagged_values),axis=0)
+
+        # The tagged measurements (in case of period radars) are sorted by time
+        order = np.argsort(tagged_values[:,1], kind = 'stable')
+        return cls(measured_values    = measured_values,
+                   tagged_values      = tagged_values[order],
+                   measured_positions = measured_positions,
+                   radar_is_period    = radar_is_period,
+                   seed               = seed)
+
+    @staticmethod
+    def compute_key(radars,states,seed):
+        '''
+        Computes the key identifying a (trajectory, radars, seed) combination.
+        Parameters
+        ----------
+        radars: Radar or Radar iterable
+            Radars observing the system.
+
+        states: float numpy array
+            States of the observed system.
+
+        seed: int
+            Seed of the random number generator.
+
+        Returns
+        -------
+        key: str
+            Hexadecimal digest of the combination.
+        '''
+        if isinstance(radars,(Radar,PeriodRadar)):
+            radars = [radars]
+        radars_params = [(type(radar).__name__, radar.x, radar.y, radar.z, radar.dt,
+                          radar.step, radar.r_std, radar.theta_std, radar.phi_std,
+                          getattr(radar,'time_std',None)) for radar in radars]
+        digest = hashlib.sha1(repr((radars_params,seed)).encode())
+        digest.update(np.ascontiguousarray(states,dtype = float).tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def get(cls,radars,states,seed,cache_dir = None):
+        '''
+        Returns the measurements of a (trajectory, radars, seed) combination,
+        generated only the first time it is requested.
+        Parameters
+        ----------
+        radars: Radar or Radar iterable
+            Radars observing the system.
+
+        states: float numpy array
+            States of the observed system.
+
+        seed: int
+            Seed of the random number generator.
+
+        cache_dir: str
+            Folder where the sets are saved and looked for. If not specified,
+            the sets are only cached in memory (the CACHE_SIZE last used ones).
+
+        Returns
+        -------
+        measurement_set: MeasurementSet
+            Measurements of the combination.
+        '''
+        if seed is None:
+            raise ValueError('A seed is needed to identify the measurement set')
+        key = cls.compute_key(radars,states,seed)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+        path = None
+        if not(cache_dir is None):
+            path = os.path.join(cache_dir,'measurement_set-' + key + '.npz')
+        if not(path is None) and os.path.exists(path):
+            measurement_set = cls.load(path)
+        else:
+            measurement_set = cls.generate(radars,states,seed)
+            if not(path is None):
+                os.makedirs(cache_dir,exist_ok = True)
+                measurement_set.save(path)
+        cls._cache[key] = measurement_set
+        if len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last = False)
+        return measurement_set
+
+    @classmethod
+    def clear_cache(cls):
+        '''
+        Empties the in-memory cache of the sets.
+        '''
+        cls._cache.clear()
+
+    def save(self,path):
+        '''
+        Saves the set in a .npz file.
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+        '''
+        positions = {'measured_positions_{0}'.format(i): positions
+                     for i,positions in enumerate(self.measured_positions)}
+        np.savez(path,
+                 measured_values = self.measured_values,
+                 tagged_values   = self.tagged_values,
+                 radar_is_period = self.radar_is_period,
+                 seed            = -1 if self.seed is None else self.seed,
+                 **positions)
+
+    @classmethod
+    def load(cls,path):
+        '''
+        Loads a set saved with save().
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+
+        Returns
+        -------
+        measurement_set: MeasurementSet
+            Loaded measurements.
+        '''
+        with np.load(path) as data:
+            nb_radars = len([name for name in data.files
+                             if name.startswith('measured_positions_')])
+            seed = int(data['seed'])
+            return cls(measured_values    = data['measured_values'],
+                       tagged_values      = data['tagged_values'],
+                       measured_positions = [data['measured_positions_{0}'.format(i)]
+                                             for i in range(nb_radars)],
+                       radar_is_period    = bool(data['radar_is_period']),
+                       seed               = None if seed == -1 else seed)
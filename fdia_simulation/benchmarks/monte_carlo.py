@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:20:04 2026
+
+@author: qde
+"""
+
+import numpy as np
+from math                 import sqrt
+from concurrent.futures   import ProcessPoolExecutor, as_completed
+from filterpy.common      import pretty_str
+
+class RunningStatistics(object):
+    '''
+    Implements the incremental computation of the mean, standard deviation,
+    minimum and maximum of a quantity (Welford's algorithm).
+    Attributes
+    ----------
+    count: int
+        Number of values added.
+
+    mean: float
+        Mean of the values.
+
+    min, max: floats
+        Extrema of the values.
+    '''
+    def __init__(self):
+        self.count = 0
+        self.mean  = 0.
+        self._m2   = 0.
+        self.min   = np.inf
+        self.max   = -np.inf
+
+    def update(self,value):
+        '''
+        Adds a value to the statistics.
+        Parameters
+        ----------
+        value: float
+            New value of the quantity.
+        '''
+        self.count += 1
+        delta       = value - self.mean
+        self.mean  += delta/self.count
+        self._m2   += delta*(value - self.mean)
+        self.min    = min(self.min,value)
+        self.max    = max(self.max,value)
+
+    @property
+    def std(self):
+        '''
+        Standard deviation (unbiased) of the values.
+        '''
+        if self.count < 2:
+            return 0.
+        return sqrt(self._m2/(self.count - 1))
+
+    def __repr__(self):
+        return '\n'.join([
+            'RunningStatistics object',
+            pretty_str('count', self.count),
+            pretty_str('mean', self.mean),
+            pretty_str('std', self.std),
+            pretty_str('min', self.min),
+            pretty_str('max', self.max)])
+
+
+def count_anomalies(radar_filter):
+    '''
+    Counts the anomalies detected by a filter and the number of its models
+    equiped with a detector.
+    Parameters
+    ----------
+    radar_filter: RadarFilterModel or RadarIMM
+        Filter of the benchmark.
+
+    Returns
+    -------
+    anomalies, nb_detectors: ints
+        Total number of anomalies and number of models with a detector.
+    '''
+    filters = getattr(radar_filter,'filters',[radar_filter])
+    detected = [filter for filter in filters if not(filter.detector is None)]
+    return sum(filter.anomaly_counter for filter in detected), len(detected)
+
+
+def run_replicate(scenario,seed,burn_in = 0):
+    '''
+    Runs one replicate of a scenario and summarizes it.
+    Parameters
+    ----------
+    scenario: callable
+        Function with no argument returning a new Benchmark.
+
+    seed: int or int tuple
+        Seed of the random number generator for this replicate (see
+        MonteCarlo.compute_seeds()).
+
+    burn_in: int
+        Number of first steps not taken into account in the NEES.
+
+    Returns
+    -------
+    summary: dictionary
+        Mean NEES, max NEES, position RMSE and anomaly rate of the replicate.
+    '''
+    np.random.seed(np.array(seed, dtype = np.uint32))
+    benchmark = scenario()
+    benchmark.gen_data_set()
+    benchmark.process_filter(with_nees = True)
+    nees = benchmark.nees[burn_in:,0]
+    anomalies, nb_detectors = count_anomalies(benchmark.radar_filter)
+    nb_steps = len(benchmark.estimated_states)
+    return {'seed'         : seed,
+            'nees_mean'    : float(np.mean(nees)),
+            'nees_max'     : float(np.max(nees)),
+            'rmse'         : float(benchmark.compute_rmse()),
+            'anomaly_rate' : anomalies/(nb_steps*nb_detectors) if nb_detectors else 0.}
+
+
+class MonteCarlo(object):
+    '''
+    Implements a Monte Carlo runner: the same scenario is simulated a given
+    number of times with independent noise and the results are aggregated.
+    Parameters
+    ----------
+    scenario: callable
+        Function with no argument returning a new (not launched) Benchmark,
+        e.g. building the trajectory, radars, filter/IMM, detector and attacker.
+        It needs to be picklable (defined at the top level of a module) to be
+        sent to the worker processes.
+
+    nb_runs: int
+        Number of replicates.
+
+    nb_workers: int
+        Number of worker processes. Default value: number of CPUs. With 1, the
+        replicates are run in the current process.
+
+    seed: int
+        Seed from which the independent seeds of the replicates are derived.
+
+    burn_in: int
+        Number of first steps not taken into account in the NEES.
+
+    Attributes
+    ----------
+    Same as parameters +
+    statistics: dictionary(key:str, value:RunningStatistics)
+        Statistics of nees_mean, nees_max, rmse and anomaly_rate over the runs.
+
+    summaries: dictionary iterable
+        Summary of each replicate (see run_replicate()).
+    '''
+
+    STATISTICS = ['nees_mean','nees_max','rmse','anomaly_rate']
+
+    # Number of 32 bits words of each replicate seed
+    SEED_WORDS = 4
+
+    def __init__(self,scenario,nb_runs,nb_workers = None,seed = None,burn_in = 0):
+        self.scenario   = scenario
+        self.nb_runs    = nb_runs
+        self.nb_workers = nb_workers
+        self.seed       = seed
+        self.burn_in    = burn_in
+        self.statistics = {name: RunningStatistics() for name in self.STATISTICS}
+        self.summaries  = []
+
+    def compute_seeds(self):
+        '''
+        Derives one independent seed for each replicate.
+        Returns
+        -------
+        seeds: int tuple list
+            Seeds of the replicates.
+
+        Notes
+        -----
+        Each seed keeps SEED_WORDS words (128 bits) of the state of its spawned
+        SeedSequence and is passed as an array to np.random.seed(), so the
+        replicates keep the low collision probability of the SeedSequence
+        instead of the one of a single 32 bits integer.
+        '''
+        children = np.random.SeedSequence(self.seed).spawn(self.nb_runs)
+        return [tuple(int(word) for word in child.generate_state(self.SEED_WORDS))
+                for child in children]
+
+    def add_summary(self,summary):
+        '''
+        Adds the summary of a replicate to the aggregated statistics.
+        Parameters
+        ----------
+        summary: dictionary
+            Summary of a replicate.
+        '''
+        self.summaries.append(summary)
+        for name,statistic in self.statistics.items():
+            statistic.update(summary[name])
+
+    def launch_benchmark(self):
+        '''
+        Runs all the replicates and aggregates their results as they come.
+        Returns
+        -------
+        statistics: dictionary(key:str, value:RunningStatistics)
+            Statistics over the runs.
+        '''
+        seeds = self.compute_seeds()
+        if self.nb_workers == 1:
+            for seed in seeds:
+                self.add_summary(run_replicate(self.scenario,seed,self.burn_in))
+        else:
+            with ProcessPoolExecutor(max_workers = self.nb_workers) as executor:
+                futures = [executor.submit(run_replicate,self.scenario,seed,self.burn_in)
+                           for seed in seeds]
+                for future in as_completed(futures):
+                    self.add_summary(future.result())
+        # Replicates are stored in the seeds order whatever their completion order
+        order = {seed: i for i,seed in enumerate(seeds)}
+        self.summaries.sort(key = lambda summary: order[summary['seed']])
+        return self.statistics
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 14:27:16 2026
+
+@author: qde
+"""
+
+import os
+import re
+import sys
+import json
+import timeit
+import argparse
+import platform
+import numpy as np
+from fdia_simulation.models            import Radar, PeriodRadar, Track, LabeledMeasurement
+from fdia_simulation.filters           import (RadarFilterCV, RadarFilterCA, RadarFilterCT, RadarFilterTA,
+                                               MultipleRadarsFilterCV, MultipleRadarsFilterCA,
+                                               MultipleRadarsFilterCT, MultipleRadarsFilterTA,
+                                               MultiplePeriodRadarsFilterCV, MultiplePeriodRadarsFilterCA,
+                                               MultiplePeriodRadarsFilterCT, MultiplePeriodRadarsFilterTA,
+                                               RadarIMM)
+from fdia_simulation.anomaly_detectors import MahalanobisDetector, EuclidianDetector
+from fdia_simulation.benchmarks.benchmark import Benchmark
+
+# Position of the target of the filter steps (in the radars field)
+PERF_POSITION = [1000.,2000.,8000.]
+
+def _gen_radars():
+    return [Radar(x=2000,y=2000),Radar(x=1000,y=1000)]
+
+def _gen_period_radars():
+    return [PeriodRadar(x=2000,y=2000,dt=0.1),PeriodRadar(x=1000,y=1000,dt=0.4)]
+
+def _gen_measurement(radars):
+    '''
+    Noiseless concatenated measurement of PERF_POSITION by the radars.
+    '''
+    return np.concatenate([np.reshape(radar.gen_radar_values(*PERF_POSITION),(3,1)) for radar in radars])
+
+def _init_filter(radar_filter):
+    '''
+    Puts the filter on PERF_POSITION so that its steps stay on a regular track.
+    '''
+    radar_filter.x[[0,3,6],0] = PERF_POSITION
+    return radar_filter
+
+def _filter_step_case(filter_class,variant):
+    '''
+    Builds the case of one predict/update cycle of a filter.
+    Parameters
+    ----------
+    filter_class: RadarFilterModel class
+        Filter of the given variant.
+
+    variant: str
+        "single" (1 radar), "multiple" (2 radars) or "period" (2 PeriodRadars).
+    '''
+    def setup():
+        if variant == 'single':
+            radar = Radar(x=2000,y=2000)
+            radar_filter = _init_filter(filter_class(dim_x = 9, dim_z = 3, q = 100., radar = radar))
+            z = _gen_measurement([radar])
+            def step():
+                radar_filter.predict()
+                radar_filter.update(z)
+            return step
+        if variant == 'multiple':
+            radars = _gen_radars()
+            radar_filter = _init_filter(filter_class(q = 100., radars = radars))
+            z = _gen_measurement(radars)
+            def step():
+                radar_filter.predict()
+                radar_filter.update(z)
+            return step
+        radars = _gen_period_radars()
+        radar_filter = _init_filter(filter_class(q = 100., radars = radars))
+        values = [_gen_measurement([radar]) for radar in radars]
+        time   = [0.]
+        def step():
+            time[0] += 0.1
+            tag = int(round(time[0]*10)) % 2
+            radar_filter.predict()
+            radar_filter.update(LabeledMeasurement(tag = tag, time = time[0], value = values[tag]))
+            # The stored matrices are not part of the measured cycle
+            del radar_filter.Hs[:], radar_filter.Zs[:]
+        return step
+    return setup
+
+def _imm_step_case():
+    def setup():
+        radar = Radar(x=2000,y=2000)
+        filters = [_init_filter(filter_class(dim_x = 9, dim_z = 3, q = 100., radar = radar))
+                   for filter_class in [RadarFilterCV,RadarFilterCA,RadarFilterCT,RadarFilterTA]]
+        mu = [0.25]*4
+        M  = np.full((4,4),0.001)
+        np.fill_diagonal(M,0.997)
+        radar_filter = RadarIMM(filters,mu,M)
+        z = _gen_measurement([radar])
+        def step():
+            radar_filter.predict()
+            radar_filter.update(z)
+        return step
+    return setup
+
+def _detector_case(detector_class):
+    def setup():
+        radar = Radar(x=2000,y=2000)
+        detector = detector_class()
+        radar_filter = _init_filter(RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = radar))
+        z = _gen_measurement([radar])
+        radar_filter.predict()
+        radar_filter.update(z)
+        def review():
+            detector.review_measurement(z,radar_filter)
+            # The stored results are not part of the measured scoring
+            del detector.reviewed_values[:], detector.comparison_results[:]
+        return review
+    return setup
+
+def _track_case(name):
+    def setup():
+        return lambda: getattr(Track(),name)()
+    return setup
+
+def _radar_case(name):
+    def setup():
+        radar = Radar(x=2000,y=2000)
+        positions = Track().gen_landing()[:,[0,3,6]]
+        if name == 'gen_data':
+            return lambda: radar.gen_data(positions)
+        rs, thetas, phis = radar.gen_data(positions)
+        return lambda: radar.sense(rs,thetas,phis)
+    return setup
+
+def _benchmark_case():
+    def setup():
+        states = Track().gen_landing()
+        radar  = Radar(x=2000,y=2000)
+        def run():
+            np.random.seed(0)
+            radar_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = radar,
+                                         detector = MahalanobisDetector())
+            benchmark = Benchmark(radars = radar, radar_filter = radar_filter, states = states)
+            benchmark.gen_data_set()
+            benchmark.process_filter(with_nees = True)
+        return run
+    return setup
+
+def gen_perf_cases():
+    '''
+    Lists the cases of the performance suite.
+    Returns
+    -------
+    cases: dictionary(key:str, value:callable)
+        Setup function of each case, returning the function to be timed.
+    '''
+    cases = {}
+    for name in sorted(name for name in dir(Track) if name.startswith('gen_')):
+        cases['track.' + name] = _track_case(name)
+    for name in ['gen_data','sense']:
+        cases['radar.' + name] = _radar_case(name)
+    filter_classes = {'single'  : [RadarFilterCV,RadarFilterCA,RadarFilterCT,RadarFilterTA],
+                      'multiple': [MultipleRadarsFilterCV,MultipleRadarsFilterCA,
+                                   MultipleRadarsFilterCT,MultipleRadarsFilterTA],
+                      'period'  : [MultiplePeriodRadarsFilterCV,MultiplePeriodRadarsFilterCA,
+                                   MultiplePeriodRadarsFilterCT,MultiplePeriodRadarsFilterTA]}
+    for variant,classes in filter_classes.items():
+        for filter_class in classes:
+            name = 'ekf_step.{0}.{1}'.format(filter_class.__name__[-2:],variant)
+            cases[name] = _filter_step_case(filter_class,variant)
+    cases['imm_step.4models'] = _imm_step_case()
+    cases['detector.mahalanobis'] = _detector_case(MahalanobisDetector)
+    cases['detector.euclidian']   = _detector_case(EuclidianDetector)
+    cases['benchmark.landing.CA'] = _benchmark_case()
+    return cases
+
+
+class PerfSuite(object):
+    '''
+    Implements a suite of performance measurements of the core functions
+    (trajectory generation, radars, filter steps, detectors, full benchmark)
+    with stored baselines to detect regressions.
+    Parameters
+    ----------
+    cases: dictionary(key:str, value:callable)
+        Setup function of each case returning the function to be timed.
+        Default value: gen_perf_cases().
+
+    repeat: int
+        Number of timings of each case (the best one is kept).
+
+    min_time: float
+        Minimal duration of a timing (seconds), the number of calls of a
+        timing is adapted to reach it.
+
+    Notes
+    -----
+    A result is the duration of one call in seconds. The baselines are JSON
+    files {"machine": fingerprint, "results": {case: duration}}: they are
+    only comparable on the machine where they were measured (see
+    describe_machine()), so they are generated on each host and not shared.
+    '''
+    def __init__(self,cases = None,repeat = 5,min_time = 0.05):
+        if cases is None:
+            cases = gen_perf_cases()
+        self.cases    = cases
+        self.repeat   = repeat
+        self.min_time = min_time
+
+    def select(self,pattern = None):
+        '''
+        Returns the names of the cases matching a regular expression.
+        '''
+        return [name for name in self.cases if pattern is None or re.search(pattern,name)]
+
+    def time_case(self,name):
+        '''
+        Times a case.
+        Parameters
+        ----------
+        name: str
+            Name of the case.
+
+        Returns
+        -------
+        duration: float
+            Best duration of one call (seconds).
+        '''
+        function = self.cases[name]()
+        timer    = timeit.Timer(function)
+        # Number of calls reaching min_time (includes a warm up)
+        number = 1
+        while timer.timeit(number) < self.min_time:
+            number *= 2
+        return min(timer.repeat(repeat = self.repeat,number = number))/number
+
+    def run(self,pattern = None,verbose = False):
+        '''
+        Times the cases.
+        Parameters
+        ----------
+        pattern: str
+            Regular expression selecting the cases. Default value: all cases.
+
+        verbose: boolean
+            Triggers the display of each result.
+
+        Returns
+        -------
+        results: dictionary(key:str, value:float)
+            Duration of one call of each case (seconds).
+        '''
+        results = {}
+        for name in self.select(pattern):
+            results[name] = self.time_case(name)
+            if verbose:
+                print('{0:<32}{1:>12.1f} us'.format(name,results[name]*1e6))
+        return results
+
+    @staticmethod
+    def describe_machine():
+        '''
+        Fingerprint of the machine (host, hardware and software versions) the
+        baselines are measured on.
+        '''
+        return {'node'     : platform.node(),
+                'machine'  : platform.machine(),
+                'cpu_count': os.cpu_count(),
+                'python'   : platform.python_version(),
+                'numpy'    : np.__version__,
+                'platform' : platform.platform(),
+                'processor': platform.processor()}
+
+    @staticmethod
+    def save_baseline(path,results):
+        '''
+        Stores results as a baseline (the cases already in the file and not
+        in the results are kept if they were measured on this machine).
+        '''
+        try:
+            baseline = PerfSuite.load_baseline(path)
+            if PerfSuite.load_machine(path) != PerfSuite.describe_machine():
+                baseline = {}
+        except FileNotFoundError:
+            baseline = {}
+        baseline.update(results)
+        with open(path,'w') as baseline_file:
+            json.dump({'machine': PerfSuite.describe_machine(),
+                       'results': dict(sorted(baseline.items()))},
+                      baseline_file,indent = 2)
+
+    @staticmethod
+    def load_baseline(path):
+        with open(path) as baseline_file:
+            return json.load(baseline_file)['results']
+
+    @staticmethod
+    def load_machine(path):
+        '''
+        Returns the fingerprint of the machine a baseline was measured on.
+        '''
+        with open(path) as baseline_file:
+            return json.load(baseline_file).get('machine')
+
+    @staticmethod
+    def compare(results,baseline,tolerance = 0.2):
+        '''
+        Compares results to a baseline.
+        Parameters
+        ----------
+        results, baseline: dictionaries(key:str, value:float)
+            Durations of the cases (seconds).
+
+        tolerance: float
+            Relative slowdown above which a case is a regression (and relative
+            speedup above which it is an improvement).
+
+        Returns
+        -------
+        comparison: dictionary list
+            For each case of the results: "name", "baseline" (None if the case
+            is new), "current", "ratio" (current/baseline) and "status" among
+            "regression", "improvement", "ok" and "new".
+        '''
+        comparison = []
+        for name,current in results.items():
+            reference = baseline.get(name)
+            if reference is None:
+                ratio, status = None, 'new'
+            else:
+                ratio = current/reference
+                if ratio > 1 + tolerance:
+                    status = 'regression'
+                elif ratio < 1/(1 + tolerance):
+                    status = 'improvement'
+                else:
+                    status = 'ok'
+            comparison.append({'name': name, 'baseline': reference, 'current': current,
+                               'ratio': ratio, 'status': status})
+        return comparison
+
+    @staticmethod
+    def format_report(comparison):
+        '''
+        Formats a comparison (see compare()) as a text table (durations in
+        microseconds).
+        '''
+        lines = ['{0:<32}{1:>14}{2:>14}{3:>8}  {4}'.format('case','baseline (us)','current (us)','ratio','status')]
+        for row in comparison:
+            reference = '-' if row['baseline'] is None else '{0:.1f}'.format(row['baseline']*1e6)
+            ratio     = '-' if row['ratio'] is None else '{0:.2f}'.format(row['ratio'])
+            lines.append('{0:<32}{1:>14}{2:>14.1f}{3:>8}  {4}'.format(row['name'],reference,row['current']*1e6,
+                                                                  ratio,row['status']))
+        nb_regressions = sum(row['status'] == 'regression' for row in comparison)
+        lines.append('{0} regression(s) out of {1} cases'.format(nb_regressions,len(comparison)))
+        return '\n'.join(lines)
+
+
+def main(argv = None):
+    '''
+    Command line of the suite: times the cases, compares them to a baseline
+    and returns 1 if there is a regression. A baseline measured on another
+    machine is not used (unless --force).
+    '''
+    parser = argparse.ArgumentParser(description = 'Performance suite of fdia_simulation')
+    parser.add_argument('--baseline', default = 'results/perf_baseline.json',
+                        help = 'Baseline file (default: %(default)s)')
+    parser.add_argument('--filter', default = None,
+                        help = 'Regular expression selecting the cases')
+    parser.add_argument('--tolerance', type = float, default = 0.2,
+                        help = 'Relative slowdown of a regression (default: %(default)s)')
+    parser.add_argument('--repeat', type = int, default = 5)
+    parser.add_argument('--update', action = 'store_true',
+                        help = 'Stores the results as the baseline')
+    parser.add_argument('--force', action = 'store_true',
+                        help = 'Compares to a baseline measured on another machine')
+    args = parser.parse_args(argv)
+
+    suite   = PerfSuite(repeat = args.repeat)
+    results = suite.run(pattern = args.filter)
+    if args.update:
+        PerfSuite.save_baseline(args.baseline,results)
+        print('Baseline stored in {0}'.format(args.baseline))
+        return 0
+    try:
+        baseline = PerfSuite.load_baseline(args.baseline)
+        machine  = PerfSuite.load_machine(args.baseline)
+    except FileNotFoundError:
+        print('No baseline in {0}: store one on this machine with --update'.format(args.baseline))
+        baseline, machine = {}, None
+    if baseline and machine != PerfSuite.describe_machine() and not args.force:
+        print('Warning: the baseline {0} was measured on another machine, the comparison '
+              'is skipped (store a baseline on this machine with --update)'.format(args.baseline))
+        baseline = {}
+    comparison = PerfSuite.compare(results,baseline,tolerance = args.tolerance)
+    print(PerfSuite.format_report(comparison))
+    return int(any(row['status'] == 'regression' for row in comparison))
+
+if __name__ == "__main__":
+    sys.exit(main())
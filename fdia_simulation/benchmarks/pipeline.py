@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 13:36:09 2026
+
+@author: qde
+"""
+
+import heapq
+import numpy as np
+from abc                                    import ABC, abstractmethod
+from collections                            import deque
+from numpy.random                           import randn
+from fdia_simulation.models                 import PeriodRadar, LabeledMeasurement
+from fdia_simulation.benchmarks.benchmark   import Benchmark
+from fdia_simulation.benchmarks.monte_carlo import RunningStatistics
+from fdia_simulation.helpers.decimation     import EnvelopeBuffer
+
+def sense_states(states,radars,reorder_window = None):
+    '''
+    Generator stage simulating the radars observing a stream of states.
+    Parameters
+    ----------
+    states: float numpy array iterable
+        States of the observed system (one every Track.DT_TRACK), e.g. the rows
+        of an array or a generator.
+
+    radars: Radar iterable
+        Radars observing the system, all with the same data rate or all
+        PeriodRadars (tagged with their position in the list).
+
+    reorder_window: int
+        Number of measurements of PeriodRadars buffered to be emitted in time
+        order. Default value: twice the number of radars.
+
+    Returns
+    -------
+    measurements: tuple generator
+        (true state, measurement) with measurement the concatenation of the
+        [r,theta,phi] of the radars or a LabeledMeasurement for PeriodRadars.
+
+    Notes
+    -----
+    The noises are drawn step by step: the measurements differ from the ones
+    of Benchmark.gen_data_set() for the same seed. As for Benchmark, the
+    radars must not miss detections (see Radar.check_full_detection()).
+    '''
+    for radar in radars:
+        radar.check_full_detection()
+    if isinstance(radars[0],PeriodRadar):
+        for item in _sense_states_period(states,radars,reorder_window):
+            yield item
+        return
+    step = int(radars[0].step)
+    for k,state in enumerate(states):
+        if k % step != 0:
+            continue
+        measurement = np.empty(3*len(radars))
+        for i,radar in enumerate(radars):
+            r, theta, phi = radar.gen_radar_values(state[0],state[3],state[6])
+            measurement[3*i]   = r     + randn()*radar.r_std
+            measurement[3*i+1] = theta + randn()*radar.theta_std
+            measurement[3*i+2] = phi   + randn()*radar.phi_std
+        yield state, measurement
+
+def _sense_states_period(states,radars,reorder_window):
+    '''
+    Implements sense_states() for PeriodRadars: the measurements of the radars
+    go through a bounded heap to be emitted by increasing (noisy) time.
+    '''
+    if reorder_window is None:
+        reorder_window = 2*len(radars)
+    steps = [int(radar.step) for radar in radars]
+    times = [0.]*len(radars)
+    heap  = []
+    count = 0
+    for k,state in enumerate(states):
+        for radar,step,i in zip(radars,steps,range(len(radars))):
+            if k % step != 0:
+                continue
+            r, theta, phi = radar.gen_radar_values(state[0],state[3],state[6])
+            value = np.array([[r     + randn()*radar.r_std],
+                              [theta + randn()*radar.theta_std],
+                              [phi   + randn()*radar.phi_std]])
+            measurement = LabeledMeasurement(tag = i, time = times[i], value = value)
+            times[i] += radar.dt + randn()*radar.time_std # Adding a time jitter
+            # The count breaks the ties without comparing the states
+            heapq.heappush(heap,(measurement.time,count,state,measurement))
+            count += 1
+            if len(heap) > reorder_window:
+                _, _, true_state, measurement = heapq.heappop(heap)
+                yield true_state, measurement
+    while heap:
+        _, _, true_state, measurement = heapq.heappop(heap)
+        yield true_state, measurement
+
+def attack_measurements(measurements,attacker):
+    '''
+    Generator stage injecting the attacker's input in the measurements.
+    Parameters
+    ----------
+    measurements: tuple iterable
+        (true state, measurement) as yielded by sense_states().
+
+    attacker: Attacker
+        Attacker listening to the measurements.
+
+    Returns
+    -------
+    measurements: tuple generator
+        (true state, possibly attacked measurement).
+    '''
+    for state, measurement in measurements:
+        yield state, attacker.listen_measurement(measurement)
+
+def filter_measurements(measurements,radar_filter,with_nees = True):
+    '''
+    Generator stage processing the predict/update cycles of the filter (and
+    its anomaly detection).
+    Parameters
+    ----------
+    measurements: tuple iterable
+        (true state, measurement) as yielded by sense_states().
+
+    radar_filter: RadarFilterModel or RadarIMM
+        Filter estimating the state of the system.
+
+    with_nees: boolean
+        Triggers the computation of the NEES.
+
+    Returns
+    -------
+    results: dictionary generator
+        Result of each step: "step", "time", "state" (estimated), "nees"
+        (None if not computed), "probs" (None if the filter is not an IMM)
+        and "anomaly" (True if a detector rejected the measurement).
+    '''
+    models = getattr(radar_filter,'filters',[radar_filter])
+    is_imm = hasattr(radar_filter,'filters')
+    anomalies = sum(model.anomaly_counter for model in models)
+    for i,(true_state,measurement) in enumerate(measurements):
+        radar_filter.predict()
+        radar_filter.update(measurement)
+        state = radar_filter.x[:,0].copy()
+        nees  = None
+        if with_nees:
+            states_tilde = state - np.reshape(true_state,-1)
+            nees = Benchmark.compute_nees(states_tilde,radar_filter.P)
+        new_anomalies = sum(model.anomaly_counter for model in models)
+        yield {'step'   : i,
+               'time'   : getattr(measurement,'time',i),
+               'state'  : state,
+               'nees'   : nees,
+               'probs'  : radar_filter.mu.copy() if is_imm else None,
+               'anomaly': new_anomalies > anomalies}
+        anomalies = new_anomalies
+
+def run_pipeline(results,sinks):
+    '''
+    Consumes the results of a pipeline and emits each of them to the sinks.
+    Parameters
+    ----------
+    results: dictionary iterable
+        Results of the steps as yielded by filter_measurements().
+
+    sinks: Sink iterable
+        Objects with add(result) and close() methods.
+
+    Returns
+    -------
+    sinks: Sink iterable
+        The closed sinks.
+    '''
+    try:
+        for result in results:
+            for sink in sinks:
+                sink.add(result)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return sinks
+
+
+class Sink(ABC):
+    '''
+    Implements the interface of the receivers of the results of a pipeline.
+    '''
+    @abstractmethod
+    def add(self,result):
+        '''
+        Receives the result of a step (see filter_measurements()). Must be
+        overloaded by subclasses.
+        '''
+        pass
+
+    def close(self):
+        '''
+        Called once the pipeline is exhausted.
+        '''
+        pass
+
+
+class StatisticsSink(Sink):
+    '''
+    Implements a sink aggregating the results of a pipeline.
+    Parameters
+    ----------
+    burn_in: int
+        Number of first steps not taken into account in the NEES.
+
+    Attributes
+    ----------
+    nees: RunningStatistics
+        Statistics of the NEES.
+
+    nb_steps: int
+        Number of processed steps.
+
+    nb_anomalies: int
+        Number of steps where a detector rejected the measurement.
+    '''
+    def __init__(self,burn_in = 0):
+        self.burn_in      = burn_in
+        self.nees         = RunningStatistics()
+        self.nb_steps     = 0
+        self.nb_anomalies = 0
+
+    def add(self,result):
+        self.nb_steps     += 1
+        self.nb_anomalies += result['anomaly']
+        if not(result['nees'] is None) and result['step'] >= self.burn_in:
+            self.nees.update(result['nees'])
+
+
+class FileSink(Sink):
+    '''
+    Implements a sink appending the results of a pipeline to a binary file of
+    float64 records [step, time, state..., nees, anomaly] written in bulk.
+    Parameters
+    ----------
+    path: str
+        Path of the file (emptied first).
+
+    buffer_size: int
+        Number of results buffered before they are written.
+
+    Attributes
+    ----------
+    Same as parameters +
+    nb_columns: int
+        Size of a record (known after the first result).
+
+    Notes
+    -----
+    The file can be read with np.fromfile(path).reshape((-1,nb_columns)). A
+    NEES that is not computed is written as nan.
+    '''
+    def __init__(self,path,buffer_size = 1024):
+        self.path        = path
+        self.buffer_size = buffer_size
+        self.nb_columns  = None
+        self._buffer     = []
+        open(path,'wb').close()
+
+    def add(self,result):
+        nees = np.nan if result['nees'] is None else result['nees']
+        record = np.concatenate(([result['step'],result['time']],result['state'],
+                                 [nees,result['anomaly']]))
+        self.nb_columns = len(record)
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        '''
+        Writes the buffered results.
+        '''
+        if self._buffer:
+            with open(self.path,'ab') as file:
+                np.array(self._buffer,dtype = '<f8').tofile(file)
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+
+
+class PlotSink(Sink):
+    '''
+    Implements a sink plotting the last estimated positions and the NEES of a
+    pipeline while it runs. The figure is updated incrementally (the data of
+    the lines is replaced, nothing is redrawn from scratch) and the NEES of
+    the whole run is kept as a bounded min/max envelope (see EnvelopeBuffer).
+    Parameters
+    ----------
+    every: int
+        Number of steps between two refreshes of the figure.
+
+    window: int
+        Number of last positions displayed.
+
+    max_points: int
+        Maximal number of points of the NEES curve.
+    '''
+    def __init__(self,every = 100,window = 1000,max_points = 2000):
+        import matplotlib.pyplot as plt
+        self.plt       = plt
+        self.every     = every
+        self.positions = deque(maxlen = window)
+        self.nees      = EnvelopeBuffer(max_points)
+        plt.ion()
+        self.fig, (self.ax_position, self.ax_nees) = plt.subplots(2,1)
+        self.position_line, = self.ax_position.plot([],[],color='orange')
+        self.ax_position.set_title('Estimated trajectory (x,y)')
+        self.nees_line, = self.ax_nees.plot([],[])
+        self.ax_nees.set_title('NEES')
+
+    def add(self,result):
+        self.positions.append(result['state'][[0,3]])
+        if not(result['nees'] is None):
+            self.nees.append(float(result['nees']))
+        if result['step'] % self.every == 0:
+            self.refresh()
+
+    def refresh(self):
+        '''
+        Updates the data of the lines and rescales the axes.
+        '''
+        positions = np.array(self.positions)
+        self.position_line.set_data(positions[:,0],positions[:,1])
+        self.nees_line.set_data(*self.nees.get())
+        for ax in [self.ax_position,self.ax_nees]:
+            ax.relim()
+            ax.autoscale_view()
+        self.plt.pause(0.001)
+
+    def close(self):
+        if self.positions:
+            self.refresh()
+        self.plt.ioff()
@@ -6,8 +6,26 @@ Created on Mon Jun 29 11:57:08 2019
 """
 
 import numpy as np
+from concurrent.futures         import ProcessPoolExecutor
 from fdia_simulation.models     import Radar, Track
-from fdia_simulation.benchmarks import Benchmark
+from fdia_simulation.benchmarks import Benchmark, NEESMonitor, MeasurementSet
+
+# Noise finder used by the worker processes (set once by _init_worker())
+_worker_finder = None
+
+def _init_worker(noise_finder):
+    '''
+    Stores the noise finder (and its data sets) in the worker process so that
+    only the tested qs are sent afterwards.
+    '''
+    global _worker_finder
+    _worker_finder = noise_finder
+
+def _evaluate_q(q):
+    '''
+    Evaluates a process noise q with the noise finder of the worker process.
+    '''
+    return _worker_finder.evaluate(q)
 
 class NoiseFinder1Radar(object):
     '''
@@ -28,12 +46,30 @@ class NoiseFinder1Radar(object):
         Number of times the same simulation will be processed. Put other than 1
         if you think the randomness can generate unlucky faulty simulations.
 
+    nb_workers: int
+        Number of worker processes evaluating the qs. With 1 (default), the qs
+        are evaluated in the current process.
+
+    seed: int
+        Seed of the random number generator used to generate the data sets.
+
+    nees_bound: float
+        Running NEES above which a run is aborted (see NEESMonitor). Runs with
+        a non-finite NEES are always aborted.
+
+    nees_burn_in: int
+        Number of first steps during which the bound is not checked.
+
     Attributes
     ----------
     Same as parameters +
 
     mean_nees: dictionary(key:float, value:float)
         Dictionary of every tested q (key) and its associated average nees (value).
+
+    data_sets: list
+        Measurements of each iteration, generated once and shared by all the
+        tested qs (common random numbers).
     '''
 
     # List of tested values:
@@ -47,14 +83,73 @@ class NoiseFinder1Radar(object):
               list(np.linspace(1,9,num=9))       + \
               list(np.linspace(10,4000,num=400))
 
-    def __init__(self,radar,states,filter,nb_iterations = 1):
+    def __init__(self,radar,states,filter,nb_iterations = 1,nb_workers = 1,seed = None,
+                 nees_bound = np.inf,nees_burn_in = 0):
         self.radar         = radar
         self.states        = states
         self.filter        = filter
         self.nb_iterations = nb_iterations
+        self.nb_workers    = nb_workers
+        self.seed          = seed
+        self.nees_bound    = nees_bound
+        self.nees_burn_in  = nees_burn_in
         self.means_nees    = {}
+        self.data_sets     = None
+
+    def gen_filter(self,q):
+        '''
+        Creates the tested filter with a given process noise q.
+        Parameters
+        ----------
+        q: float
+            Process noise to be tested.
+
+        Returns
+        -------
+        filter: RadarFilterModel
+            Filter initialized on the first state of the system.
+        '''
+        x0 = self.states[0,0]
+        y0 = self.states[0,3]
+        z0 = self.states[0,6]
+        return self.filter(dim_x = 9, dim_z = 3, radar = self.radar, q = q, x0 = x0, y0 = y0, z0 = z0)
 
-    def compute_nees(self,q):
+    def gen_benchmark(self,radar_filter):
+        '''
+        Creates a benchmark of the observed system with a given filter.
+        Parameters
+        ----------
+        radar_filter: RadarFilterModel
+            Filter of the benchmark.
+
+        Returns
+        -------
+        benchmark: Benchmark
+            Benchmark of the system.
+        '''
+        return Benchmark(radars = self.radar, radar_filter = radar_filter, states = self.states)
+
+    def gen_data_sets(self):
+        '''
+        Generates the measurements of the nb_iterations simulations. They are
+        then used for every tested q so that the qs are compared on the same
+        noise (common random numbers).
+        Returns
+        -------
+        data_sets: list
+            Measured values (or labeled values for period radars) of each
+            iteration.
+        '''
+        if not(self.seed is None):
+            np.random.seed(self.seed)
+        self.data_sets = []
+        radars = self.gen_benchmark(radar_filter = None).radars
+        for _ in range(self.nb_iterations):
+            measurement_set = MeasurementSet.generate(radars,self.states)
+            self.data_sets.append(measurement_set.measurements)
+        return self.data_sets
+
+    def compute_nees(self,q,measurements = None):
         '''
         Computes the average Normalized Estimated Error Squared (nees) for a given
         filter and process noise q.
@@ -63,24 +158,49 @@ class NoiseFinder1Radar(object):
         q: float
             Process noise to be tested.
 
+        measurements: float numpy array or LabeledMeasurement iterable
+            Measurements the filter is processed on. If not specified, a new
+            data set is generated.
+
         Returns
         -------
         mean_nees: float
             Average nees of the tested filter/process noise.
 
         '''
-        x0 = self.states[0,0]
-        y0 = self.states[0,3]
-        z0 = self.states[0,6]
-        filter = self.filter(dim_x = 9, dim_z = 3, radar = self.radar, q = q, x0 = x0, y0 = y0, z0 = z0)
-        benchmark = Benchmark(radars = self.radar, radar_filter = filter, states = self.states)
-        benchmark.launch_benchmark(with_nees = True, plot = False)
+        benchmark = self.gen_benchmark(radar_filter = self.gen_filter(q))
+        if measurements is None:
+            benchmark.launch_benchmark(with_nees = True, plot = False)
+        else:
+            benchmark.process_filter(measurements = measurements, with_nees = True)
         return benchmark.nees
 
+    def compute_score(self,q,measurements):
+        '''
+        Computes the average nees of a given filter and process noise q on given
+        measurements. The run is aborted as soon as it diverges.
+        Parameters
+        ----------
+        q: float
+            Process noise to be tested.
+
+        measurements: float numpy array or LabeledMeasurement iterable
+            Measurements the filter is processed on.
+
+        Returns
+        -------
+        score: float
+            Average nees, or NEESMonitor.SENTINEL if the run was aborted.
+        '''
+        monitor   = NEESMonitor(bound = self.nees_bound, burn_in = self.nees_burn_in)
+        benchmark = self.gen_benchmark(radar_filter = self.gen_filter(q))
+        benchmark.process_filter(measurements = measurements, monitor = monitor)
+        return monitor.score
+
     def iterate_same_simulation(self,q):
         '''
         Iterates the benchmark a given number of times to avoid unlucky singular
-        behavior.
+        behavior. The iterations are processed on the shared data sets.
         Parameters
         ----------
         q: float
@@ -91,26 +211,118 @@ class NoiseFinder1Radar(object):
         means_nees: float iterable
             Means of the nees of the iterations.
         '''
+        if self.data_sets is None or len(self.data_sets) != self.nb_iterations:
+            self.gen_data_sets()
         one_q_means_nees = []
-        for _ in range(self.nb_iterations): # in case of unlucky simulations
-            mean_nees = np.mean(self.compute_nees(q))
+        for measurements in self.data_sets: # in case of unlucky simulations
+            mean_nees = self.compute_score(q,measurements)
             one_q_means_nees.append(mean_nees)
         return one_q_means_nees
 
+    def format_q(self,q):
+        '''
+        Formats a tested process noise into its key in means_nees.
+        Parameters
+        ----------
+        q: float
+            Tested process noise.
+
+        Returns
+        -------
+        key: float
+            Key of q in means_nees.
+        '''
+        return float(q)
+
+    def evaluate(self,q):
+        '''
+        Computes the score of a process noise q: the smallest average nees over
+        the iterations. Diverging filters (non finite nees or numerical errors
+        such as non positive definite covariances) get an infinite score.
+        Parameters
+        ----------
+        q: float
+            Tested process noise.
+
+        Returns
+        -------
+        score: float
+            Score of q (the smaller the better).
+        '''
+        try:
+            score = min(self.iterate_same_simulation(q))
+        except ValueError: # Including LinAlgError
+            return np.inf
+        return float(score) if np.isfinite(score) else np.inf
+
+    def evaluate_all(self,qs):
+        '''
+        Evaluates a list of process noises, in parallel if more than one worker
+        is used, and adds the entries q/average nees.
+        Parameters
+        ----------
+        qs: float iterable
+            Process noises to be tested.
+        '''
+        qs = [self.format_q(q) for q in qs]
+        qs = [q for q in qs if not(q in self.means_nees)]
+        if self.data_sets is None or len(self.data_sets) != self.nb_iterations:
+            self.gen_data_sets()
+        if self.nb_workers == 1:
+            self._collect_scores(qs,map(self.evaluate,qs))
+        else:
+            with ProcessPoolExecutor(max_workers = self.nb_workers,
+                                     initializer = _init_worker,
+                                     initargs = (self,)) as executor:
+                self._collect_scores(qs,executor.map(_evaluate_q,qs))
+
+    def _collect_scores(self,qs,scores):
+        '''
+        Stores the scores of the qs as they come.
+        '''
+        for count,(q,score) in enumerate(zip(qs,scores)):
+            self.means_nees[q] = score
+            # Proof of life
+            if (count%10 == 0): print("Ongoing: step n°{0}/{1}".format(count,len(qs)))
+        print("Ongoing: step n°{0}/{0}".format(len(qs)))
+
     def launch_benchmark(self):
         '''
         Tests the filter over all the qs in TO_TEST. Adds the entry q/average nees.
         e.g.: self.mean_nees = {q: mean_nees for q, ...}
         '''
-        count = 0
-        for q in self.TO_TEST:  # Loop over all the values that should be tested
-            current_mean_nees = self.iterate_same_simulation(q)
-            self.means_nees[q] = min(current_mean_nees)
+        self.evaluate_all(self.TO_TEST)
 
-            # Proof of life
-            if (count%10 == 0): print("Ongoing: step n°{0}/430".format(count))
-            count += 1
-        print("Ongoing: step n°430/430")
+    def launch_adaptive_benchmark(self,nb_points = 9,nb_refinements = 3):
+        '''
+        Searches the best q with a coarse-to-fine grid on log10(q): a coarse
+        grid is tested between the extrema of TO_TEST, then a finer grid is
+        tested around the best q found, nb_refinements times.
+        Parameters
+        ----------
+        nb_points: int
+            Number of qs tested at each level (at least 3).
+
+        nb_refinements: int
+            Number of refinements after the coarse grid.
+
+        Returns
+        -------
+        best_value: float
+            q value with the smallest associated average nees.
+        '''
+        if nb_points < 3:
+            raise ValueError('At least 3 points per level are needed')
+        log_min = np.log10(min(self.TO_TEST))
+        log_max = np.log10(max(self.TO_TEST))
+        low, high = log_min, log_max
+        for _ in range(nb_refinements + 1):
+            self.evaluate_all(np.logspace(low,high,num = nb_points))
+            # The next grid spans the neighbours of the best q
+            log_best  = np.log10(self.best_value())
+            step      = (high - low)/(nb_points - 1)
+            low, high = max(log_best - step,log_min), min(log_best + step,log_max)
+        return self.best_value()
 
     def best_value(self):
         '''
@@ -141,21 +353,38 @@ class NoiseFinderMultipleRadars(NoiseFinder1Radar):
         Number of times the same simulation will be processed. Put other than 1
         if you think
 
+    nb_workers: int
+        Number of worker processes evaluating the qs.
+
+    seed: int
+        Seed of the random number generator used to generate the data sets.
+
+    nees_bound: float
+        Running NEES above which a run is aborted.
+
+    nees_burn_in: int
+        Number of first steps during which the bound is not checked.
+
     Notes
     -----
     Please see NoiseFinder1Radar help for more information.
     '''
-    def __init__(self,radars,states,filter,nb_iterations = 1):
+    def __init__(self,radars,states,filter,nb_iterations = 1,nb_workers = 1,seed = None,
+                 nees_bound = np.inf,nees_burn_in = 0):
         self.radars        = radars
         self.states        = states
         self.filter        = filter
         self.nb_iterations = nb_iterations
+        self.nb_workers    = nb_workers
+        self.seed          = seed
+        self.nees_bound    = nees_bound
+        self.nees_burn_in  = nees_burn_in
         self.means_nees    = {}
+        self.data_sets     = None
 
-    def compute_nees(self,q):
+    def gen_filter(self,q):
         '''
-        Computes the average Normalized Estimated Error Squared (nees) for a given
-        filter and process noise q.
+        Creates the tested filter with a given process noise q.
         Parameters
         ----------
         q: float
@@ -163,13 +392,25 @@ class NoiseFinderMultipleRadars(NoiseFinder1Radar):
 
         Returns
         -------
-        mean_nees: float
-            Average nees of the tested filter/process noise.
+        filter: RadarFilterModel
+            Filter initialized on the first state of the system.
         '''
         x0 = self.states[0,0]
         y0 = self.states[0,3]
         z0 = self.states[0,6]
-        filter = self.filter(radars = self.radars, q = q, x0 = x0, y0 = y0, z0 = z0)
-        benchmark = Benchmark(radars = self.radars, radar_filter = filter, states = self.states)
-        benchmark.launch_benchmark(with_nees = True, plot = False)
-        return benchmark.nees
+        return self.filter(radars = self.radars, q = q, x0 = x0, y0 = y0, z0 = z0)
+
+    def gen_benchmark(self,radar_filter):
+        '''
+        Creates a benchmark of the observed system with a given filter.
+        Parameters
+        ----------
+        radar_filter: RadarFilterModel
+            Filter of the benchmark.
+
+        Returns
+        -------
+        benchmark: Benchmark
+            Benchmark of the system.
+        '''
+        return Benchmark(radars = self.radars, radar_filter = radar_filter, states = self.states)
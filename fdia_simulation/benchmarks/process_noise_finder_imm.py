@@ -6,23 +6,20 @@ Created on Mon Jul 30 13:56:47 2019
 """
 
 import numpy as np
-from fdia_simulation.models     import Radar, Track
+from fdia_simulation.filters    import RadarIMM
 from fdia_simulation.benchmarks import Benchmark
-from fdia_simulation.benchmarks import NoiseFinder1Radar,NoiseFinderMultipleRadars
-
-##############################
-# Not implemented anymore due
-# to computational limitations
-##############################
+from fdia_simulation.benchmarks import NoiseFinder1Radar
 
 class NoiseFinderIMM1Radar(NoiseFinder1Radar):
     '''
     Implements a helper to find the correct process noises of an Interactive
     Multiple Models Estimator (IMM) in the case of a 1-radar observation.
+    The qs of the models are tuned by coordinate descent on log10(q) instead
+    of the exhaustive grid (len(TO_TEST)^nb_filters benchmarks).
     Parameters
     ----------
-    radars: Radar iterable
-        List of the radars observing the system.
+    radar: Radar object
+        The radar observing the system.
 
     states: float numpy array
         States of the observed system.
@@ -34,6 +31,22 @@ class NoiseFinderIMM1Radar(NoiseFinder1Radar):
         Number of times the same simulation will be processed. Put other than 1
         if you think the randomness can generate unlucky faulty simulations.
 
+    nb_workers: int
+        Number of worker processes evaluating the candidates.
+
+    seed: int
+        Seed of the random number generator used to generate the data sets.
+
+    screening_steps: int
+        Number of first measurements of the first data set a candidate is
+        screened on before its full evaluation. None disables the screening.
+
+    nees_bound: float
+        Running NEES above which a run is aborted (see NEESMonitor).
+
+    nees_burn_in: int
+        Number of first steps during which the bound is not checked.
+
     Attributes
     ----------
     Same as parameters +
@@ -43,10 +56,15 @@ class NoiseFinderIMM1Radar(NoiseFinder1Radar):
     trans: float numpy array
         Transition probabilities between the models.
 
-    mean_nees: dictionary(key:float, value:float)
+    mean_nees: dictionary(key:float tuple, value:float)
         Dictionary of every tested combination of qs (key) and its associated
         average nees (value).
         e.g.:  (q1,q2) -> 30. is an entry in the dictionary for a 2-models estimator.
+
+    nees_threshold: float
+        Screening nees above which a candidate is rejected without its full
+        evaluation (infinite score). It is set from the screening nees of the
+        best qs so both quantities are computed on the same measurements.
     '''
 
 
@@ -61,7 +79,7 @@ class NoiseFinderIMM1Radar(NoiseFinder1Radar):
            [0.25,0.25,0.25,0.25]]
 
     # State transition probabilities for the different IMM (2, 3 and 4 models)
-    TRANS = [np.array([[0.998, 0.02],
+    TRANS = [np.array([[0.998, 0.002],
                        [0.100, 0.900]]),
              np.array([[0.998, 0.001, 0.001],
                        [0.050, 0.900, 0.050],
@@ -71,110 +89,168 @@ class NoiseFinderIMM1Radar(NoiseFinder1Radar):
                        [0.001, 0.001, 0.997, 0.001],
                        [0.001, 0.001, 0.001, 0.997]])]
 
-    def __init__(self,radars,states,filters,nb_iterations = 1):
-        self.radars        = radars
-        self.states        = states
-        self.filters       = filters
-        self.nb_iterations = nb_iterations
-
-        self.nb_filters = len(self.filters)
-        self.mu         = self.MUS[self.nb_filters-2]
-        self.trans      = self.TRANS[self.nb_filters-2]
-        self.means_nees = {}
-
-    def compute_nees(self,qs):
+    def __init__(self,radar,states,filters,nb_iterations = 1,nb_workers = 1,
+                 seed = None,screening_steps = 100,nees_bound = np.inf,nees_burn_in = 0):
+        self.radar           = radar
+        self.states          = states
+        self.filters         = filters
+        self.nb_iterations   = nb_iterations
+        self.nb_workers      = nb_workers
+        self.seed            = seed
+        self.screening_steps = screening_steps
+        self.nees_bound      = nees_bound
+        self.nees_burn_in    = nees_burn_in
+
+        self.nb_filters     = len(self.filters)
+        self.mu             = self.MUS[self.nb_filters-2]
+        self.trans          = self.TRANS[self.nb_filters-2]
+        self.means_nees     = {}
+        self.data_sets      = None
+        self.nees_threshold = np.inf
+
+    def gen_model(self,filter,q):
         '''
-        Computes the average Normalized Estimated Error Squared (nees) for a given
-        filter and list process noises qs.
+        Creates one model of the IMM with a given process noise q.
         Parameters
         ----------
-        qs: float iterable
-            Process noises to be tested.
+        filter: RadarFilterModel class
+            Model to be created.
+
+        q: float
+            Process noise of the model.
 
         Returns
         -------
-        mean_nees: float
-            Average nees of the tested filter/process noise.
+        model: RadarFilterModel
+            Model initialized on the first state of the system.
         '''
         x0 = self.states[0,0]
         y0 = self.states[0,3]
         z0 = self.states[0,6]
-        filters_to_be_tested = []
-        for filter,q in zip(self.filters,qs):
-            current_filter = filter(dim_x = 9, dim_z = 3, radar = self.radar, q = q, x0 = x0, y0 = y0, z0 = z0)
-            filters_to_be_tested.append(current_filter)
-        imm = IMMEstimator(mu = self.mu, M = self.trans, filters = self.filters)
-        benchmark = Benchmark(radar = self.radar, radar_filter = imm, states = self.states)
-        benchmark.launch_benchmark(with_nees = True, plot = False)
-        return benchmark.nees
-
-    def loop_IMM2(self):
+        return filter(dim_x = 9, dim_z = 3, radar = self.radar, q = q, x0 = x0, y0 = y0, z0 = z0)
+
+    def gen_filter(self,qs):
         '''
-        Looping function for an IMM with two models: loop over two q values.
+        Creates the tested IMM with given process noises qs.
+        Parameters
+        ----------
+        qs: float iterable
+            Process noises of the models.
+
+        Returns
+        -------
+        imm: RadarIMM
+            IMM estimator with one model per filter.
         '''
-        count  = 0
-        for q1 in self.TO_TEST:
-            for q2 in self.TO_TEST:
-                qs = [q1,q2]
-                current_mean_nees = self.iterate_same_simulation(q)
-                self.means_nees[q] = min(current_mean_nees)
-
-                # Proof of life
-                if (count%10 == 0): print("Ongoing: step n°{0}/430".format(count))
-                count += 1
-        print("Ongoing: step n°430/430")
-
-    def loop_IMM3(self):
+        models = [self.gen_model(filter,q) for filter,q in zip(self.filters,qs)]
+        return RadarIMM(models, self.mu, self.trans)
+
+    def format_q(self,qs):
         '''
-        Looping function for an IMM with two models: loop over two q values.
+        Formats tested process noises into their key in means_nees.
+        Parameters
+        ----------
+        qs: float iterable
+            Process noises of the models.
+
+        Returns
+        -------
+        key: float tuple
+            Key of qs in means_nees (rounded to 12 significant digits).
         '''
-        count  = 0
-        for q1 in self.TO_TEST:
-            for q2 in self.TO_TEST:
-                for q3 in self.TO_TEST:
-                    qs = [q1,q2,q3]
-                    current_mean_nees = self.iterate_same_simulation(q)
-                    self.means_nees[q] = min(current_mean_nees)
-                    # Proof of life
-                    if (count%10 == 0): print("Ongoing: step n°{0}/430".format(count))
-                    count += 1
-        print("Ongoing: step n°430/430")
-
-    def loop_IMM4(self):
+        return tuple(float('{0:.12g}'.format(q)) for q in qs)
+
+    def evaluate(self,qs):
         '''
-        Looping function for an IMM with two models: loop over two q values.
+        Computes the score of process noises qs. The candidate is first screened
+        on the beginning of the first data set and rejected if its nees is above
+        nees_threshold (or not finite).
+        Parameters
+        ----------
+        qs: float iterable
+            Process noises of the models.
+
+        Returns
+        -------
+        score: float
+            Score of qs (the smaller the better).
         '''
-        count  = 0
-        for q1 in self.TO_TEST:
-            for q2 in self.TO_TEST:
-                for q3 in self.TO_TEST:
-                    for q4 in self.TO_TEST:
-                        qs = [q1,q2,q3,q4]
-                        current_mean_nees = self.iterate_same_simulation(q)
-                        self.means_nees[q] = min(current_mean_nees)
-                        # Proof of life
-                        if (count%10 == 0): print("Ongoing: step n°{0}/430".format(count))
-                        count += 1
-        print("Ongoing: step n°430/430")
-    def launch_benchmark(self):
+        if not(self.screening_steps is None) and np.isfinite(self.nees_threshold):
+            if not(self.screening_score(qs) <= self.nees_threshold):
+                return np.inf
+        return NoiseFinder1Radar.evaluate(self,qs)
+
+    def screening_score(self,qs):
         '''
-        Tests the filter over all the qs in TO_TEST for each filter in the IMM.
-        Adds to the (q_mod1, q_mod2, ...) key the average nees as value.
-        e.g.: self.mean_nees = {(q_mod1, q_mod2, ...): associated mean_nees, ...}
+        Computes the score of process noises qs on the first screening_steps
+        measurements of the first data set.
+        Parameters
+        ----------
+        qs: float iterable
+            Process noises of the models.
+
+        Returns
+        -------
+        score: float
+            Average nees on the screening measurements (infinite if the filter
+            diverged).
         '''
-        if self.nb_filters == 2:
-            self.loop_IMM2()
+        screening_set = self.data_sets[0][:self.screening_steps]
+        try:
+            return self.compute_score(qs,screening_set)
+        except ValueError: # Including LinAlgError
+            return np.inf
 
-        elif self.nb_filters == 3:
-            self.loop_IMM3()
+    def launch_benchmark(self,nb_points = 7,nb_sweeps = 3,rejection_factor = 10.):
+        '''
+        Tunes the qs of the models by coordinate descent on log10(q): each
+        coordinate is tested on a grid of nb_points values (in parallel) with
+        the other ones fixed to their best value. The first sweep covers the
+        range of TO_TEST, the following ones one grid step around the best qs.
+        Parameters
+        ----------
+        nb_points: int
+            Number of values tested for each coordinate (at least 3).
+
+        nb_sweeps: int
+            Number of sweeps over all the coordinates.
 
-        elif self.nb_filters == 4:
-            self.loop_IMM4()
+        rejection_factor: float
+            Candidates whose screening nees is above rejection_factor times the
+            screening nees of the best qs are rejected.
 
-class NoiseFinderIMM2Radars(NoiseFinder1Radar):
+        Returns
+        -------
+        best_value: float tuple
+            qs with the smallest associated average nees.
+        '''
+        if nb_points < 3:
+            raise ValueError('At least 3 points per coordinate are needed')
+        log_min = np.log10(min(self.TO_TEST))
+        log_max = np.log10(max(self.TO_TEST))
+        log_qs  = np.full(self.nb_filters,(log_min + log_max)/2)
+        widths  = np.full(self.nb_filters,(log_max - log_min)/2)
+        self.evaluate_all([10**log_qs])
+        screening = not(self.screening_steps is None)
+        for _ in range(nb_sweeps):
+            for i in range(self.nb_filters):
+                low, high  = max(log_qs[i] - widths[i],log_min), min(log_qs[i] + widths[i],log_max)
+                candidates = np.tile(log_qs,(nb_points,1))
+                candidates[:,i] = np.linspace(low,high,num = nb_points)
+                if screening:
+                    self.nees_threshold = rejection_factor*self.screening_score(self.best_value())
+                self.evaluate_all(10**candidates)
+                log_qs = np.log10(self.best_value())
+            # The next sweep spans one grid step around the best qs
+            widths = widths*2/(nb_points - 1)
+        self.nees_threshold = np.inf
+        return self.best_value()
+
+
+class NoiseFinderIMMMultipleRadars(NoiseFinderIMM1Radar):
     '''
     Implements a helper to find the correct process noises of an Interactive
-    Multiple Models Estimator (IMM) in the case of a 2-radars observation.
+    Multiple Models Estimator (IMM) in the case of a multiple radars observation.
     Parameters
     ----------
     radars: Radar iterable
@@ -190,70 +266,76 @@ class NoiseFinderIMM2Radars(NoiseFinder1Radar):
         Number of times the same simulation will be processed. Put other than 1
         if you think the randomness can generate unlucky faulty simulations.
 
-    Attributes
-    ----------
-    Same as parameters +
-    mu: float iterable
-        Initial probabilities of the different models.
+    nb_workers: int
+        Number of worker processes evaluating the candidates.
 
-    trans: float numpy array
-        Transition probabilities between the models.
-
-    mean_nees: dictionary(key:float, value:float)
-        Dictionary of every tested combination of qs (key) and its associated
-        average nees (value).
-        e.g.:  (q1,q2) -> 30. is an entry in the dictionary for a 2-models estimator.
-    '''
-
-    # Initial probabilities for the different IMM (2, 3 and 4 models)
-    MUS = [[0.5,0.5],
-           [0.33,0.33,0.33],
-           [0.25,0.25,0.25,0.25]]
+    seed: int
+        Seed of the random number generator used to generate the data sets.
 
-    # State transition probabilities for the different IMM (2, 3 and 4 models)
-    TRANS = [np.array([[0.998, 0.02],
-                       [0.100, 0.900]]),
-             np.array([[0.998, 0.001, 0.001],
-                       [0.050, 0.900, 0.050],
-                       [0.001, 0.001, 0.998]]),
-             np.array([[0.997, 0.001, 0.001, 0.001],
-                       [0.050, 0.850, 0.050, 0.050],
-                       [0.001, 0.001, 0.997, 0.001],
-                       [0.001, 0.001, 0.001, 0.997]])]
+    screening_steps: int
+        Number of first measurements the candidates are screened on.
 
-    def __init__(self,radars,states,filters,nb_iterations = 1):
-        self.radars        = radars
-        self.states        = states
-        self.filters       = filters
-        self.nb_iterations = nb_iterations
+    nees_bound: float
+        Running NEES above which a run is aborted.
 
-        nb_filters      = len(self.filters)
-        self.mu         = self.MUS[nb_filters-2]
-        self.trans      = self.TRANS[nb_filters-2]
-        self.means_nees = {}
+    nees_burn_in: int
+        Number of first steps during which the bound is not checked.
 
-    def compute_nees(self,qs):
+    Notes
+    -----
+    Please see NoiseFinderIMM1Radar help for more information.
+    '''
+    def __init__(self,radars,states,filters,nb_iterations = 1,nb_workers = 1,
+                 seed = None,screening_steps = 100,nees_bound = np.inf,nees_burn_in = 0):
+        self.radars          = radars
+        self.states          = states
+        self.filters         = filters
+        self.nb_iterations   = nb_iterations
+        self.nb_workers      = nb_workers
+        self.seed            = seed
+        self.screening_steps = screening_steps
+        self.nees_bound      = nees_bound
+        self.nees_burn_in    = nees_burn_in
+
+        self.nb_filters     = len(self.filters)
+        self.mu             = self.MUS[self.nb_filters-2]
+        self.trans          = self.TRANS[self.nb_filters-2]
+        self.means_nees     = {}
+        self.data_sets      = None
+        self.nees_threshold = np.inf
+
+    def gen_model(self,filter,q):
         '''
-        Computes the average Normalized Estimated Error Squared (nees) for a given
-        filter and list process noises qs.
+        Creates one model of the IMM with a given process noise q.
         Parameters
         ----------
-        qs: float iterable
-            Process noises to be tested.
+        filter: RadarFilterModel class
+            Model to be created.
+
+        q: float
+            Process noise of the model.
 
         Returns
         -------
-        mean_nees: float
-            Average nees of the tested filter/process noise.
+        model: RadarFilterModel
+            Model initialized on the first state of the system.
         '''
         x0 = self.states[0,0]
         y0 = self.states[0,3]
         z0 = self.states[0,6]
-        filters_to_be_tested = []
-        for filter,q in zip(self.filters,qs):
-            current_filter = filter(dim_x = 9, dim_z = 6, radars = self.radars, q = q, x0 = x0, y0 = y0, z0 = z0)
-            filters_to_be_tested.append(current_filter)
-        imm = IMMEstimator(mu = self.mu, M = self.trans, filters = self.filters)
-        benchmark = Benchmark(radars = self.radars, radar_filter = imm, states = self.states)
-        benchmark.launch_benchmark(with_nees = True, plot = False)
-        return benchmark.nees
+        return filter(radars = self.radars, q = q, x0 = x0, y0 = y0, z0 = z0)
+
+    def gen_benchmark(self,radar_filter):
+        '''
+        Creates a benchmark of the observed system with a given filter.
+        Parameters
+        ----------
+        radar_filter: RadarIMM
+            Filter of the benchmark.
+
+        Returns
+        -------
+        benchmark: Benchmark
+            Benchmark of the system.
+        '''
+        return Benchmark(radars = self.radars, radar_filter = radar_filter, states = self.states)
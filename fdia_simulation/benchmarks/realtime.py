@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 15:41:27 2026
+
+@author: qde
+"""
+
+import time
+import asyncio
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from fdia_simulation.benchmarks.monte_carlo import RunningStatistics
+
+class RealTimeReplay(object):
+    '''
+    Implements a real-time test bench of the tracking loop: each radar is a
+    producer task emitting its measurements at their timestamps (scaled by a
+    speed factor) in a bounded queue consumed by the filter task. The filter
+    cycles run in a worker thread so the producers keep their pace while the
+    filter works: a filter too slow for the data rates fills the queue.
+    Parameters
+    ----------
+    radar_filter: RadarFilterModel or RadarIMM
+        Filter processing the measurements (e.g. MultiplePeriodRadarsFilterCV).
+
+    measurements: LabeledMeasurement iterable
+        Measurements of the radars, e.g. Benchmark.labeled_values or a
+        MeasurementReplay. They are dispatched to the producers by tag.
+
+    speed: float
+        Speed factor of the replay: 2. emits the measurements twice as fast as
+        their timestamps.
+
+    queue_size: int
+        Capacity of the queue between the producers and the filter.
+
+    drop_policy: str
+        Measurement dropped when the queue is full: "newest" (the incoming
+        one) or "oldest" (the first one waiting in the queue).
+
+    Attributes
+    ----------
+    Same as parameters +
+    latencies: float list
+        Delay (wall-clock seconds) between the scheduled emission of each
+        processed measurement and the end of its filter update.
+
+    service_times: RunningStatistics
+        Durations of the filter cycles (predict/update).
+
+    queue_depths: RunningStatistics
+        Queue depths observed after each emission.
+
+    emission_delays: RunningStatistics
+        Delays (wall-clock seconds) between the scheduled and the actual
+        emissions of the measurements by the producers.
+
+    nb_received, nb_processed, nb_dropped: ints
+        Counts of emitted, processed and dropped measurements.
+
+    estimated_states: float numpy array iterable
+        Estimated states after each processed measurement.
+    '''
+
+    DROP_POLICIES = ['newest','oldest']
+
+    def __init__(self,radar_filter,measurements,speed = 1.,queue_size = 100,
+                 drop_policy = 'newest'):
+        if not(drop_policy in self.DROP_POLICIES):
+            raise ValueError('The drop policy should be one of {0}'.format(self.DROP_POLICIES))
+        self.radar_filter = radar_filter
+        self.speed        = speed
+        self.queue_size   = queue_size
+        self.drop_policy  = drop_policy
+        # One stream of measurements per radar
+        self.streams = {}
+        for measurement in measurements:
+            self.streams.setdefault(measurement.tag,[]).append(measurement)
+        self.reset()
+
+    def reset(self):
+        '''
+        Resets the metrics of the bench.
+        '''
+        self.latencies        = []
+        self.service_times    = RunningStatistics()
+        self.queue_depths     = RunningStatistics()
+        self.emission_delays  = RunningStatistics()
+        self.nb_received      = 0
+        self.nb_processed     = 0
+        self.nb_dropped       = 0
+        self.estimated_states = []
+
+    async def produce(self,stream,queue,start):
+        '''
+        Producer task of a radar: emits its measurements at their timestamps.
+        Parameters
+        ----------
+        stream: LabeledMeasurement iterable
+            Time-sorted measurements of the radar.
+
+        queue: asyncio.Queue
+            Queue consumed by the filter task.
+
+        start: float
+            Loop time corresponding to the time 0 of the measurements.
+        '''
+        loop = asyncio.get_running_loop()
+        for measurement in stream:
+            scheduled = start + measurement.time/self.speed
+            # Measurements already due (the loop was busy) are emitted at once
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.emission_delays.update(max(0.,loop.time() - scheduled))
+            self.nb_received += 1
+            if queue.full():
+                self.nb_dropped += 1
+                if self.drop_policy == 'newest':
+                    continue
+                queue.get_nowait()
+                queue.task_done()
+            queue.put_nowait((scheduled,measurement))
+            self.queue_depths.update(queue.qsize())
+
+    def process(self,measurement):
+        '''
+        Filter cycle (run in the worker thread).
+        Parameters
+        ----------
+        measurement: LabeledMeasurement
+            Processed measurement.
+
+        Returns
+        -------
+        state: float numpy array
+            Estimated state after the update.
+
+        duration: float
+            Duration of the cycle (seconds).
+        '''
+        begin = time.monotonic()
+        self.radar_filter.predict()
+        self.radar_filter.update(measurement)
+        return self.radar_filter.x[:,0].copy(), time.monotonic() - begin
+
+    async def consume(self,queue,executor):
+        '''
+        Filter task: processes the measurements in their arrival order.
+        Parameters
+        ----------
+        queue: asyncio.Queue
+            Queue filled by the producers.
+
+        executor: concurrent.futures.Executor
+            Single worker running the filter cycles out of the event loop.
+        '''
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled, measurement = await queue.get()
+            state, duration = await loop.run_in_executor(executor,self.process,measurement)
+            self.service_times.update(duration)
+            self.latencies.append(loop.time() - scheduled)
+            self.estimated_states.append(state)
+            self.nb_processed += 1
+            queue.task_done()
+
+    async def run(self):
+        '''
+        Runs the producers and the filter task until every measurement has
+        been processed or dropped.
+        '''
+        loop  = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize = self.queue_size)
+        with ThreadPoolExecutor(max_workers = 1) as executor:
+            start = loop.time()
+            consumer  = asyncio.ensure_future(self.consume(queue,executor))
+            producers = [self.produce(stream,queue,start) for stream in self.streams.values()]
+            try:
+                await asyncio.gather(*producers)
+                await queue.join()
+            finally:
+                consumer.cancel()
+                try:
+                    await consumer
+                except asyncio.CancelledError:
+                    pass
+
+    def launch_benchmark(self):
+        '''
+        Launches the real-time replay.
+        Returns
+        -------
+        report: dictionary
+            See report().
+        '''
+        self.reset()
+        asyncio.run(self.run())
+        return self.report()
+
+    def report(self):
+        '''
+        Summarizes the metrics of the last replay.
+        Returns
+        -------
+        report: dictionary
+            Counts of received/processed/dropped measurements, latency mean,
+            p50, p99 and max, mean service time, mean/max queue depth and
+            maximal emission delay of the producers (durations in seconds).
+        '''
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {'nb_received'       : self.nb_received,
+                'nb_processed'      : self.nb_processed,
+                'nb_dropped'        : self.nb_dropped,
+                'latency_mean'      : float(np.mean(latencies)),
+                'latency_p50'       : float(np.percentile(latencies,50)),
+                'latency_p99'       : float(np.percentile(latencies,99)),
+                'latency_max'       : float(np.max(latencies)),
+                'service_time'      : self.service_times.mean,
+                'queue_depth_mean'  : self.queue_depths.mean,
+                'queue_depth_max'   : self.queue_depths.max if self.queue_depths.count else 0,
+                'emission_delay_max': self.emission_delays.max if self.emission_delays.count else 0.}
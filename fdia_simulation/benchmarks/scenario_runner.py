@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 10:41:08 2026
+
+@author: qde
+"""
+
+import os
+import json
+import time
+import threading
+import numpy as np
+from copy                import deepcopy
+from concurrent.futures  import ProcessPoolExecutor, as_completed
+from fdia_simulation.models            import Radar, PeriodRadar, Track
+from fdia_simulation.filters           import (RadarFilterCA, MultipleRadarsFilterCA, MultiplePeriodRadarsFilterCA,
+                                               RadarFilterCV, MultipleRadarsFilterCV, MultiplePeriodRadarsFilterCV,
+                                               RadarFilterCT, MultipleRadarsFilterCT, MultiplePeriodRadarsFilterCT,
+                                               RadarFilterTA, MultipleRadarsFilterTA, MultiplePeriodRadarsFilterTA,
+                                               RadarIMM)
+from fdia_simulation.attackers         import (DOSAttacker, DriftAttacker, CumulativeDriftAttacker,
+                                               DOSPeriodAttacker, DriftPeriodAttacker, CumulativeDriftPeriodAttacker)
+from fdia_simulation.anomaly_detectors import MahalanobisDetector, EuclidianDetector
+from fdia_simulation.benchmarks.benchmark   import Benchmark, NEESMonitor
+from fdia_simulation.benchmarks.monte_carlo import count_anomalies
+from fdia_simulation.helpers.results_store  import benchmark_traces
+
+# Filter classes of each model: one radar, multiple radars, multiple PeriodRadars
+SCENARIO_FILTERS = {
+    'CV': (RadarFilterCV, MultipleRadarsFilterCV, MultiplePeriodRadarsFilterCV),
+    'CA': (RadarFilterCA, MultipleRadarsFilterCA, MultiplePeriodRadarsFilterCA),
+    'CT': (RadarFilterCT, MultipleRadarsFilterCT, MultiplePeriodRadarsFilterCT),
+    'TA': (RadarFilterTA, MultipleRadarsFilterTA, MultiplePeriodRadarsFilterTA)}
+
+SCENARIO_DETECTORS = {'Mahalanobis': MahalanobisDetector,
+                      'Euclidian'  : EuclidianDetector}
+
+# Attacker classes: radars with the same data rate, PeriodRadars
+SCENARIO_ATTACKERS = {
+    'DOS'             : (DOSAttacker, DOSPeriodAttacker),
+    'Constant Drift'  : (DriftAttacker, DriftPeriodAttacker),
+    'Cumulative Drift': (CumulativeDriftAttacker, CumulativeDriftPeriodAttacker)}
+
+# Default transition matrices of the IMMs (by number of models)
+SCENARIO_TRANSITIONS = {
+    2: [[0.998, 0.002],
+        [0.100, 0.900]],
+    3: [[0.998, 0.001, 0.001],
+        [0.050, 0.900, 0.050],
+        [0.001, 0.001, 0.998]],
+    4: [[0.997, 0.001, 0.001, 0.001],
+        [0.050, 0.850, 0.050, 0.050],
+        [0.001, 0.001, 0.997, 0.001],
+        [0.001, 0.001, 0.001, 0.997]]}
+
+# Default scenario (the one of the application)
+DEFAULT_SCENARIO = {
+    'name'      : 'scenario',
+    'seed'      : None,
+    'trajectory': {'name': 'landing'},
+    'radar_type': 'Radar',
+    'radars'    : [{'x': -6000, 'y': 1000, 'dt': 0.2, 'r_std': 5., 'theta_std': 0.005, 'phi_std': 0.005},
+                   {'x': 1000, 'y': 4000, 'dt': 0.05}],
+    'filters'   : [{'model': 'CV', 'q': 10. , 'detector': None},
+                   {'model': 'CA', 'q': 400., 'detector': None},
+                   {'model': 'CT', 'q': 25. , 'detector': None},
+                   {'model': 'TA', 'q': 350., 'detector': None}],
+    'imm'       : {},
+    'attacker'  : {'type': 'Cumulative Drift', 'radar': 0, 't0': 300, 'time': 500, 'drift': [0,0,1]},
+    'with_nees' : True,
+    'burn_in'   : 0}
+
+class ProgressMonitor(NEESMonitor):
+    '''
+    Implements a monitor reporting the progress of a simulation and allowing
+    its cancellation from another thread (e.g. a graphical interface).
+    Parameters
+    ----------
+    callback: callable
+        Function receiving the progress dictionaries: "step", "nb_steps",
+        "nees", "nees_mean" and "position" (estimated [x,y,z]).
+
+    every: int
+        Number of steps between two reports.
+
+    Attributes
+    ----------
+    Same as parameters +
+    cancelled: boolean
+        True if the simulation was cancelled.
+
+    Notes
+    -----
+    The cancellation is effective from the filter cycles: the data generation
+    is not interrupted. A cancelled run is aborted (see NEESMonitor) and its
+    results are truncated to the processed steps.
+    '''
+    def __init__(self,callback,every = 50):
+        NEESMonitor.__init__(self)
+        self.callback     = callback
+        self.every        = every
+        self.nb_steps     = None
+        self.radar_filter = None
+        self._cancel      = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        '''
+        Requests the cancellation of the simulation (thread-safe).
+        '''
+        self._cancel.set()
+
+    def start(self,nb_steps,radar_filter):
+        '''
+        Sets the number of steps and the filter of the simulation.
+        '''
+        self.nb_steps     = nb_steps
+        self.radar_filter = radar_filter
+
+    def update(self,nees):
+        res = NEESMonitor.update(self,nees)
+        if self.count % self.every == 0 or self.count == self.nb_steps:
+            position = None
+            if not(self.radar_filter is None):
+                position = self.radar_filter.x[[0,3,6],0].copy()
+            self.callback({'step'     : self.count,
+                           'nb_steps' : self.nb_steps,
+                           'nees'     : nees,
+                           'nees_mean': self.mean,
+                           'position' : position})
+        if self.cancelled:
+            self.aborted = True
+            return False
+        return res
+
+
+def load_scenarios(path):
+    '''
+    Reads scenarios from a JSON or YAML file (".yaml" or ".yml", needs
+    PyYAML). The file contains a scenario, a list of scenarios or
+    {"defaults": {...}, "scenarios": [...]} where the defaults complete each
+    scenario. The unnamed scenarios are named after the file and their
+    position in it (e.g. "landings001" for the second scenario of
+    "landings.json"), so the scenarios of several files can run in one batch.
+    Parameters
+    ----------
+    path: str
+        Path of the file.
+
+    Returns
+    -------
+    scenarios: dictionary list
+        Complete scenarios (see complete_scenario()).
+    '''
+    with open(path) as scenario_file:
+        if path.endswith(('.yaml','.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError('PyYAML is needed to read {0}, use a JSON file otherwise'.format(path))
+            content = yaml.safe_load(scenario_file)
+        else:
+            content = json.load(scenario_file)
+    defaults = {}
+    if isinstance(content,dict) and 'scenarios' in content:
+        defaults = content.get('defaults',{})
+        content  = content['scenarios']
+    if isinstance(content,dict):
+        content = [content]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    scenarios = []
+    for i,scenario in enumerate(content):
+        scenario = dict(defaults,**scenario)
+        scenario.setdefault('name','{0}{1:03d}'.format(stem,i))
+        scenarios.append(complete_scenario(scenario,i))
+    return scenarios
+
+def complete_scenario(scenario,position = 0):
+    '''
+    Completes a scenario with the values of DEFAULT_SCENARIO.
+    Parameters
+    ----------
+    scenario: dictionary
+        Scenario (all the keys are optional):
+        "name": str, used for the result files.
+        "seed": int, seed of the noise (None: random).
+        "trajectory": name of a Track.gen_* method (e.g. "landing",
+        "take off") or {"name": ..., "params": {keyword arguments}}.
+        "radar_type": "Radar" or "PeriodRadar".
+        "radars": list of {"x","y","z","dt","r_std","theta_std","phi_std"}
+        ("dt" is only used by PeriodRadars).
+        "filters": list of {"model": "CV"/"CA"/"CT"/"TA", "q": float,
+        "detector": "Mahalanobis"/"Euclidian"/None}. Several filters make an IMM.
+        "imm": {"mu": [...], "trans": [[...]]}, IMM parameters.
+        "attacker": {"type": "DOS"/"Constant Drift"/"Cumulative Drift",
+        "radar": position, "t0": int, "time": int, "drift": [dr,dtheta,dphi]}
+        or None.
+        "with_nees": boolean, "burn_in": int, NEES computation.
+
+    position: int
+        Position of the scenario in its batch, used for the default name.
+
+    Returns
+    -------
+    scenario: dictionary
+        Copy of the scenario with all the keys.
+    '''
+    complete = deepcopy(DEFAULT_SCENARIO)
+    complete['name'] = '{0}{1:03d}'.format(DEFAULT_SCENARIO['name'],position)
+    complete.update(deepcopy(scenario))
+    if isinstance(complete['trajectory'],str):
+        complete['trajectory'] = {'name': complete['trajectory']}
+    if not(complete['radar_type'] in ['Radar','PeriodRadar']):
+        raise ValueError('The radar type should be "Radar" or "PeriodRadar"')
+    if not complete['radars'] or not complete['filters']:
+        raise ValueError('A scenario needs at least one radar and one filter')
+    return complete
+
+def build_states(scenario):
+    '''
+    Generates the true states of the trajectory of a scenario.
+    '''
+    trajectory = scenario['trajectory']
+    method_name = 'gen_' + trajectory['name'].replace(' ','').replace('_','').lower()
+    track = Track()
+    if not hasattr(track,method_name):
+        raise ValueError('Unknown trajectory: {0}'.format(trajectory['name']))
+    return getattr(track,method_name)(**trajectory.get('params',{}))
+
+def build_radars(scenario):
+    '''
+    Generates the radars of a scenario.
+    '''
+    radar_class = PeriodRadar if scenario['radar_type'] == 'PeriodRadar' else Radar
+    radars = []
+    for parameters in scenario['radars']:
+        parameters = dict(parameters)
+        if radar_class == Radar:
+            # Radars with the same data rate use the default one
+            parameters.pop('dt',None)
+        radars.append(radar_class(**parameters))
+    return radars
+
+def build_filter(scenario,radars,states):
+    '''
+    Generates the filter (or IMM) of a scenario, initialized on the first
+    position of the trajectory.
+    '''
+    x0, y0, z0 = Track().initial_position(states)
+    filters = []
+    for parameters in scenario['filters']:
+        single, multiple, period = SCENARIO_FILTERS[parameters['model']]
+        detector = parameters.get('detector')
+        if not(detector is None) and detector != 'None':
+            detector = SCENARIO_DETECTORS[detector]()
+        else:
+            detector = None
+        if scenario['radar_type'] == 'PeriodRadar':
+            filter = period(radars = radars, q = parameters['q'], detector = detector,
+                            x0 = x0, y0 = y0, z0 = z0)
+        elif len(radars) > 1:
+            filter = multiple(radars = radars, q = parameters['q'], detector = detector,
+                              x0 = x0, y0 = y0, z0 = z0)
+        else:
+            filter = single(radar = radars[0], q = parameters['q'], detector = detector,
+                            x0 = x0, y0 = y0, z0 = z0)
+        filters.append(filter)
+    if len(filters) == 1:
+        return filters[0]
+    nb_models = len(filters)
+    mu    = scenario['imm'].get('mu',[1/nb_models]*nb_models)
+    trans = scenario['imm'].get('trans',SCENARIO_TRANSITIONS.get(nb_models))
+    if trans is None:
+        raise ValueError('The IMM transition matrix ("imm": {{"trans": ...}}) is needed for {0} models'.format(nb_models))
+    return RadarIMM(filters, np.array(mu), np.array(trans))
+
+def build_attacker(scenario,radars,radar_filter):
+    '''
+    Generates the attacker of a scenario (None if there is none).
+    '''
+    parameters = scenario['attacker']
+    if not parameters or parameters.get('type') in [None,'None']:
+        return None
+    attacker_class = SCENARIO_ATTACKERS[parameters['type']][scenario['radar_type'] == 'PeriodRadar']
+    radar_position = int(parameters.get('radar',0))
+    arguments = {'filter': radar_filter, 't0': int(parameters['t0']), 'time': int(parameters['time']),
+                 'radar': radars[radar_position], 'radar_pos': radar_position}
+    drift = np.reshape(np.array(parameters.get('drift',[0,0,1]),dtype = float),(3,1))
+    if parameters['type'] == 'Constant Drift':
+        arguments['attack_drift'] = drift
+    elif parameters['type'] == 'Cumulative Drift':
+        arguments['delta_drift'] = drift
+    return attacker_class(**arguments)
+
+def build_benchmark(scenario):
+    '''
+    Generates the benchmark of a scenario (trajectory, radars, filter and
+    attacker).
+    Parameters
+    ----------
+    scenario: dictionary
+        Scenario (see complete_scenario()).
+
+    Returns
+    -------
+    benchmark: Benchmark
+        Benchmark ready to be launched.
+    '''
+    scenario     = complete_scenario(scenario)
+    states       = build_states(scenario)
+    radars       = build_radars(scenario)
+    radar_filter = build_filter(scenario,radars,states)
+    attacker     = build_attacker(scenario,radars,radar_filter)
+    return Benchmark(radars = radars, radar_filter = radar_filter, states = states,
+                     attacker = attacker)
+
+def simulate_scenario(scenario,monitor = None):
+    '''
+    Simulates a scenario and summarizes it.
+    Parameters
+    ----------
+    scenario: dictionary
+        Scenario (see complete_scenario()).
+
+    monitor: NEESMonitor
+        Monitor of the filter cycles (see Benchmark.process_filter()), e.g. a
+        ProgressMonitor to follow or cancel the simulation.
+
+    Returns
+    -------
+    benchmark: Benchmark
+        The processed benchmark.
+
+    summary: dictionary
+        "name", "seed", "nb_steps", "anomalies", "aborted" (True if the
+        monitor stopped the run), "duration" (seconds) and, if the NEES is
+        computed, "nees_mean", "nees_max" and "rmse".
+    '''
+    scenario = complete_scenario(scenario)
+    begin = time.perf_counter()
+    np.random.seed(scenario['seed'])
+    benchmark = build_benchmark(scenario)
+    benchmark.gen_data_set()
+    if isinstance(monitor,ProgressMonitor):
+        measurements = benchmark.labeled_values if benchmark.radar_is_period else benchmark.measured_values
+        monitor.start(len(measurements),benchmark.radar_filter)
+    benchmark.process_filter(with_nees = scenario['with_nees'],monitor = monitor)
+    anomalies, _ = count_anomalies(benchmark.radar_filter)
+    summary = {'name'     : scenario['name'],
+               'seed'     : scenario['seed'],
+               'nb_steps' : len(benchmark.estimated_states),
+               'anomalies': anomalies,
+               'aborted'  : not(monitor is None) and monitor.aborted}
+    nees = benchmark.nees[scenario['burn_in']:,0]
+    if scenario['with_nees'] and len(nees) > 0:
+        summary['nees_mean'] = float(np.mean(nees))
+        summary['nees_max']  = float(np.max(nees))
+        summary['rmse']      = float(benchmark.compute_rmse())
+    summary['duration'] = time.perf_counter() - begin
+    return benchmark, summary
+
+def run_scenario(scenario,output_dir = None,plot = False):
+    '''
+    Simulates a scenario without any output on the screen (unless plot).
+    Parameters
+    ----------
+    scenario: dictionary
+        Scenario (see complete_scenario()).
+
+    output_dir: str
+        Folder where the traces of the run are written as "<name>.npz" (see
+        benchmark_traces()). Default value: nothing is written.
+
+    plot: boolean
+        Triggers the plots of the benchmark.
+
+    Returns
+    -------
+    summary: dictionary
+        See simulate_scenario().
+    '''
+    benchmark, summary = simulate_scenario(scenario)
+    if not(output_dir is None):
+        os.makedirs(output_dir,exist_ok = True)
+        np.savez(os.path.join(output_dir,summary['name'] + '.npz'),**benchmark_traces(benchmark))
+    if plot:
+        benchmark.generate_plotting_labels()
+        benchmark.plot()
+    return summary
+
+def run_batch(scenarios,output_dir = None,nb_workers = 1):
+    '''
+    Simulates scenarios over a pool of processes.
+    Parameters
+    ----------
+    scenarios: dictionary iterable
+        Scenarios (see complete_scenario()).
+
+    output_dir: str
+        Folder of the traces of each scenario and of "summary.json", the list
+        of the summaries. Default value: nothing is written.
+
+    nb_workers: int
+        Number of processes (None: number of CPUs, 1: no pool).
+
+    Returns
+    -------
+    summaries: dictionary list
+        Summary of each scenario (see run_scenario()) in the scenarios order.
+    '''
+    scenarios = [complete_scenario(scenario,i) for i,scenario in enumerate(scenarios)]
+    names = [scenario['name'] for scenario in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError('The names of the scenarios should be unique')
+    if nb_workers == 1:
+        summaries = [run_scenario(scenario,output_dir) for scenario in scenarios]
+    else:
+        summaries = []
+        with ProcessPoolExecutor(max_workers = nb_workers) as executor:
+            futures = [executor.submit(run_scenario,scenario,output_dir) for scenario in scenarios]
+            for future in as_completed(futures):
+                summaries.append(future.result())
+        order = {name: i for i,name in enumerate(names)}
+        summaries.sort(key = lambda summary: order[summary['name']])
+    if not(output_dir is None):
+        os.makedirs(output_dir,exist_ok = True)
+        with open(os.path.join(output_dir,'summary.json'),'w') as summary_file:
+            json.dump(summaries,summary_file,indent = 2)
+    return summaries
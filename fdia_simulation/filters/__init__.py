@@ -13,7 +13,8 @@ __all__ = ["m_radars_filter_model",
            "radar_filter_ct",
            "radar_filter_ta",
            "radar_filter_model",
-           "radar_imm"]
+           "radar_imm",
+           "multi_target_tracker"]
 
 from .radar_filter_model    import *
 from .m_radars_filter_model import *
@@ -22,3 +23,4 @@ from .radar_filter_ca       import *
 from .radar_filter_ct       import *
 from .radar_filter_ta       import *
 from .radar_imm             import *
+from .multi_target_tracker  import *
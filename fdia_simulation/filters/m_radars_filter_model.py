@@ -6,6 +6,8 @@ Created on Fri Jul 05 10:31:40 2019
 """
 
 import numpy as np
+from bisect                  import bisect_right
+from collections             import deque
 from math                    import sqrt, atan2
 # from copy                    import deepcopy
 from scipy.linalg            import block_diag
@@ -103,13 +105,42 @@ class MultipleRadarsFilterModel(RadarFilterModel):
 class MultiplePeriodRadarsFilterModel(MultipleRadarsFilterModel):
     '''Implements a filter model using multiple sensors with different data rates
     and combining them through the measurement function and matrix.
+    Parameters
+    ----------
+    Same as MultipleRadarsFilterModel +
+    history_size: int
+        Number of processed measurements kept (with the state of the filter
+        after each of them) to process out-of-sequence measurements. 0 disables
+        the handling. Default value: 20.
+
+    Attributes
+    ----------
+    oosm_counter: int
+        Number of out-of-sequence measurements processed.
+
+    oosm_dropped: int
+        Number of out-of-sequence measurements older than the history, which
+        are ignored.
+
+    Notes
+    -----
+    A measurement older than the last processed one (out-of-sequence
+    measurement) is inserted in the history: the filter is restored to its
+    state after the previous measurement, then the late measurement and the
+    following ones are processed again (fixed-lag reprocessing). The result is
+    the one of the measurements received in time order. In an IMM, each model
+    reprocesses its own history (the mixing is not replayed).
     '''
-    def __init__(self,*args,**kwargs):
+    def __init__(self,*args,history_size = 20,**kwargs):
         MultipleRadarsFilterModel.__init__(self,*args,**kwargs)
         self._last_t = 0
         self._tag_radars()
         self.Hs = []
         self.Zs = []
+        self.history_size = history_size
+        self._history     = deque(maxlen = max(1,history_size))
+        self.oosm_counter = 0
+        self.oosm_dropped = 0
 
     def _tag_radars(self):
         '''
@@ -211,11 +242,62 @@ class MultiplePeriodRadarsFilterModel(MultipleRadarsFilterModel):
         '''
         Enhanced update method that needs to treat the labeled measurement and
         use the correct H matrix and function with the help of radar tag.
+        Out-of-sequence measurements are processed with the history.
         Parameters
         ----------
         z: LabeledMeasurement
             The container of tag, time and measurement
         '''
+        if self.history_size > 0 and labeled_z.time < self._last_t:
+            self._update_out_of_sequence(labeled_z)
+            return
+        self._update_in_sequence(labeled_z)
+        if self.history_size > 0:
+            self._history.append((labeled_z, self._snapshot()))
+
+    def _snapshot(self):
+        '''
+        Copy of the state of the filter needed to restart from it.
+        '''
+        return (self.x.copy(), self.P.copy(), self.F.copy(), self.Q.copy(),
+                self.dt, self._last_t)
+
+    def _restore(self, snapshot):
+        '''
+        Restores a state of the filter saved by _snapshot().
+        '''
+        x, P, F, Q, self.dt, self._last_t = snapshot
+        self.x, self.P, self.F, self.Q = x.copy(), P.copy(), F.copy(), Q.copy()
+
+    def _update_out_of_sequence(self, labeled_z):
+        '''
+        Inserts a late measurement in the history and processes again the
+        following measurements. The prediction done before this update (with
+        a wrong time step) is discarded.
+        '''
+        times = [measurement.time for measurement,_ in self._history]
+        index = bisect_right(times, labeled_z.time)
+        if index == 0:
+            # Older than the history: ignored
+            self.oosm_dropped += 1
+            if self._history:
+                self._restore(self._history[-1][1])
+            self.detection = False
+            return
+        self.oosm_counter += 1
+        replayed = [labeled_z] + [measurement for measurement,_ in list(self._history)[index:]]
+        for _ in range(len(self._history) - index):
+            self._history.pop()
+        self._restore(self._history[-1][1])
+        for measurement in replayed:
+            self.predict()
+            self._update_in_sequence(measurement)
+            self._history.append((measurement, self._snapshot()))
+
+    def _update_in_sequence(self, labeled_z):
+        '''
+        Update with a measurement not older than the last processed one.
+        '''
         tag, t, z = labeled_z.tag, labeled_z.time, np.array(labeled_z.value)
         self.dt      = t - self._last_t
         self._last_t = t
@@ -0,0 +1,710 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 14:08:52 2026
+
+@author: qde
+"""
+
+import numpy as np
+from scipy.optimize          import linear_sum_assignment
+from scipy.spatial           import cKDTree
+from scipy.sparse            import coo_matrix
+from scipy.sparse.csgraph    import connected_components
+from fdia_simulation.filters import RadarFilterCV
+
+def measurement_predictions(positions,radar_position):
+    '''
+    Computes the measurement function h for several positions at once.
+    Parameters
+    ----------
+    positions: float numpy array
+        Positions [x,y,z] of the targets (one per row).
+
+    radar_position: float iterable
+        Position [x,y,z] of the radar.
+
+    Returns
+    -------
+    predictions: float numpy array
+        Predicted measurements [r,theta,phi] (one per row).
+    '''
+    x, y, z = (np.asarray(positions,dtype = float) - radar_position).T
+    r     = np.sqrt(x**2 + y**2 + z**2)
+    theta = np.arctan2(y,x)
+    phi   = np.arctan2(z,np.sqrt(x**2 + y**2))
+    return np.column_stack((r,theta,phi))
+
+def measurement_jacobians(positions,radar_position,dim_x = 9):
+    '''
+    Computes the Jacobians H of the measurement function for several
+    positions at once (see RadarFilterModel.HJacob()).
+    Parameters
+    ----------
+    positions: float numpy array
+        Positions [x,y,z] of the targets (one per row).
+
+    radar_position: float iterable
+        Position [x,y,z] of the radar.
+
+    dim_x: int
+        Dimension of the state-space vector [x,vx,ax,y,vy,ay,z,vz,az].
+
+    Returns
+    -------
+    H: float numpy array
+        Jacobians of dimension (number of positions, 3, dim_x).
+    '''
+    x, y, z = (np.asarray(positions,dtype = float) - radar_position).T
+    rho2 = x**2 + y**2
+    rho  = np.sqrt(rho2)
+    r2   = rho2 + z**2
+    r    = np.sqrt(r2)
+    H = np.zeros((len(x),3,dim_x))
+    H[:,0,0], H[:,0,3], H[:,0,6] = x/r, y/r, z/r
+    H[:,1,0], H[:,1,3]           = -y/rho2, x/rho2
+    H[:,2,0], H[:,2,3], H[:,2,6] = -x*z/(rho*r2), -y*z/(rho*r2), rho/r2
+    return H
+
+def wrap_innovations(innovations):
+    '''
+    Wraps the azimuth (theta) component of innovations [r,theta,phi] in
+    [-pi,pi[ so that targets around the +-pi azimuth are not rejected.
+    '''
+    innovations = np.array(innovations,dtype = float)
+    innovations[...,1] = (innovations[...,1] + np.pi) % (2*np.pi) - np.pi
+    return innovations
+
+def spatial_candidates(centers,radii,points):
+    '''
+    Finds the points within a radius of each center with a KD-tree built over
+    the points.
+    Parameters
+    ----------
+    centers: float numpy array
+        Centers [x,y,z] (one per row).
+
+    radii: float numpy array
+        Radius of each center.
+
+    points: float numpy array
+        Points [x,y,z] (one per row).
+
+    Returns
+    -------
+    center_indices, point_indices: int numpy arrays
+        Pairs (center, point) with the point within the radius of the center.
+    '''
+    if len(centers) == 0 or len(points) == 0:
+        return np.zeros(0,dtype = int), np.zeros(0,dtype = int)
+    neighbors = cKDTree(points).query_ball_point(centers,r = radii)
+    center_indices = np.repeat(np.arange(len(centers)),[len(n) for n in neighbors])
+    point_indices  = np.fromiter((j for n in neighbors for j in n),dtype = int,count = len(center_indices))
+    return center_indices, point_indices
+
+
+class TargetTrack(object):
+    '''
+    Implements a track of the MultiTargetTracker: the estimation of the state
+    of one target by a radar filter. Not to be confused with the trajectory
+    generator fdia_simulation.models.Track.
+    Parameters
+    ----------
+    track_id: int
+        Identifier of the track.
+
+    filter: RadarFilterModel
+        Filter estimating the state of the target.
+
+    time: float
+        Time of the last state of the filter.
+
+    Attributes
+    ----------
+    Same as parameters +
+    status: str
+        "tentative" until confirmed, "confirmed" or "deleted".
+
+    hits, misses: ints
+        Number of scans with a measurement associated to the track and number
+        of consecutive scans without any.
+
+    nb_scans: int
+        Number of scans processed since the initiation of the track.
+
+    times, states: lists
+        Times and estimated states of the track after each scan.
+    '''
+    def __init__(self,track_id,filter,time):
+        self.track_id = track_id
+        self.filter   = filter
+        self.time     = time
+        self.status   = 'tentative'
+        self.hits     = 1
+        self.misses   = 0
+        self.nb_scans = 1
+        self.times    = [time]
+        self.states   = [filter.x[:,0].copy()]
+
+    @property
+    def position(self):
+        return self.filter.x[[0,3,6],0]
+
+    def __repr__(self):
+        return 'TargetTrack({0}, {1}, position = {2})'.format(self.track_id,self.status,self.position)
+
+
+class MultiTargetTracker(object):
+    '''
+    Implements a multi-target tracker: each radar scan (a set of measurements
+    [r,theta,phi] without any target identity) is associated to the tracks,
+    which are initiated, confirmed and deleted along the scans.
+    Parameters
+    ----------
+    radars: Radar list
+        Radars producing the scans. A scan is tagged with the position of its
+        radar in this list.
+
+    filter_class: RadarFilterModel subclass
+        Single radar filter model of the tracks (e.g. RadarFilterCV). The
+        measurement model of a track follows the radar of the processed scan.
+
+    q: float
+        Process noise of the tracks filters.
+
+    association: str
+        "GNN" (Global Nearest Neighbor: best one-to-one assignment of the
+        measurements to the tracks) or "JPDA" (Joint Probabilistic Data
+        Association: each track is updated with all the measurements of its
+        gate, weighted by their association probabilities).
+
+    gate_probability: float
+        Probability of the measurement of a target to fall in the gate of its
+        track (chi-square test on the innovation with the innovation covariance
+        S = HPH' + R).
+
+    detection_probability: float
+        Probability of a target to be detected by a scan (JPDA).
+
+    clutter_density: float
+        Number of false alarms per unit volume of the measurement space
+        (r,theta,phi) (JPDA).
+
+    confirmation: (int,int) tuple
+        M-of-N rule: a tentative track is confirmed when it gets M hits in its
+        N first scans and deleted otherwise.
+
+    max_misses: int
+        Number of consecutive scans without any associated measurement
+        deleting a confirmed track.
+
+    velocity_std, acceleration_std: floats
+        Standard deviations of the unknown velocity and acceleration of a new
+        track.
+
+    max_hypotheses: int
+        Maximal number of joint association events enumerated for a cluster
+        of tracks sharing measurements (JPDA). Above, the association
+        probabilities are approximated ("cheap JPDA").
+
+    spatial_index: boolean
+        Triggers the coarse gating: only the measurements close to a track in
+        cartesian coordinates (found with a KD-tree) are tested with the
+        exact gate. Otherwise every track/measurement pair is tested.
+
+    Attributes
+    ----------
+    Same as parameters +
+    tracks: TargetTrack list
+        Current (tentative and confirmed) tracks.
+
+    terminated_tracks: TargetTrack list
+        Confirmed tracks that were deleted.
+
+    time: float
+        Time of the last scan.
+
+    gate: float
+        Threshold of the gate on the squared Mahalanobis distance.
+    '''
+    ASSOCIATIONS = ['GNN','JPDA']
+
+    # Safety factor of the radius of the coarse gates (linearization errors)
+    SPATIAL_MARGIN = 1.2
+
+    def __init__(self, radars, filter_class = RadarFilterCV, q = 1., association = 'GNN',
+                 gate_probability = 0.999, detection_probability = 0.9, clutter_density = 1e-5,
+                 confirmation = (3,5), max_misses = 3, velocity_std = 200., acceleration_std = 10.,
+                 max_hypotheses = 1000, spatial_index = True):
+        from scipy.stats import chi2
+        if not(association in self.ASSOCIATIONS):
+            raise ValueError('Unknown association "{0}", expected one of {1}'.format(association,self.ASSOCIATIONS))
+        self.radars                = radars
+        self.filter_class          = filter_class
+        self.q                     = q
+        self.association           = association
+        self.gate_probability      = gate_probability
+        self.detection_probability = detection_probability
+        self.clutter_density       = clutter_density
+        self.confirmation          = confirmation
+        self.max_misses            = max_misses
+        self.velocity_std          = velocity_std
+        self.acceleration_std      = acceleration_std
+        self.max_hypotheses        = max_hypotheses
+        self.spatial_index         = spatial_index
+        self.gate                  = chi2.ppf(gate_probability,3)
+        self.tracks            = []
+        self.terminated_tracks = []
+        self.time              = 0.
+        self._next_id          = 0
+
+    @property
+    def confirmed_tracks(self):
+        return [track for track in self.tracks if track.status == 'confirmed']
+
+    def estimates(self):
+        '''
+        Returns
+        -------
+        estimates: dictionary(key:int, value:float numpy array)
+            Estimated position [x,y,z] of each confirmed track.
+        '''
+        return {track.track_id: track.position.copy() for track in self.confirmed_tracks}
+
+    # ==========================================================================
+    # =============================== Filters ==================================
+
+    @staticmethod
+    def use_radar(filter,radar):
+        '''
+        Sets the measurement model of a single radar filter to a radar.
+        '''
+        filter.x_rad, filter.y_rad, filter.z_rad = radar.get_position()
+        filter.R = radar.R
+
+    def initiate_track(self,z,radar,time):
+        '''
+        Creates a tentative track from a measurement: the position is the
+        measurement converted to cartesian coordinates, its covariance the
+        measurement noise converted with the same Jacobian, and the velocity
+        and acceleration are unknown.
+        Parameters
+        ----------
+        z: float numpy array
+            Measurement [r,theta,phi].
+
+        radar: Radar
+            Radar of the measurement.
+
+        time: float
+            Time of the measurement.
+
+        Returns
+        -------
+        track: TargetTrack
+            New tentative track.
+        '''
+        x0, y0, z0 = radar.gen_position_vals(*z)
+        filter = self.filter_class(q = self.q, radar = radar, x0 = x0, y0 = y0, z0 = z0, dt = radar.dt)
+        H_position = measurement_jacobians([[x0,y0,z0]],radar.get_position())[0][:,[0,3,6]]
+        J = np.linalg.inv(H_position)
+        P = np.diag(np.tile([0.,self.velocity_std**2,self.acceleration_std**2],3))
+        P[np.ix_([0,3,6],[0,3,6])] = J @ radar.R @ J.T
+        filter.P = P
+        track = TargetTrack(self._next_id,filter,time)
+        self._next_id += 1
+        return track
+
+    def predict(self,time):
+        '''
+        Predicts the state of every track at the given time.
+        '''
+        for track in self.tracks:
+            dt = time - track.time
+            if dt > 0:
+                filter = track.filter
+                filter.dt = dt
+                filter.compute_Q(self.q)
+                filter.compute_F(filter.x)
+                filter.predict()
+                track.time = time
+
+    # ==========================================================================
+    # ============================ Association =================================
+
+    def candidate_pairs(self,positions,H,S,zs,radar):
+        '''
+        Coarse gating: selects the track/measurement pairs that may pass the
+        exact gate. The gate of a track is bounded in cartesian coordinates by
+        a sphere around its predicted position (largest axis of the innovation
+        covariance converted to cartesian coordinates) and the measurements in
+        the spheres are found with a KD-tree rebuilt at each scan.
+        Parameters
+        ----------
+        positions: float numpy array
+            Predicted positions [x,y,z] of the tracks (one per row).
+
+        H, S: float numpy arrays
+            Jacobians (tracks x 3 x 9) and innovation covariances
+            (tracks x 3 x 3) of the tracks.
+
+        zs: float numpy array
+            Measurements [r,theta,phi] of the scan (one per row).
+
+        radar: Radar
+            Radar of the scan.
+
+        Returns
+        -------
+        track_indices, measurement_indices: int numpy arrays
+            Candidate pairs.
+        '''
+        if not(self.spatial_index):
+            track_indices, measurement_indices = np.indices((len(positions),len(zs)))
+            return track_indices.ravel(), measurement_indices.ravel()
+        J = np.linalg.inv(H[:,:,[0,3,6]])
+        cartesian_S = J @ S @ J.transpose(0,2,1)
+        radii  = self.SPATIAL_MARGIN * np.sqrt(self.gate * np.linalg.eigvalsh(cartesian_S)[:,-1])
+        points = np.column_stack(radar.gen_position_vals(*zs.T))
+        return spatial_candidates(positions,radii,points)
+
+    def compute_gates(self,tracks,zs,radar):
+        '''
+        Computes the gated track/measurement pairs of a scan: the squared
+        Mahalanobis distances of the candidate pairs (see candidate_pairs())
+        are computed at once and compared to the gate.
+        Parameters
+        ----------
+        tracks: TargetTrack list
+            Predicted tracks.
+
+        zs: float numpy array
+            Measurements [r,theta,phi] of the scan (one per row).
+
+        radar: Radar
+            Radar of the scan.
+
+        Returns
+        -------
+        track_indices, measurement_indices: int numpy arrays
+            Gated pairs.
+
+        distances: float numpy array
+            Squared Mahalanobis distances of the gated pairs.
+
+        innovations: float numpy array
+            Innovations of the gated pairs (pairs x 3), azimuth wrapped.
+
+        H, S: float numpy arrays
+            Jacobians (tracks x 3 x 9) and innovation covariances
+            (tracks x 3 x 3) of the tracks.
+        '''
+        X = np.array([track.filter.x[:,0] for track in tracks])
+        P = np.array([track.filter.P for track in tracks])
+        positions   = X[:,[0,3,6]]
+        predictions = measurement_predictions(positions,radar.get_position())
+        H = measurement_jacobians(positions,radar.get_position(),dim_x = X.shape[1])
+        S = H @ P @ H.transpose(0,2,1) + radar.R
+        track_indices, measurement_indices = self.candidate_pairs(positions,H,S,zs,radar)
+        innovations = wrap_innovations(zs[measurement_indices] - predictions[track_indices])
+        distances   = np.einsum('pi,pij,pj->p',innovations,np.linalg.inv(S)[track_indices],innovations)
+        gated = distances < self.gate
+        return (track_indices[gated], measurement_indices[gated],
+                distances[gated], innovations[gated], H, S)
+
+    @staticmethod
+    def gate_clusters(track_indices,measurement_indices,nb_tracks,nb_measurements):
+        '''
+        Splits the gated pairs in independent clusters: the tracks and
+        measurements connected by gated pairs (connected components of the
+        bipartite graph).
+        Returns
+        -------
+        clusters: tuple list
+            (track indices, measurement indices, pair indices) of each cluster.
+        '''
+        nb_nodes = nb_tracks + nb_measurements
+        graph = coo_matrix((np.ones(len(track_indices)),(track_indices,nb_tracks + measurement_indices)),
+                           shape = (nb_nodes,nb_nodes))
+        _, labels = connected_components(graph,directed = False)
+        # Nodes and pairs sorted by cluster
+        node_order = np.argsort(labels,kind = 'stable')
+        node_starts = np.searchsorted(labels[node_order],np.arange(nb_nodes + 1))
+        pair_labels = labels[track_indices]
+        pair_order  = np.argsort(pair_labels,kind = 'stable')
+        pair_starts = np.searchsorted(pair_labels[pair_order],np.arange(nb_nodes + 1))
+        clusters = []
+        for label in np.unique(pair_labels):
+            nodes = node_order[node_starts[label]:node_starts[label + 1]]
+            clusters.append((nodes[nodes < nb_tracks], nodes[nodes >= nb_tracks] - nb_tracks,
+                             pair_order[pair_starts[label]:pair_starts[label + 1]]))
+        return clusters
+
+    def associate_gnn(self,distances,S):
+        '''
+        Assigns at most one measurement to each track minimizing the sum of
+        the normalized distances d^2 + ln|S| of the gated pairs.
+        Returns
+        -------
+        pairs: (int,int) list
+            Pairs (track position, measurement position).
+        '''
+        gated = distances < self.gate
+        if not(np.any(gated)):
+            return []
+        # Isolated track: its closest measurement
+        if len(distances) == 1:
+            return [(0,int(np.argmin(distances[0])))]
+        costs = distances + np.log(np.linalg.det(S))[:,None]
+        costs = np.where(gated,costs,np.max(costs[gated]) + 1e6)
+        rows, columns = linear_sum_assignment(costs)
+        return [(i,j) for i,j in zip(rows,columns) if gated[i,j]]
+
+    def association_probabilities(self,distances,S):
+        '''
+        Computes the JPDA association probabilities: the joint association
+        events of the tracks are enumerated (or approximated above
+        max_hypotheses). The distances are the ones of a cluster of tracks
+        sharing measurements (see gate_clusters()): the tracks without any
+        gated measurement are not detected.
+        Returns
+        -------
+        betas: float numpy array
+            Probability of each measurement to come from each track
+            (tracks x measurements).
+
+        beta0s: float numpy array
+            Probability of each track not to be detected.
+        '''
+        nb_tracks, nb_measurements = distances.shape
+        gated = distances < self.gate
+        pd    = self.detection_probability * self.gate_probability
+        norms = np.sqrt((2*np.pi)**3 * np.linalg.det(S))
+        likelihoods = np.where(gated, pd * np.exp(-distances/2) / norms[:,None] / self.clutter_density, 0.)
+        betas  = np.zeros((nb_tracks,nb_measurements))
+        beta0s = np.ones(nb_tracks)
+        cluster_tracks = list(np.flatnonzero(np.any(gated,axis = 1)))
+        if not cluster_tracks:
+            return betas, beta0s
+        candidates = [np.flatnonzero(gated[i]) for i in cluster_tracks]
+        nb_events  = np.prod([len(c) + 1 for c in candidates],dtype = float)
+        if nb_events <= self.max_hypotheses:
+            self._enumerate_events(cluster_tracks,candidates,likelihoods,1 - pd,betas,beta0s)
+        else:
+            self._approximate_events(cluster_tracks,likelihoods,1 - pd,betas,beta0s)
+        return betas, beta0s
+
+    @staticmethod
+    def _enumerate_events(tracks,candidates,likelihoods,miss,betas,beta0s):
+        '''
+        Exact JPDA: sums the weights of the feasible joint events (each
+        measurement used by one track at most).
+        '''
+        sums  = {i: {} for i in tracks}
+        total = [0.]
+        def explore(position,used,weight,assignment):
+            if position == len(tracks):
+                total[0] += weight
+                for i,j in zip(tracks,assignment):
+                    sums[i][j] = sums[i].get(j,0.) + weight
+                return
+            i = tracks[position]
+            explore(position + 1,used,weight * miss,assignment + [-1])
+            for j in candidates[position]:
+                if not(j in used):
+                    explore(position + 1,used | {j},weight * likelihoods[i,j],assignment + [j])
+        explore(0,frozenset(),1.,[])
+        for i in tracks:
+            for j,weight in sums[i].items():
+                if j < 0:
+                    beta0s[i] = weight / total[0]
+                else:
+                    betas[i,j] = weight / total[0]
+
+    @staticmethod
+    def _approximate_events(tracks,likelihoods,miss,betas,beta0s):
+        '''
+        Cheap JPDA (Fitzgerald): approximation of the association probabilities
+        from the sums of the likelihoods of each track and measurement.
+        '''
+        g = likelihoods[tracks]
+        track_sums       = np.sum(g,axis = 1)
+        measurement_sums = np.sum(likelihoods,axis = 0)
+        approximation = g / (track_sums[:,None] + measurement_sums[None,:] - g + miss)
+        misses = miss / (track_sums + miss)
+        # Normalization of the probabilities of each track
+        totals = np.sum(approximation,axis = 1) + misses
+        betas[tracks]  = approximation / totals[:,None]
+        beta0s[tracks] = misses / totals
+
+    # ==========================================================================
+    # ================================ Scans ===================================
+
+    def update_gnn(self,tracks,distances,innovations,S):
+        '''
+        Updates the tracks with their assigned measurement.
+        Parameters
+        ----------
+        tracks: TargetTrack list
+            Tracks of a cluster.
+
+        distances, innovations, S: float numpy arrays
+            Squared Mahalanobis distances (tracks x measurements, infinite if
+            not gated), innovations (tracks x measurements x 3) and innovation
+            covariances of the cluster.
+
+        Returns
+        -------
+        pairs: (int,int) list
+            Pairs (track position, measurement position).
+        '''
+        pairs = self.associate_gnn(distances,S)
+        for i,j in pairs:
+            filter = tracks[i].filter
+            # Measurement with the azimuth unwrapped around the prediction
+            z = filter.hx(filter.x)[:,0] + innovations[i,j]
+            filter.update(z)
+        return pairs
+
+    def update_jpda(self,tracks,distances,innovations,H,S):
+        '''
+        Updates each track with the combined innovation of its gated
+        measurements.
+        Parameters
+        ----------
+        Same as update_gnn() +
+        H: float numpy array
+            Jacobians of the tracks.
+
+        Returns
+        -------
+        pairs: (int,int) list
+            Pairs (track position, most probable measurement position) of the
+            tracks more likely detected than missed.
+        '''
+        betas, beta0s = self.association_probabilities(distances,S)
+        pairs = []
+        for i,track in enumerate(tracks):
+            if beta0s[i] >= 1.:
+                continue
+            # The track is hit if it is more likely detected than missed
+            if beta0s[i] < 0.5:
+                pairs.append((i,int(np.argmax(betas[i]))))
+            filter = track.filter
+            K = filter.P @ H[i].T @ np.linalg.inv(S[i])
+            combined = betas[i] @ innovations[i]
+            spread   = np.einsum('m,mi,mj->ij',betas[i],innovations[i],innovations[i]) - np.outer(combined,combined)
+            P_updated = (np.eye(filter.dim_x) - K @ H[i]) @ filter.P
+            filter.x  = filter.x + (K @ combined)[:,None]
+            filter.P  = beta0s[i] * filter.P + (1 - beta0s[i]) * P_updated + K @ spread @ K.T
+            filter.x_post = filter.x.copy()
+            filter.P_post = filter.P.copy()
+        return pairs
+
+    def process_scan(self,zs,tag = 0,time = None):
+        '''
+        Processes a scan: predicts the tracks, associates the measurements,
+        updates the tracks, initiates tracks from the remaining measurements
+        and confirms or deletes the tracks.
+        Parameters
+        ----------
+        zs: float numpy array
+            Measurements [r,theta,phi] of the scan (one per row).
+
+        tag: int
+            Position of the radar of the scan in radars.
+
+        time: float
+            Time of the scan. Default value: time of the last scan + dt of the
+            radar.
+
+        Returns
+        -------
+        associations: dictionary(key:int, value:int)
+            Position in zs of the measurement associated to each track id (the
+            most probable one for JPDA).
+
+        Notes
+        -----
+        The scans (of all the radars) must be processed in time order: a scan
+        older than the last one raises a ValueError, the tracks cannot be
+        predicted backwards.
+        '''
+        radar = self.radars[tag]
+        zs    = np.reshape(np.asarray(zs,dtype = float),(-1,3))
+        if time is None:
+            time = self.time + radar.dt
+        if time < self.time:
+            raise ValueError('Scan at time {0} older than the last scan ({1}): '
+                             'the scans must be processed in time order'.format(time,self.time))
+        self.time = time
+        self.predict(time)
+        tracks = self.tracks
+        for track in tracks:
+            self.use_radar(track.filter,radar)
+
+        pairs, outside_confirmed = [], np.ones(len(zs),dtype = bool)
+        used = np.zeros(len(zs),dtype = bool)
+        if tracks and len(zs) > 0:
+            track_indices, measurement_indices, distances, innovations, H, S = self.compute_gates(tracks,zs,radar)
+            for cluster_tracks, cluster_measurements, cluster_pairs in self.gate_clusters(
+                    track_indices,measurement_indices,len(tracks),len(zs)):
+                # Dense association problem of the cluster
+                rows    = np.searchsorted(cluster_tracks,track_indices[cluster_pairs])
+                columns = np.searchsorted(cluster_measurements,measurement_indices[cluster_pairs])
+                cluster_distances = np.full((len(cluster_tracks),len(cluster_measurements)),np.inf)
+                cluster_distances[rows,columns] = distances[cluster_pairs]
+                cluster_innovations = np.zeros(cluster_distances.shape + (3,))
+                cluster_innovations[rows,columns] = innovations[cluster_pairs]
+                sub_tracks = [tracks[i] for i in cluster_tracks]
+                if self.association == 'GNN':
+                    cluster_associations = self.update_gnn(sub_tracks,cluster_distances,cluster_innovations,
+                                                           S[cluster_tracks])
+                else:
+                    cluster_associations = self.update_jpda(sub_tracks,cluster_distances,cluster_innovations,
+                                                            H[cluster_tracks],S[cluster_tracks])
+                pairs += [(cluster_tracks[i],cluster_measurements[j]) for i,j in cluster_associations]
+            if self.association == 'GNN':
+                used[[j for _,j in pairs]] = True
+            else:
+                used[measurement_indices] = True
+            confirmed = np.array([track.status == 'confirmed' for track in tracks])
+            outside_confirmed[measurement_indices[confirmed[track_indices]]] = False
+
+        # Tracks management
+        hit_tracks = set(i for i,_ in pairs)
+        for i,track in enumerate(tracks):
+            track.nb_scans += 1
+            if i in hit_tracks:
+                track.hits  += 1
+                track.misses = 0
+            else:
+                track.misses += 1
+            track.times.append(time)
+            track.states.append(track.filter.x[:,0].copy())
+        associations = {tracks[i].track_id: j for i,j in pairs}
+        self._manage_tracks()
+
+        # Initiation
+        for j in np.flatnonzero(~used & outside_confirmed):
+            self.tracks.append(self.initiate_track(zs[j],radar,time))
+        return associations
+
+    def _manage_tracks(self):
+        '''
+        Confirms the tentative tracks following the M-of-N rule and deletes the
+        failed tentative tracks and the lost confirmed ones.
+        '''
+        nb_hits, nb_scans = self.confirmation
+        alive = []
+        for track in self.tracks:
+            if track.status == 'tentative':
+                if track.hits >= nb_hits:
+                    track.status = 'confirmed'
+                elif track.nb_scans >= nb_scans:
+                    track.status = 'deleted'
+            elif track.misses >= self.max_misses:
+                track.status = 'deleted'
+                self.terminated_tracks.append(track)
+            if track.status != 'deleted':
+                alive.append(track)
+        self.tracks = alive
@@ -8,7 +8,11 @@ Created on Wed Jul 17 11:20:51 2019
 from __future__ import absolute_import
 
 __all__ = ["plotting",
-           "csv_writer"]
+           "csv_writer",
+           "results_store",
+           "decimation"]
 
-from .plotting   import *
-from .csv_writer import *
+from .plotting      import *
+from .csv_writer    import *
+from .results_store import *
+from .decimation    import *
@@ -10,7 +10,9 @@ from datetime import datetime
 class CSVWriter(object):
     '''
     Implements a helper to write the process noise best values found by the
-    process noise finders.
+    process noise finders. The rows should be written in bulk (write_rows()):
+    the file is opened once. The per-step traces of the runs are stored with
+    the ResultsStore.
     Parameters
     ----------
     filename: str
@@ -36,14 +38,24 @@ class CSVWriter(object):
 
         Notes
         -----
-        The file is closed thanks to the with encapsulation.
+        The file is opened for this row only, see write_rows() for several rows.
+        '''
+        self.write_rows([(model,q_value)])
+
+    def write_rows(self,rows):
+        '''
+        Opens the file once and writes several rows as: model, best value.
+        Parameters
+        ----------
+        rows: tuple iterable
+            List of (model, best value).
         '''
         with open(self.filename, mode = 'a') as csv_file:
             writer = csv.writer(csv_file, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            writer.writerow([model,q_value])
+            writer.writerows(rows)
 
 if __name__ == "__main__":
     writer = CSVWriter()
-    writer.write_row('CA&1Radar','3200')
-    writer.write_row('CA&2Radars','5')
-    writer.write_row('CV&1Radar','300')
+    writer.write_rows([('CA&1Radar','3200'),
+                       ('CA&2Radars','5'),
+                       ('CV&1Radar','300')])
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 10:21:48 2026
+
+@author: qde
+"""
+
+import numpy as np
+
+def minmax_envelope(values, max_points = 2000):
+    '''
+    Decimates a time series while keeping its peaks: the series is split in
+    buckets of consecutive samples and only the minimum and the maximum of
+    each bucket are kept (in time order).
+    Parameters
+    ----------
+    values: float numpy array
+        Time series (a column vector is flattened).
+
+    max_points: int
+        Maximal number of points of the decimated series. Default value: 2000.
+
+    Returns
+    -------
+    indices: int numpy array
+        Indices of the kept samples (increasing).
+
+    decimated_values: float numpy array
+        Kept samples.
+    '''
+    values = np.asarray(values, dtype = float).ravel()
+    nb_values = len(values)
+    if nb_values <= max_points:
+        return np.arange(nb_values), values
+    bucket_size = int(np.ceil(nb_values / max(1, max_points // 2)))
+    nb_full     = nb_values // bucket_size
+    buckets = values[:nb_full * bucket_size].reshape(nb_full, bucket_size)
+    offsets = np.arange(nb_full) * bucket_size
+    min_indices = [np.argmin(buckets, axis = 1) + offsets]
+    max_indices = [np.argmax(buckets, axis = 1) + offsets]
+    # Last incomplete bucket
+    if nb_full * bucket_size < nb_values:
+        rest = values[nb_full * bucket_size:]
+        min_indices.append([np.argmin(rest) + nb_full * bucket_size])
+        max_indices.append([np.argmax(rest) + nb_full * bucket_size])
+    min_indices = np.concatenate(min_indices)
+    max_indices = np.concatenate(max_indices)
+    indices = np.column_stack((np.minimum(min_indices, max_indices),
+                               np.maximum(min_indices, max_indices))).ravel()
+    indices = np.unique(indices)
+    return indices, values[indices]
+
+def stride_indices(nb_values, max_points = 2000):
+    '''
+    Indices of evenly spaced samples (first and last ones included), used to
+    decimate smooth curves such as trajectories.
+    Parameters
+    ----------
+    nb_values: int
+        Number of samples.
+
+    max_points: int
+        Maximal number of kept samples. Default value: 2000.
+
+    Returns
+    -------
+    indices: int numpy array
+        Indices of the kept samples (increasing).
+    '''
+    if nb_values <= max_points:
+        return np.arange(nb_values)
+    return np.unique(np.linspace(0, nb_values - 1, max(2, max_points)).astype(int))
+
+def _first_in_cells(points, lowest, cell_size):
+    '''
+    Indices of the first point of each occupied cell of a regular grid.
+    '''
+    cells = np.floor((points - lowest) / cell_size).astype(np.int64)
+    nb_cells = np.max(cells, axis = 0) + 1
+    keys = cells[:, 0]
+    for axis in range(1, points.shape[1]):
+        keys = keys * nb_cells[axis] + cells[:, axis]
+    _, first = np.unique(keys, return_index = True)
+    return first
+
+def spatial_subsample(points, max_points = 5000):
+    '''
+    Subsamples a point cloud over a regular grid: one point is kept per
+    occupied cell, the cell size doubling until at most max_points cells are
+    occupied. Dense regions are thinned while isolated points (e.g. outliers)
+    are kept. Non-finite points are dropped.
+    Parameters
+    ----------
+    points: float numpy array
+        Points (one per row).
+
+    max_points: int
+        Maximal number of kept points. Default value: 5000.
+
+    Returns
+    -------
+    indices: int numpy array
+        Indices of the kept points (increasing).
+    '''
+    points  = np.asarray(points, dtype = float)
+    indices = np.flatnonzero(np.all(np.isfinite(points), axis = 1))
+    if len(indices) <= max_points:
+        return indices
+    points = points[indices]
+    lowest = np.min(points, axis = 0)
+    span   = np.max(points, axis = 0) - lowest
+    # The grid has at most max_points+1 cells per axis: the keys fit in int64
+    cell_size = max(np.max(span) / max_points, np.finfo(float).tiny)
+    # The cell size is first searched on a sample of the points
+    sample = points[stride_indices(len(points), 20 * max_points)]
+    while len(_first_in_cells(sample, lowest, cell_size)) > max_points:
+        cell_size *= 2
+    while True:
+        first = _first_in_cells(points, lowest, cell_size)
+        if len(first) <= max_points:
+            return indices[np.sort(first)]
+        cell_size *= 2
+
+
+class EnvelopeBuffer(object):
+    '''
+    Implements the incremental version of minmax_envelope() for live runs:
+    the samples are appended one by one and the buffer keeps the minimum and
+    maximum of buckets of consecutive samples. When the buckets are full,
+    they are merged two by two (their size doubles), so the memory and the
+    plotted points are bounded whatever the duration of the run.
+    Parameters
+    ----------
+    max_points: int
+        Maximal number of points of the envelope. Default value: 2000.
+
+    Attributes
+    ----------
+    Same as parameters +
+    bucket_size: int
+        Number of samples per bucket.
+
+    nb_values: int
+        Number of appended samples.
+    '''
+    def __init__(self, max_points = 2000):
+        self.max_points  = max_points
+        self.nb_buckets  = max(2, (max_points // 4) * 2)
+        self.bucket_size = 1
+        self.nb_values   = 0
+        # Finished buckets: index/value of their minimum and maximum
+        self.count      = 0
+        self.min_index  = np.zeros(self.nb_buckets, dtype = int)
+        self.max_index  = np.zeros(self.nb_buckets, dtype = int)
+        self.min_value  = np.zeros(self.nb_buckets)
+        self.max_value  = np.zeros(self.nb_buckets)
+        self.current    = None
+
+    def append(self, value):
+        '''
+        Adds a sample to the envelope.
+        '''
+        index = self.nb_values
+        self.nb_values += 1
+        if self.current is None:
+            self.current = [index, value, index, value, 0]
+        current = self.current
+        if value < current[1]:
+            current[0], current[1] = index, value
+        if value > current[3]:
+            current[2], current[3] = index, value
+        current[4] += 1
+        if current[4] == self.bucket_size:
+            self._close_bucket()
+
+    def _close_bucket(self):
+        '''
+        Stores the current bucket, merging the buckets when they are full.
+        '''
+        self.min_index[self.count], self.min_value[self.count] = self.current[:2]
+        self.max_index[self.count], self.max_value[self.count] = self.current[2:4]
+        self.count  += 1
+        self.current = None
+        if self.count == self.nb_buckets:
+            self._merge()
+
+    def _merge(self):
+        '''
+        Merges the finished buckets two by two.
+        '''
+        half = self.count // 2
+        for index, value, select in [(self.min_index, self.min_value, np.argmin),
+                                     (self.max_index, self.max_value, np.argmax)]:
+            pairs   = value.reshape(half, 2)
+            chosen  = select(pairs, axis = 1) + 2 * np.arange(half)
+            index[:half] = index[chosen]
+            value[:half] = value[chosen]
+        self.count       = half
+        self.bucket_size *= 2
+
+    def get(self):
+        '''
+        Returns the current envelope.
+        Returns
+        -------
+        indices: int numpy array
+            Indices of the kept samples (increasing).
+
+        values: float numpy array
+            Kept samples.
+        '''
+        min_index, min_value = self.min_index[:self.count], self.min_value[:self.count]
+        max_index, max_value = self.max_index[:self.count], self.max_value[:self.count]
+        if not(self.current is None):
+            min_index = np.append(min_index, self.current[0])
+            min_value = np.append(min_value, self.current[1])
+            max_index = np.append(max_index, self.current[2])
+            max_value = np.append(max_value, self.current[3])
+        indices = np.concatenate((min_index, max_index))
+        values  = np.concatenate((min_value, max_value))
+        indices, unique = np.unique(indices, return_index = True)
+        return indices, values[unique]
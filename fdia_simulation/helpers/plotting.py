@@ -5,7 +5,6 @@ Created on Fri Jun  7 09:43:40 2019
 @author: qde
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 def plot_measurements(xs, ys=None, dt=None, color='k', lw=1, label='Measurements',
@@ -13,6 +12,7 @@ def plot_measurements(xs, ys=None, dt=None, color='k', lw=1, label='Measurements
     """ Helper function to give a consistant way to display
     measurements.
     """
+    import matplotlib.pyplot as plt
     if ys is None and dt is not None:
         ys = xs
         xs = np.arange(0, len(ys)*dt, dt)
@@ -34,7 +34,7 @@ def plot_measurements(xs, ys=None, dt=None, color='k', lw=1, label='Measurements
 def plot_filter(xs, ys=None, dt=None, c='C0', label='Filter', var=None, **kwargs):
     """ plot result of KF with color `c`, optionally displaying the variance
     of `xs`. Returns the list of lines generated by plt.plot()"""
-
+    import matplotlib.pyplot as plt
     if ys is None and dt is not None:
         ys = xs
         xs = np.arange(0, len(ys) * dt, dt)
@@ -60,6 +60,7 @@ def plot_filter(xs, ys=None, dt=None, c='C0', label='Filter', var=None, **kwargs
 
 
 def plot_track(xs, ys=None, dt=None, label='Track', c='k', lw=2, **kwargs):
+    import matplotlib.pyplot as plt
     if ys is None and dt is not None:
         ys = xs
         xs = np.arange(0, len(ys)*dt, dt)
@@ -69,6 +70,7 @@ def plot_track(xs, ys=None, dt=None, label='Track', c='k', lw=2, **kwargs):
         return plt.plot(xs, color=c, lw=lw, ls=':', label=label, **kwargs)
 
 def plot_kf_output(xs, filter_xs, zs, title=None, aspect_equal=True):
+    import matplotlib.pyplot as plt
     plot_filter(filter_xs[:, 0])
     plot_track(xs[:, 0])
 
@@ -82,6 +84,8 @@ def plot_kf_output(xs, filter_xs, zs, title=None, aspect_equal=True):
     plt.show()
 
 def plot_track(xs, ys, zs, fig_nb, label):
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
     fig = plt.figure(fig_nb)
     ax = fig.gca(projection='3d')
     ax.plot(xs, ys, zs, label=label,color='r')
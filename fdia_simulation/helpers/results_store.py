@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:12:37 2026
+
+@author: qde
+"""
+import os
+import json
+import uuid
+import numpy as np
+
+def benchmark_traces(benchmark):
+    '''
+    Extracts the per-step traces of a processed benchmark.
+    Parameters
+    ----------
+    benchmark: Benchmark
+        Benchmark whose filter has been processed.
+
+    Returns
+    -------
+    traces: dictionary(key:str, value:numpy array)
+        Estimated states, nees, true state ids, model probabilities, covariance
+        diagonals (the ones computed) and tested quantities/results of the
+        detector of each model ("detector<i>_values", "detector<i>_results").
+    '''
+    traces = {'estimated_states': np.asarray(benchmark.estimated_states)}
+    for name in ['nees','state_ids','probs','cov_diags']:
+        trace = np.asarray(getattr(benchmark,name))
+        if len(trace) > 0:
+            traces[name] = trace
+    filters = getattr(benchmark.radar_filter,'filters',[benchmark.radar_filter])
+    for i,filter in enumerate(filters):
+        if not(filter.detector is None):
+            traces['detector{0}_values'.format(i)]  = np.asarray(filter.detector.reviewed_values,dtype = float)
+            traces['detector{0}_results'.format(i)] = np.asarray(filter.detector.comparison_results,dtype = bool)
+    return traces
+
+
+def _to_json(value):
+    '''
+    Converts the numpy values of the metadata to their python equivalent.
+    '''
+    if isinstance(value,np.generic):
+        return value.item()
+    if isinstance(value,np.ndarray):
+        return value.tolist()
+    raise TypeError('{0} is not serializable'.format(type(value).__name__))
+
+
+class ResultsStore(object):
+    '''
+    Implements a columnar store of simulation results. Each run consists of
+    per-step traces (e.g. estimated states, nees, model probabilities) and
+    metadata (e.g. model, q, seed). The runs are buffered and written in bulk
+    as chunks (.npz files) where each trace is the concatenation of the
+    traces of the runs of the chunk.
+    Parameters
+    ----------
+    path: str
+        Folder of the store. Created if needed, reopened if it exists.
+
+    chunk_size: int
+        Number of runs buffered before a chunk is written.
+
+    Attributes
+    ----------
+    Same as parameters +
+    schema: dictionary(key:str, value:dictionary)
+        dtype and shape (without the step axis) of every trace. Set by the
+        first run added.
+
+    nb_runs: int
+        Number of runs added to the store (written or buffered).
+
+    Notes
+    -----
+    A chunk file "chunk-<i>.npz" contains for each trace "<name>" its values
+    and "<name>__offsets", the positions of the runs in the values, plus
+    "run_ids" and "metadata" (JSON). The schema is saved in "schema.json".
+    The buffered runs are written by flush() or when leaving a with block.
+
+    Several writers (e.g. parallel workers) can add chunks to the same store:
+    a chunk is written in a temporary file and published under the first
+    free name with an exclusive link, so no chunk is overwritten and the
+    readers never see a partial chunk. The run ids are numbered by each
+    writer from the runs written when it was opened: the runs of concurrent
+    writers should be told apart with their metadata.
+    '''
+
+    CHUNK_NAME  = 'chunk-{0:05d}.npz'
+    TMP_NAME    = 'tmp-{0}.npz'
+    SCHEMA_NAME = 'schema.json'
+
+    def __init__(self,path,chunk_size = 100):
+        self.path       = path
+        self.chunk_size = chunk_size
+        os.makedirs(path,exist_ok = True)
+        schema_path = os.path.join(path,self.SCHEMA_NAME)
+        self.schema = None
+        if os.path.exists(schema_path):
+            with open(schema_path) as schema_file:
+                self.schema = json.load(schema_file)
+        self._buffer = []
+        self._index  = None
+        self.nb_runs = sum(len(run_ids) for _,run_ids in self.compute_index())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.flush()
+
+    def chunk_files(self):
+        '''
+        Returns the paths of the written chunks in order.
+        '''
+        names = sorted(name for name in os.listdir(self.path)
+                       if name.startswith('chunk-') and name.endswith('.npz'))
+        return [os.path.join(self.path,name) for name in names]
+
+    def compute_index(self):
+        '''
+        Lists the runs of each written chunk (only the run ids are read).
+        Returns
+        -------
+        index: tuple iterable
+            List of (chunk path, run ids).
+        '''
+        if self._index is None:
+            self._index = []
+            for chunk_file in self.chunk_files():
+                with np.load(chunk_file) as chunk:
+                    self._index.append((chunk_file,chunk['run_ids']))
+        return self._index
+
+    def check_schema(self,traces):
+        '''
+        Checks the traces of a run against the schema (set by the first run).
+        Parameters
+        ----------
+        traces: dictionary(key:str, value:numpy array)
+            Traces of the run.
+
+        Returns
+        -------
+        traces: dictionary(key:str, value:numpy array)
+            Traces converted to the dtypes of the schema.
+        '''
+        traces = {name: np.asarray(trace) for name,trace in traces.items()}
+        if self.schema is None:
+            self.schema = {name: {'dtype': trace.dtype.str, 'shape': list(trace.shape[1:])}
+                           for name,trace in traces.items()}
+            with open(os.path.join(self.path,self.SCHEMA_NAME),'w') as schema_file:
+                json.dump(self.schema,schema_file,indent = 2)
+        if set(traces) != set(self.schema):
+            msg = 'The traces {0} do not match the schema {1}'.format(sorted(traces),sorted(self.schema))
+            raise ValueError(msg)
+        for name,trace in traces.items():
+            if list(trace.shape[1:]) != self.schema[name]['shape']:
+                msg = 'The trace {0} should have the shape (n,{1})'.format(name,self.schema[name]['shape'])
+                raise ValueError(msg)
+        return {name: trace.astype(self.schema[name]['dtype'],copy = False)
+                for name,trace in traces.items()}
+
+    def add_run(self,traces,**metadata):
+        '''
+        Adds a run to the buffer and writes a chunk if the buffer is full.
+        Parameters
+        ----------
+        traces: dictionary(key:str, value:numpy array)
+            Per-step traces of the run (first axis: steps).
+
+        metadata: keyword arguments
+            JSON-serializable description of the run.
+
+        Returns
+        -------
+        run_id: int
+            Identifier of the run in the store.
+        '''
+        traces = self.check_schema(traces)
+        run_id = self.nb_runs
+        self._buffer.append((run_id,traces,metadata))
+        self.nb_runs += 1
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+        return run_id
+
+    def add_benchmark(self,benchmark,**metadata):
+        '''
+        Adds the traces of a processed benchmark (see benchmark_traces()).
+        Parameters
+        ----------
+        benchmark: Benchmark
+            Benchmark whose filter has been processed.
+
+        metadata: keyword arguments
+            JSON-serializable description of the run.
+
+        Returns
+        -------
+        run_id: int
+            Identifier of the run in the store.
+        '''
+        return self.add_run(benchmark_traces(benchmark),**metadata)
+
+    def flush(self):
+        '''
+        Writes the buffered runs as a new chunk.
+        '''
+        if not self._buffer:
+            return
+        run_ids  = np.array([run_id for run_id,_,_ in self._buffer])
+        metadata = [dict(metadata,run_id = int(run_id)) for run_id,_,metadata in self._buffer]
+        columns  = {'run_ids': run_ids,
+                    'metadata': np.array(json.dumps(metadata,default = _to_json))}
+        for name in self.schema:
+            traces  = [traces[name] for _,traces,_ in self._buffer]
+            lengths = [len(trace) for trace in traces]
+            columns[name] = np.concatenate(traces,axis = 0)
+            columns[name + '__offsets'] = np.concatenate(([0],np.cumsum(lengths)))
+        tmp_file = os.path.join(self.path,self.TMP_NAME.format(uuid.uuid4().hex))
+        np.savez(tmp_file,**columns)
+        try:
+            self._publish(tmp_file)
+        finally:
+            os.remove(tmp_file)
+        self._buffer = []
+        self._index  = None
+
+    def _publish(self,tmp_file):
+        '''
+        Links a written chunk under the first chunk name not taken (the link
+        fails if the name exists, even if another writer just created it).
+        '''
+        index = len(self.chunk_files())
+        while True:
+            try:
+                os.link(tmp_file,os.path.join(self.path,self.CHUNK_NAME.format(index)))
+                return
+            except FileExistsError:
+                index += 1
+
+    def load_metadata(self):
+        '''
+        Loads the metadata of all the written runs.
+        Returns
+        -------
+        metadata: dictionary iterable
+            Metadata of each run, including its "run_id".
+        '''
+        metadata = []
+        for chunk_file,_ in self.compute_index():
+            with np.load(chunk_file) as chunk:
+                metadata += json.loads(str(chunk['metadata']))
+        return metadata
+
+    def query(self,**criteria):
+        '''
+        Selects the written runs whose metadata match given values.
+        Parameters
+        ----------
+        criteria: keyword arguments
+            Metadata values of the selected runs, e.g. model = 'CV'.
+
+        Returns
+        -------
+        run_ids: int list
+            Identifiers of the selected runs.
+        '''
+        return [metadata['run_id'] for metadata in self.load_metadata()
+                if all(metadata.get(key) == value for key,value in criteria.items())]
+
+    def load_trace(self,name,run_ids = None):
+        '''
+        Loads a trace for given runs. Only the chunks containing them are read.
+        Parameters
+        ----------
+        name: str
+            Name of the trace.
+
+        run_ids: int iterable
+            Identifiers of the runs. Default value: all the written runs.
+
+        Returns
+        -------
+        traces: dictionary(key:int, value:numpy array)
+            Trace of each run.
+        '''
+        traces = {}
+        for chunk_file,chunk_run_ids in self.compute_index():
+            if run_ids is None:
+                positions = range(len(chunk_run_ids))
+            else:
+                positions = np.flatnonzero(np.isin(chunk_run_ids,list(run_ids)))
+            if len(positions) == 0:
+                continue
+            with np.load(chunk_file) as chunk:
+                values  = chunk[name]
+                offsets = chunk[name + '__offsets']
+            for i in positions:
+                traces[int(chunk_run_ids[i])] = values[offsets[i]:offsets[i+1]]
+        return traces
+
+    def load_run(self,run_id):
+        '''
+        Loads all the traces of a run.
+        Parameters
+        ----------
+        run_id: int
+            Identifier of the run.
+
+        Returns
+        -------
+        traces: dictionary(key:str, value:numpy array)
+            Traces of the run.
+        '''
+        if self.schema is None:
+            raise KeyError('Run {0} is not written in the store (empty store)'.format(run_id))
+        traces = {name: self.load_trace(name,[run_id]) for name in self.schema}
+        if not traces or not(run_id in next(iter(traces.values()))):
+            raise KeyError('Run {0} is not written in the store'.format(run_id))
+        return {name: trace[run_id] for name,trace in traces.items()}
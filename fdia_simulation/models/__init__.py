@@ -8,7 +8,7 @@ Created on Wed Jul 17 11:14:21 2019
 from __future__ import absolute_import
 
 __all__ = ["maneuvered_airplane", "maneuvered_bicycle", "maneuvered_system",
-           "tracks", "sensors", "radar"]
+           "tracks", "sensors", "radar", "replay"]
 
 from .sensors             import *
 from .maneuvered_system       import *
@@ -16,3 +16,4 @@ from .maneuvered_airplane import *
 from .maneuvered_bicycle  import *
 from .tracks              import *
 from .radar               import *
+from .replay              import *
@@ -6,8 +6,6 @@ Created on Fri Jun 14 16:30:25 2019
 """
 
 import numpy             as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d   import Axes3D
 from math                   import cos,sin,radians
 from fdia_simulation.models import ManeuveredSystem, Command
 
@@ -184,6 +182,8 @@ class ManeuveredAirplane(ManeuveredSystem):
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
     # Route generation example with a ManeuveredAirplane
     headx_cmd = Command('headx',0,0,0)
     headz_cmd = Command('headz',0,0,0)
@@ -6,7 +6,6 @@ Created on Fri Jun 14 16:30:25 2019
 """
 
 import numpy             as np
-import matplotlib.pyplot as plt
 from math                    import cos,sin,radians
 from fdia_simulation.models  import ManeuveredSystem, Command, NoisySensor
 from fdia_simulation.helpers import plot_measurements
@@ -127,6 +126,7 @@ class ManeuveredBicycle(ManeuveredSystem):
 
 
 if __name__ == "__main__":
+        import matplotlib.pyplot as plt
 
         # ======== Route generation example with a ManeuveredBicycle ========
         sensor_std = 1.
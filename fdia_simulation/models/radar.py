@@ -5,7 +5,6 @@ Created on Fri Jun 21 13:07:46 2019
 @author: qde
 """
 import numpy as np
-import matplotlib.pyplot as plt
 from math                   import cos,sin,sqrt,pi,atan2
 from numpy.random           import randn
 from filterpy.common        import pretty_str
@@ -28,6 +27,28 @@ class Radar(object):
     phi_std: float
         Standard deviation on the measurement of phi. Default value of 0.1
 
+    detection_probability: float
+        Probability of a target in the field of view to be detected by a scan
+        (see gen_scan()). Default value of 1.
+
+    clutter_rate: float
+        Mean number of clutter returns (false alarms) per scan. Default value
+        of 0.
+
+    max_range, max_elevation: floats
+        Field of view of the radar: range in [0,max_range], azimuth in
+        [-pi,pi] and elevation in [0,max_elevation]. Default values of 100km
+        and pi/2.
+
+    Notes
+    -----
+    The detection model (detection_probability, clutter_rate and field of
+    view) only applies to the multi-target scans: gen_scan(), gen_clutter()
+    and compute_batch_measurements(). The single-target measurements (sense(),
+    compute_measurements(), compute_tagged_measurements()) measure the target
+    at every step, MeasurementSet and sense_states() reject radars missing
+    detections (see check_full_detection()).
+
     Parameters
     ----------
     Identical to Attributes
@@ -36,7 +57,9 @@ class Radar(object):
     DT_RADAR = 0.1
 
     def __init__(self, x = 0, y = 0, z = 0, dt = None,
-                 r_std = 1., theta_std = 0.001, phi_std = 0.001):
+                 r_std = 1., theta_std = 0.001, phi_std = 0.001,
+                 detection_probability = 1., clutter_rate = 0.,
+                 max_range = 1e5, max_elevation = pi/2):
 
         if dt is None:
             dt = self.DT_RADAR
@@ -51,8 +74,46 @@ class Radar(object):
         self.R = np.array([[r_std,0              ,0            ],
                            [0          ,theta_std,0            ],
                            [0          ,0              ,phi_std]])
+        self.detection_probability = detection_probability
+        self.clutter_rate          = clutter_rate
+        self.max_range             = max_range
+        self.max_elevation         = max_elevation
+
+    @property
+    def clutter_density(self):
+        '''
+        Mean number of clutter returns per scan and unit volume of the
+        measurement space (r,theta,phi).
+        '''
+        return self.clutter_rate / (self.max_range * 2*pi * self.max_elevation)
 
 
+    def in_field_of_view(self, rs, phis):
+        '''
+        Tells which radar values are in the field of view of the radar.
+        Parameters
+        ----------
+        rs, phis: float numpy arrays
+            Ranges and elevations of the targets.
+
+        Returns
+        -------
+        visible: boolean numpy array
+            True for the targets within max_range and with an elevation in
+            [0,max_elevation].
+        '''
+        return (rs <= self.max_range) & (phis >= 0.) & (phis <= self.max_elevation)
+
+    def check_full_detection(self):
+        '''
+        Raises a ValueError if the radar misses detections or has false
+        alarms: the single-target measurements ignore the detection model.
+        '''
+        if self.detection_probability < 1. or self.clutter_rate > 0.:
+            raise ValueError('detection_probability and clutter_rate only apply '
+                             'to the multi-target scans (gen_scan(), '
+                             'compute_batch_measurements())')
+
     def get_position(self):
         '''
         Position accessor.
@@ -68,18 +129,25 @@ class Radar(object):
         Computes the three parameters r, theta and phi from the given positions.
         Parameters
         ----------
-        x,y,z: floats
-            Position of the airplane.
+        x,y,z: floats or float numpy arrays
+            Position(s) of the airplane.
 
         Returns
         -------
-        r,theta,phi: floats
-            Radar values corresponding to the input position.
+        r,theta,phi: floats or float numpy arrays
+            Radar values corresponding to the input position(s).
         '''
         # Importance of the radar position
-        x -= self.x
-        y -= self.y
-        z -= self.z
+        x = x - self.x
+        y = y - self.y
+        z = z - self.z
+
+        # Arrays of positions are processed at once
+        if np.ndim(x) > 0:
+            r     = np.sqrt(x**2 + y**2 + z**2)
+            theta = np.arctan2(y,x)
+            phi   = np.arctan2(z, np.sqrt(x**2 + y**2))
+            return r, theta, phi
 
         # Computation of the distance of the airplane
         r = sqrt(x**2 + y**2 + z**2)
@@ -158,23 +226,83 @@ class Radar(object):
 
         return noisy_rs, noisy_thetas, noisy_phis
 
+    def gen_clutter(self, nb_scans = 1):
+        '''
+        Generates the clutter returns of several scans at once: a Poisson
+        number of returns per scan, uniformly distributed over the field of
+        view in the measurement space.
+        Parameters
+        ----------
+        nb_scans: int
+            Number of scans.
+
+        Returns
+        -------
+        scan_indices: int numpy array
+            Scan of each clutter return (increasing).
+
+        clutter: float numpy array
+            Clutter returns [r,theta,phi] (one per row).
+        '''
+        if self.clutter_rate <= 0:
+            return np.zeros(0,dtype = int), np.zeros((0,3))
+        nb_returns   = np.random.poisson(self.clutter_rate, size = nb_scans)
+        scan_indices = np.repeat(np.arange(nb_scans), nb_returns)
+        nb_clutter   = len(scan_indices)
+        clutter = np.column_stack((np.random.uniform(0., self.max_range, nb_clutter),
+                                   np.random.uniform(-pi, pi, nb_clutter),
+                                   np.random.uniform(0., self.max_elevation, nb_clutter)))
+        return scan_indices, clutter
+
+    def gen_scan(self, positions):
+        '''
+        Generates one scan of the radar observing several targets: each target
+        in the field of view is detected with the detection probability and the clutter
+        returns are added (see gen_clutter()).
+        Parameters
+        ----------
+        positions: float numpy array
+            Positions [x,y,z] of the targets (one per row).
+
+        Returns
+        -------
+        measurements: float numpy array
+            Noisy measurements [r,theta,phi] of the scan (one per row): the
+            detections then the clutter returns.
+
+        target_ids: int numpy array
+            Position in positions of the target of each measurement, -1 for
+            the clutter returns.
+        '''
+        positions = np.reshape(np.asarray(positions, dtype = float), (-1,3))
+        rs, thetas, phis = self.gen_radar_values(positions[:,0], positions[:,1], positions[:,2])
+        detected = self.in_field_of_view(rs, phis)
+        if self.detection_probability < 1.:
+            detected &= np.random.uniform(size = len(rs)) < self.detection_probability
+        target_ids = np.flatnonzero(detected)
+        detections = np.column_stack((rs[detected], thetas[detected], phis[detected]))
+        detections += randn(len(target_ids),3) * [self.r_std, self.theta_std, self.phi_std]
+        _, clutter = self.gen_clutter()
+        measurements = np.vstack((detections, clutter))
+        return measurements, np.concatenate((target_ids, np.full(len(clutter), -1)))
+
     def gen_position_vals(self,r,theta,phi):
         '''
         Compute the position from the radar values r, theta and phi.
         Parameters
         ----------
-        r,theta,phi: floats
+        r,theta,phi: floats or float numpy arrays
             Radar values.
 
         Returns
         -------
-        x,y,z: floats
-            Sensed position of the airplane extracted from the measurement given
-            in input.
+        x,y,z: floats or float numpy arrays
+            Sensed position(s) of the airplane extracted from the measurement(s)
+            given in input.
         '''
-        x = r * cos(theta) * cos(phi) + self.x
-        y = r * sin(theta) * cos(phi) + self.y
-        z = r *              sin(phi) + self.z
+        x = r * np.cos(theta) * np.cos(phi) + self.x
+        y = r * np.sin(theta) * np.cos(phi) + self.y
+        z = r *                 np.sin(phi) + self.z
         return x,y,z
 
 
@@ -298,14 +426,18 @@ class PeriodRadar(Radar):
     '''
     def __init__(self, x, y, z=0, dt = None,
                  r_std = 1., theta_std = 0.001, phi_std = 0.001,
-                 time_std = 0.001):
+                 time_std = 0.001, detection_probability = 1., clutter_rate = 0.,
+                 max_range = 1e5, max_elevation = pi/2):
 
         if dt is None:
             dt = Radar.DT_RADAR
         self.time_std = time_std
         self.tag      = 0
         Radar.__init__(self,x = x, y = y, z = z, dt = dt,
-                       r_std = r_std, theta_std = theta_std, phi_std = phi_std)
+                       r_std = r_std, theta_std = theta_std, phi_std = phi_std,
+                       detection_probability = detection_probability,
+                       clutter_rate = clutter_rate, max_range = max_range,
+                       max_elevation = max_elevation)
 
 
     def compute_meas_times(self, size):
@@ -358,8 +490,146 @@ class PeriodRadar(Radar):
 
         return measurements
 
+    def compute_tagged_measurements(self,position_data):
+        '''
+        Computes the measurements of given positions as a columnar array.
+        Parameters
+        ----------
+        position_data: float numpy array
+            Array of positions [x,y,z].
+
+        Returns
+        -------
+        tagged_values: float numpy array (n,5)
+            Array of measurements where each row is [tag, time, r, theta, phi].
+
+        Notes
+        -----
+        This is the array counterpart of compute_measurements(), it avoids the
+        creation of one LabeledMeasurement object per measurement.
+        '''
+        position_data = np.asarray(position_data, dtype = float)
+        n = len(position_data)
+        rs, thetas, phis = self.gen_radar_values(position_data[:,0],
+                                                 position_data[:,1],
+                                                 position_data[:,2])
+        tagged_values = np.empty((n,5))
+        tagged_values[:,0] = self.tag
+        tagged_values[:,1] = self.compute_meas_times(n)
+        tagged_values[:,2] = rs     + randn(n)*self.r_std
+        tagged_values[:,3] = thetas + randn(n)*self.theta_std
+        tagged_values[:,4] = phis   + randn(n)*self.phi_std
+        return tagged_values
+
+
+def tagged2labeled(tagged_values):
+    '''
+    Converts columnar tagged measurements into a list of labeled measurements.
+    Parameters
+    ----------
+    tagged_values: float numpy array (n,5)
+        Array of measurements where each row is [tag, time, r, theta, phi].
+
+    Returns
+    -------
+    measurements: LabeledMeasurement list
+        List of labeled measurements with time and tag.
+    '''
+    return [LabeledMeasurement(tag = int(row[0]), time = row[1],
+                               value = row[2:].reshape((3,1)).copy())
+            for row in tagged_values]
+
+
+def _scan_times(radar, nb_scans):
+    '''
+    Times of the successive scans of a radar, with the cumulated time jitter
+    of the PeriodRadars (vectorized version of compute_meas_times()).
+    '''
+    steps = np.full(nb_scans, float(radar.dt))
+    time_std = getattr(radar, 'time_std', 0.)
+    if time_std > 0:
+        steps += randn(nb_scans) * time_std
+    steps[:1] = 0.
+    return np.cumsum(steps)
+
+def compute_batch_measurements(radars, positions):
+    '''
+    Computes at once the measurements of several targets by several radars
+    (missed detections and clutter included, see Radar.gen_scan()).
+    Parameters
+    ----------
+    radars: Radar or Radar iterable
+        Radars observing the targets, tagged with their position in the list.
+
+    positions: float numpy array (K,N,3)
+        Positions [x,y,z] of the K targets over time, sampled with
+        Track.DT_TRACK. A (N,3) array is a single target.
+
+    Returns
+    -------
+    measurements: float numpy array (n,6)
+        Array of measurements where each row is [target, tag, time, r, theta,
+        phi], sorted by time. The target is -1 for the clutter.
+
+    Notes
+    -----
+    Each radar samples the positions with its data rate (as done by
+    sample_position_data()) and all the targets of a scan share its time.
+    The samples of all the radars are gathered so the radar values and the
+    noise are computed for all the targets and scans at once. The rows of a
+    target without the first column follow the format of
+    compute_tagged_measurements().
+    '''
+    if isinstance(radars, Radar):
+        radars = [radars]
+    positions = np.asarray(positions, dtype = float)
+    if positions.ndim == 2:
+        positions = positions[None]
+    nb_targets, nb_positions, _ = positions.shape
+    # Scans of all the radars: radar, sampled position and time
+    samples   = [np.arange(0, nb_positions, max(1, int(radar.step))) for radar in radars]
+    nb_scans  = [len(radar_samples) for radar_samples in samples]
+    scan_tags = np.repeat(np.arange(len(radars)), nb_scans)
+    scan_positions = np.concatenate(samples)
+    scan_times = np.concatenate([_scan_times(radar, nb) for radar, nb in zip(radars, nb_scans)])
+
+    # Radar values of every target at every scan: (K,S) arrays
+    radar_positions = np.array([radar.get_position() for radar in radars], dtype = float)
+    relative = positions[:, scan_positions] - radar_positions[scan_tags]
+    horizontal = np.hypot(relative[..., 0], relative[..., 1])
+    rs = np.hypot(horizontal, relative[..., 2])
+    phis = np.arctan2(relative[..., 2], horizontal)
+    values = np.stack((rs, np.arctan2(relative[..., 1], relative[..., 0]), phis), axis = -1)
+    stds = np.array([[radar.r_std, radar.theta_std, radar.phi_std] for radar in radars])
+    values += randn(*values.shape) * stds[scan_tags]
+
+    # Detections
+    max_ranges     = np.array([radar.max_range for radar in radars])[scan_tags]
+    max_elevations = np.array([radar.max_elevation for radar in radars])[scan_tags]
+    detected = (rs <= max_ranges) & (phis >= 0.) & (phis <= max_elevations)
+    detection_probabilities = np.array([radar.detection_probability for radar in radars])
+    if np.any(detection_probabilities < 1.):
+        detected &= np.random.uniform(size = rs.shape) < detection_probabilities[scan_tags]
+    target_ids, scan_ids = np.nonzero(detected)
+    blocks = [np.column_stack((target_ids, scan_tags[scan_ids], scan_times[scan_ids],
+                               values[detected]))]
+
+    # Clutter
+    offsets = np.cumsum([0] + nb_scans)
+    for offset, radar, nb in zip(offsets, radars, nb_scans):
+        scan_indices, clutter = radar.gen_clutter(nb)
+        scan_ids = offset + scan_indices
+        blocks.append(np.column_stack((np.full(len(clutter), -1.), scan_tags[scan_ids],
+                                       scan_times[scan_ids], clutter)))
+
+    measurements = np.concatenate(blocks)
+    order = np.lexsort((measurements[:, 0], measurements[:, 1], measurements[:, 2]))
+    return measurements[order]
+
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
     #================== Positions generation for the airplane ==================
     trajectory = Track()
     states = trajectory.gen_landing()
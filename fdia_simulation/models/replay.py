@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 11:24:50 2026
+
+@author: qde
+"""
+import numpy as np
+from fdia_simulation.models import LabeledMeasurement
+
+def record_measurements(path,tagged_values):
+    '''
+    Writes tagged measurements in a binary file readable by MeasurementReplay.
+    Parameters
+    ----------
+    path: str
+        Path of the file. A ".npy" file keeps the array header, any other
+        extension gives raw little-endian float64 records.
+
+    tagged_values: float numpy array (n,5)
+        Time-sorted measurements where each row is [tag, time, r, theta, phi].
+    '''
+    tagged_values = np.asarray(tagged_values, dtype = '<f8')
+    if np.ndim(tagged_values) != 2 or np.shape(tagged_values)[1] != MeasurementReplay.NB_COLUMNS:
+        raise ValueError('The measurements should be an array of shape (n,5)')
+    if path.endswith('.npy'):
+        np.save(path,tagged_values)
+    else:
+        tagged_values.tofile(path)
+
+
+class MeasurementReplay(object):
+    '''
+    Implements the replay of a recorded stream of tagged measurements. The file
+    is memory-mapped: only the pages of the processed measurements are read
+    and no copy of the data is made.
+    Parameters
+    ----------
+    path: str
+        Path of the recording: ".npy" file or raw little-endian float64 records
+        of [tag, time, r, theta, phi].
+
+    chunk_size: int
+        Number of measurements of the chunks the stream is read by.
+
+    Attributes
+    ----------
+    Same as parameters +
+    tagged_values: float numpy memmap (n,5)
+        Read-only mapping of the recorded measurements.
+
+    Notes
+    -----
+    The replay can be given as measurements to Benchmark.process_filter() (or
+    iterated directly), it yields LabeledMeasurements whose values are views
+    on the mapping.
+    '''
+
+    NB_COLUMNS = 5
+
+    def __init__(self,path,chunk_size = 4096):
+        self.path       = path
+        self.chunk_size = chunk_size
+        if path.endswith('.npy'):
+            tagged_values = np.load(path, mmap_mode = 'r')
+        else:
+            tagged_values = np.memmap(path, dtype = '<f8', mode = 'r')
+            if len(tagged_values) % self.NB_COLUMNS != 0:
+                raise ValueError('The recording is not made of [tag, time, r, theta, phi] records')
+            tagged_values = tagged_values.reshape((-1,self.NB_COLUMNS))
+        if np.ndim(tagged_values) != 2 or np.shape(tagged_values)[1] != self.NB_COLUMNS:
+            raise ValueError('The recording should be an array of shape (n,5)')
+        self.tagged_values = tagged_values
+
+    def __len__(self):
+        return len(self.tagged_values)
+
+    def iter_chunks(self,start = 0,stop = None):
+        '''
+        Reads the recording chunk by chunk.
+        Parameters
+        ----------
+        start, stop: ints
+            Positions of the first and after last measurements read. Default
+            value: the whole recording.
+
+        Returns
+        -------
+        chunks: float numpy array (chunk_size,5) generator
+            Views on consecutive chunks of the recording.
+        '''
+        if stop is None:
+            stop = len(self)
+        for i in range(start,stop,self.chunk_size):
+            yield self.tagged_values[i:min(i + self.chunk_size,stop)]
+
+    def __iter__(self):
+        '''
+        Replays the recording as labeled measurements.
+        Returns
+        -------
+        measurements: LabeledMeasurement generator
+            Measurements of the recording.
+        '''
+        for chunk in self.iter_chunks():
+            tags  = chunk[:,0].astype(int)
+            times = chunk[:,1]
+            for i in range(len(chunk)):
+                yield LabeledMeasurement(tag = int(tags[i]), time = times[i],
+                                         value = chunk[i,2:].reshape((3,1)))
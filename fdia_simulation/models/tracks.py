@@ -5,7 +5,6 @@ Created on Mon Jul 01 13:47:22 2019
 @author: qde
 """
 import numpy             as np
-import matplotlib.pyplot as plt
 from fdia_simulation.models  import ManeuveredAirplane
 from fdia_simulation.helpers import plot_track
 
@@ -549,6 +548,7 @@ def output_positions(states):
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
     test_track = Track()
     print('##== Figure 1: Cruise mode =========##')
     xs_cruise, ys_cruise, zs_cruise = output_positions(test_track.gen_cruise())
@@ -9,8 +9,10 @@ from __future__ import absolute_import
 
 __all__ = ["test_attacker",
            "test_mo_attacker",
+           "test_online_mo_attacker",
            "test_period_attacker"]
 
 from .test_attacker        import *
 from .test_mo_attacker           import *
+from .test_online_mo_attacker    import *
 from .test_period_attacker import *
@@ -236,6 +236,33 @@ class CumulativeDriftAttackerTestCase(AttackerTestCase):
         print(self.attacker)
         self.assertTrue(np.allclose(modified_measurement,computed_measurement))
 
+    def drifts(self,measurements,modified_measurements):
+        '''
+        Drifts of the positions of the attacked radar (one column per step).
+        '''
+        positions = np.vstack(self.radar.gen_position_vals(*measurements[3:]))
+        modified  = np.vstack(self.radar.gen_position_vals(*modified_measurements[3:]))
+        return modified - positions
+
+    def test_cumulative_drift_step_by_step(self):
+        # The drift grows linearly: 2, 3, 4... times delta_drift
+        self.attacker.t0 = 0
+        measurement = np.array([[10.,10.,10.,1000.,0.3,0.1]]).T
+        for k in range(2,7):
+            modified = self.attacker.listen_measurement(measurement.copy())
+            self.assertTrue(np.allclose(k*self.delta_drift,self.drifts(measurement,modified)))
+            self.assertTrue(np.allclose(k*self.delta_drift,self.attacker.attack_drift))
+        self.assertTrue(np.array_equal(np.array([[0,0,1]]).T,self.attacker.delta_drift))
+
+    def test_cumulative_drift_columnar(self):
+        measurements = np.tile(np.array([[10.,10.,10.,1000.,0.3,0.1]]).T,(1,5))
+        modified = self.attacker.attack_measurement(measurements.copy())
+        expected = self.delta_drift*np.arange(2,7)
+        self.assertTrue(np.allclose(expected,self.drifts(measurements,modified)))
+        # The next steps follow the columns
+        modified = self.attacker.attack_measurement(measurements[:,:1].copy())
+        self.assertTrue(np.allclose(7*self.delta_drift,self.drifts(measurements[:,:1],modified)))
+
     def test_attacked_vectors(self):
         pass
 
@@ -52,5 +52,58 @@ class MoAttackerTestCase(unittest.TestCase):
         self.assertTrue(np.array_equal(self.attacker.unst_data[1].vector,np.array([0,1,0])))
         self.assertTrue(np.array_equal(self.attacker.unst_data[2].vector,np.array([0,0,1])))
 
+    def test_fill_attack_sequence_follows_recurrence(self):
+        ya0, ya1 = np.array([[1.,2.]]).T, np.array([[-1.,3.]]).T
+        ystar    = np.array([[0.5,1.]]).T
+        attack_val, M = 1.2, 2.
+        sequence = self.attacker.fill_attack_sequence(20,ya0,ya1,attack_val,ystar,M)
+        self.assertEqual(np.shape(sequence),(2,20))
+        self.assertTrue(np.allclose(sequence[:,0:1],ya0/M))
+        self.assertTrue(np.allclose(sequence[:,1:2],ya1/M))
+        for i in range(2,20):
+            expected = sequence[:,i-2:i-1] - attack_val**(i-2)/M * ystar
+            self.assertTrue(np.allclose(sequence[:,i:i+1],expected))
+
+    def test_steady_state_P_reused(self):
+        P1 = self.attacker.compute_steady_state_P()
+        P2 = self.attacker.compute_steady_state_P()
+        self.assertIs(P1,P2)
+        self.kf.Q = 2*np.eye(2)
+        P3 = self.attacker.compute_steady_state_P()
+        self.assertIsNot(P1,P3)
+
+    def test_compute_sensor_subsets(self):
+        kf = KalmanFilter(dim_x=9,dim_z=6)
+        attacker = MoAttacker(kf)
+        Gammas = attacker.compute_sensor_subsets()
+        self.assertEqual(np.shape(Gammas),(63,6,6))
+        Gammas = attacker.compute_sensor_subsets(group_size = 3)
+        self.assertEqual(np.shape(Gammas),(3,6,6))
+        self.assertTrue(np.array_equal(Gammas[0],np.diag([1,1,1,0,0,0])))
+        self.assertTrue(np.array_equal(Gammas[2],np.eye(6)))
+
+    def test_compute_attack_table_matches_single_attack(self):
+        kf = KalmanFilter(dim_x=2,dim_z=2)
+        kf.F = np.array([[1., 1.],
+                         [0., 1.]])
+        kf.H = np.eye(2)
+        kf.Q = np.eye(2)
+        kf.R = np.eye(2)
+        attacker = MoAttacker(kf, fb = True)
+        kf.K = attacker.compute_steady_state_K()
+        attack_table = attacker.compute_attack_table()
+        # 2 unstable directions attacked through 3 subsets of sensors
+        self.assertEqual(len(attack_table),6)
+        feasibles = [candidate.feasible for candidate in attack_table]
+        self.assertEqual(feasibles,sorted(feasibles,reverse = True))
+        ss_K = attacker.compute_steady_state_K()
+        for candidate in attack_table:
+            attackers_input = attacker.compute_attackers_input(ss_K,candidate.Gamma)
+            vector = candidate.unst_data.vector.reshape((2,1))
+            ya0,ya1 = attacker.initialize_attack_sequence(attackers_input,vector)
+            self.assertTrue(np.allclose(ya0,candidate.ya0))
+            self.assertTrue(np.allclose(ya1,candidate.ya1))
+            self.assertAlmostEqual(attacker.compute_max_norm(candidate.Gamma,ya0,ya1),candidate.M)
+
 if __name__ == "__main__":
     unittest.main()
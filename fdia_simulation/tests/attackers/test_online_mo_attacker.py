@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:02:37 2026
+
+@author: qde
+"""
+
+import unittest
+import numpy as np
+from fdia_simulation.models     import Radar, PeriodRadar, LabeledMeasurement
+from fdia_simulation.filters    import (RadarFilterCA, RadarFilterCV, RadarIMM,
+                                        MultipleRadarsFilterCA,
+                                        MultiplePeriodRadarsFilterCA)
+from fdia_simulation.attackers  import OnlineMoAttacker
+from fdia_simulation.benchmarks import Benchmark
+
+class OnlineMoAttackerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.radar1 = Radar(x=-6000,y=10000)
+        self.radar2 = Radar(x=1000,y=8000)
+        self.radars = [self.radar1,self.radar2]
+        self.filter = MultipleRadarsFilterCA(q = 100., radars = self.radars,
+                                             x0 = 100, y0 = 100, z0 = 8000)
+        self.t0   = 10
+        self.time = 50
+        self.attacker = OnlineMoAttacker(filter = self.filter, radar_pos = 1,
+                                         t0 = self.t0, time = self.time)
+
+    # ==========================================================================
+    # ========================== Initialization tests ==========================
+
+    def test_initialization_gamma_from_radar_pos(self):
+        gamma = np.diag([0,0,0,1,1,1])
+        self.assertTrue(np.array_equal(self.attacker.gamma,gamma))
+
+    def test_initialization_no_gamma_no_radar_pos(self):
+        with self.assertRaises(ValueError):
+            OnlineMoAttacker(filter = self.filter, t0 = self.t0, time = self.time)
+
+    def test_initialization_wrong_gamma(self):
+        with self.assertRaises(ValueError):
+            OnlineMoAttacker(filter = self.filter, gamma = np.eye(3),
+                             t0 = self.t0, time = self.time)
+
+    # ==========================================================================
+    # ========================== Listening/Attack tests ========================
+
+    def test_unattacked_measurements(self):
+        measurement = np.ones(6)
+        for _ in range(self.t0):
+            self.assertIs(measurement,self.attacker.listen_measurement(measurement))
+        self.assertEqual(self.attacker.nb_linearizations,0)
+
+    def test_attacked_measurements_only_attacked_radar(self):
+        self.attacker.t0 = 0
+        for i in range(self.time):
+            measurement = self.attacker.listen_measurement(np.zeros(6))
+            self.assertTrue(np.array_equal(measurement[:3],np.zeros((3,1))))
+            self.assertTrue(np.allclose(measurement,self.attacker.injections[:,i:i+1]))
+
+    def test_linearization_reused(self):
+        self.attacker.t0 = 0
+        for _ in range(self.time):
+            self.attacker.listen_measurement(np.zeros(6))
+        self.assertEqual(self.attacker.nb_linearizations,1)
+
+    def test_linearization_when_operating_point_moves(self):
+        self.attacker.t0 = 0
+        self.attacker.listen_measurement(np.zeros(6))
+        self.filter.x[0,0] += 10000
+        self.attacker.listen_measurement(np.zeros(6))
+        self.assertEqual(self.attacker.nb_linearizations,2)
+
+    def rotating_F(self):
+        '''
+        Transition matrix with a complex unstable eigenvalue (rotation of the
+        x/y positions with a growth of 1.2).
+        '''
+        F = self.filter.F.copy()
+        cos, sin = 1.2*np.cos(0.3), 1.2*np.sin(0.3)
+        F[[0,3],:] = 0
+        F[0,0], F[0,3], F[3,0], F[3,3] = cos, -sin, sin, cos
+        return F
+
+    def test_complex_eigenvalues_skipped(self):
+        self.filter.F = self.rotating_F()
+        self.attacker.t0 = 0
+        self.attacker.listen_measurement(np.zeros(6))
+        # The best ranked direction is complex, the attack uses a real one
+        attack_table = self.attacker.attack_table
+        self.assertFalse(np.isreal(attack_table[0].unst_data.value))
+        best_real = [candidate for candidate in attack_table if np.isreal(candidate.unst_data.value)][0]
+        attacker = OnlineMoAttacker(filter = self.filter, radar_pos = 1, t0 = 0, time = self.time,
+                                    pos_value = best_real.unst_data.position)
+        attacker.listen_measurement(np.zeros(6))
+        self.assertTrue(np.any(self.attacker.injections != 0))
+        self.assertTrue(np.allclose(attacker.injections, self.attacker.injections))
+
+    def test_complex_pos_value(self):
+        self.filter.F = self.rotating_F()
+        attacker = OnlineMoAttacker(filter = self.filter, radar_pos = 1, pos_value = 0,
+                                    t0 = 0, time = self.time)
+        with self.assertRaises(ValueError):
+            attacker.listen_measurement(np.zeros(6))
+
+    def test_pos_value_eigenvalue_position(self):
+        # The negative eigenvalue is stable: the unstable values and the
+        # eigenvalues of F have different positions after it
+        self.filter.F[1,1] = -0.5
+        self.attacker.t0 = 0
+        self.attacker.listen_measurement(np.zeros(6))
+        unst_data = self.attacker.unst_data
+        best = self.attacker.attack_table[0].unst_data
+        self.assertNotEqual(best.position, unst_data.index(best))
+        attacker = OnlineMoAttacker(filter = self.filter, radar_pos = 1, t0 = 0, time = self.time,
+                                    pos_value = best.position)
+        attacker.listen_measurement(np.zeros(6))
+        self.assertTrue(np.allclose(self.attacker.injections, attacker.injections))
+        attacker = OnlineMoAttacker(filter = self.filter, radar_pos = 1, t0 = 0, time = self.time,
+                                    pos_value = 1)
+        with self.assertRaises(ValueError):
+            attacker.listen_measurement(np.zeros(6))
+
+    def test_infeasible_pos_value(self):
+        self.filter.F = self.rotating_F()
+        self.attacker.t0 = 0
+        self.attacker.listen_measurement(np.zeros(6))
+        infeasible = [candidate for candidate in self.attacker.attack_table if not candidate.feasible][0]
+        attacker = OnlineMoAttacker(filter = self.filter, radar_pos = 1, t0 = 0, time = self.time,
+                                    pos_value = infeasible.unst_data.position)
+        with self.assertWarns(Warning):
+            attacker.listen_measurement(np.zeros(6))
+        self.assertTrue(np.array_equal(np.zeros((6,self.time)), attacker.injections))
+
+    def test_no_feasible_candidate(self):
+        # Attacking the azimuth alone cannot reach any direction
+        attacker = OnlineMoAttacker(filter = self.filter, gamma = np.diag([0,0,0,0,1,0]),
+                                    t0 = 0, time = self.time)
+        with self.assertWarns(Warning):
+            measurement = attacker.listen_measurement(np.zeros(6))
+        self.assertFalse(any(candidate.feasible for candidate in attacker.attack_table))
+        self.assertTrue(np.array_equal(np.zeros((6,self.time)), attacker.injections))
+        self.assertTrue(np.array_equal(np.zeros((6,1)), measurement))
+
+    def test_labeled_measurements(self):
+        radars = [PeriodRadar(x=-6000,y=10000),PeriodRadar(x=1000,y=8000)]
+        filter = MultiplePeriodRadarsFilterCA(q = 100., radars = radars,
+                                              x0 = 100, y0 = 100, z0 = 8000)
+        attacker = OnlineMoAttacker(filter = filter, radar_pos = 1, t0 = 0, time = 2)
+        labeled_measurement = LabeledMeasurement(tag = 0, time = 0.1, value = np.zeros((3,1)))
+        modified_measurement = attacker.listen_measurement(labeled_measurement)
+        self.assertTrue(np.array_equal(modified_measurement.value,np.zeros((3,1))))
+        labeled_measurement = LabeledMeasurement(tag = 1, time = 0.2, value = np.zeros((3,1)))
+        modified_measurement = attacker.listen_measurement(labeled_measurement)
+        self.assertTrue(np.allclose(modified_measurement.value,attacker.injections[3:,1:2]))
+
+    def test_benchmark_imm(self):
+        radar   = Radar(x=2000,y=2000)
+        radar.step = 1.
+        states  = np.array([[i,i/2,i/10]*3 for i in range(100)])
+        filters = [RadarFilterCV(q = 100., radar = radar), RadarFilterCA(q = 100., radar = radar)]
+        imm = RadarIMM(filters, [0.5,0.5], np.array([[0.95,0.05],[0.05,0.95]]))
+        attacker = OnlineMoAttacker(filter = imm, radar_pos = 0, t0 = 20, time = 50)
+        benchmark = Benchmark(radars = radar, radar_filter = imm,
+                              states = states, attacker = attacker)
+        benchmark.gen_data_set()
+        benchmark.process_filter(with_nees = True)
+        self.assertEqual(attacker.current_time,100)
+        self.assertTrue(attacker.nb_linearizations >= 1)
+
+if __name__ == "__main__":
+    unittest.main()
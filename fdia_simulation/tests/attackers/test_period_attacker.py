@@ -144,6 +144,45 @@ class PeriodAttackerTestCase(unittest.TestCase):
         self.assertTrue(all((meas == mod_meas) for meas, mod_meas in comparison_list_1))
         self.assertTrue(all((meas == mod_meas) for meas, mod_meas in comparison_list_2))
 
+    def test_listen_measurement_untouched_not_copied(self):
+        labeled_measurement = LabeledMeasurement(tag = 0, time = 1, value = np.ones((3,1)))
+        self.attacker.t0     = 0
+        computed_measurement = self.attacker.listen_measurement(labeled_measurement)
+        self.assertIs(labeled_measurement,computed_measurement)
+
+    def test_listen_measurement_in_seconds(self):
+        self.attacker.in_seconds = True
+        # Attack window of 50s starting at 10s
+        labeled_before = LabeledMeasurement(tag = 1, time = 9.9,  value = np.ones((3,1)))
+        labeled_during = LabeledMeasurement(tag = 1, time = 10.,  value = np.ones((3,1)))
+        labeled_after  = LabeledMeasurement(tag = 1, time = 60.,  value = np.ones((3,1)))
+        self.assertIs(labeled_before, self.attacker.listen_measurement(labeled_before))
+        self.assertIsNot(labeled_during, self.attacker.listen_measurement(labeled_during))
+        self.assertIs(labeled_after, self.attacker.listen_measurement(labeled_after))
+
+    def test_listen_tagged_measurements_same_as_listen_measurement(self):
+        tags  = [i%2 for i in range(100)]
+        times = [i/10 for i in range(100)]
+        tagged_values = np.array([[tag,time,i,i,i] for i,(tag,time) in enumerate(zip(tags,times))],dtype = float)
+        labeled_measurements = [LabeledMeasurement(int(row[0]),row[1],row[2:].reshape((3,1)).copy())
+                                for row in tagged_values]
+        expected_values = [self.attacker.listen_measurement(labeled_meas).value
+                           for labeled_meas in labeled_measurements]
+        self.attacker.current_time = 0
+        self.attacker.listen_tagged_measurements(tagged_values)
+        self.assertEqual(self.attacker.current_time,100)
+        for expected_value,row in zip(expected_values,tagged_values):
+            self.assertTrue(np.allclose(np.reshape(expected_value,(3,)),row[2:]))
+
+    def test_listen_tagged_measurements_in_seconds(self):
+        self.attacker.in_seconds = True
+        tagged_values = np.array([[1,t,0,0,0] for t in range(100)],dtype = float)
+        self.attacker.listen_tagged_measurements(tagged_values)
+        attacked = np.any(tagged_values[:,2:] != 0, axis = 1)
+        self.assertFalse(any(attacked[:10]))
+        self.assertTrue(all(attacked[10:60]))
+        self.assertFalse(any(attacked[60:]))
+
     # def test_attacked_vectors(self):
     #     measurements = [np.ones((3,1))*i for i in range(100)]
     #     tags  = [1]*100
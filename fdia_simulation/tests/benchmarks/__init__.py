@@ -11,10 +11,26 @@ __all__ = ["test_benchmark_1radar",
            "test_benchmark_2radars",
            "test_benchmark_2period_radars",
            "test_noise_finder_1radar",
-           "test_noise_finder_2radars"]
+           "test_noise_finder_2radars",
+           "test_noise_finder_imm",
+           "test_monte_carlo",
+           "test_measurement_set",
+           "test_pipeline",
+           "test_realtime",
+           "test_instrumentation",
+           "test_perf_suite",
+           "test_scenario_runner"]
 
 from .test_benchmark_1radar       import *
 from .test_benchmark_2radars      import *
 from .test_benchmark_2period_radars import *
 from .test_noise_finder_1radar    import *
 from .test_noise_finder_2radars   import *
+from .test_noise_finder_imm       import *
+from .test_monte_carlo            import *
+from .test_measurement_set        import *
+from .test_pipeline               import *
+from .test_realtime               import *
+from .test_instrumentation        import *
+from .test_perf_suite             import *
+from .test_scenario_runner        import *
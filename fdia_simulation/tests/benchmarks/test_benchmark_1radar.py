@@ -10,7 +10,7 @@ import numpy as np
 from abc                        import ABC
 from fdia_simulation.models     import Radar
 from fdia_simulation.filters    import RadarFilterCA,RadarFilterCV,RadarFilterCT,RadarFilterTA,RadarIMM
-from fdia_simulation.benchmarks import Benchmark
+from fdia_simulation.benchmarks import Benchmark, NEESMonitor
 
 
 class Benchmark1RadarTestEnv(ABC):
@@ -64,6 +64,74 @@ class Benchmark1RadarTestEnv(ABC):
         self.benchmark.process_filter(with_nees = True)
         self.assertEqual(np.shape(self.benchmark.estimated_positions), (100,3))
 
+    def test_process_filter_with_cov(self):
+        self.benchmark.gen_data_set()
+        self.benchmark.process_filter(with_cov = True)
+        nb_steps = len(self.benchmark.estimated_positions)
+        self.assertEqual(np.shape(self.benchmark.cov_diags), (nb_steps,9))
+        self.assertEqual(np.shape(self.benchmark.estimated_states), (nb_steps,9))
+        self.assertTrue(np.array_equal(self.benchmark.estimated_states[:,[0,3,6]],
+                                       self.benchmark.estimated_positions))
+
+    def test_compute_nees(self):
+        states_tilde = np.array([1., 2., 3.])
+        P = np.array([[2. , 0.5, 0. ],
+                      [0.5, 1. , 0.1],
+                      [0. , 0.1, 3. ]])
+        nees = states_tilde@np.linalg.inv(P)@states_tilde
+        self.assertAlmostEqual(self.benchmark.compute_nees(states_tilde,P), nees)
+
+    def test_compute_nees_singular_P(self):
+        states_tilde = np.array([1., 2., 3.])
+        P = np.diag([1., 0., 2.])
+        self.assertEqual(NEESMonitor.SENTINEL, self.benchmark.compute_nees(states_tilde,P))
+
+    def test_process_filter_singular_P(self):
+        self.benchmark.gen_data_set()
+        # The covariances of the filter (or of the models of the IMM) vanish
+        for model in getattr(self.benchmark.radar_filter,'filters',[self.benchmark.radar_filter]):
+            model.P = np.zeros((9,9))
+            model.Q = np.zeros((9,9))
+        monitor = NEESMonitor()
+        self.benchmark.process_filter(monitor = monitor)
+        self.assertTrue(monitor.aborted)
+        self.assertEqual(1, monitor.count)
+        self.assertEqual(1, len(self.benchmark.nees))
+
+    def test_process_filter_with_monitor(self):
+        self.benchmark.gen_data_set()
+        monitor = NEESMonitor(bound = 0., burn_in = 10)
+        self.benchmark.process_filter(monitor = monitor)
+        self.assertTrue(monitor.aborted)
+        self.assertEqual(11, monitor.count)
+        self.assertEqual(np.inf, monitor.score)
+        self.assertEqual(np.shape(self.benchmark.nees), (11,1))
+        self.assertEqual(np.shape(self.benchmark.estimated_states), (11,9))
+
+    def test_process_filter_with_monitor_not_aborted(self):
+        self.benchmark.gen_data_set()
+        monitor = NEESMonitor()
+        self.benchmark.process_filter(monitor = monitor)
+        self.assertFalse(monitor.aborted)
+        self.assertEqual(len(self.benchmark.estimated_states), monitor.count)
+        self.assertAlmostEqual(np.mean(self.benchmark.nees), monitor.score)
+
+
+class NEESMonitorTestCase(unittest.TestCase):
+    def test_update(self):
+        monitor = NEESMonitor(bound = 5., burn_in = 2)
+        self.assertTrue(monitor.update(20.))
+        self.assertTrue(monitor.update(0.))
+        self.assertFalse(monitor.update(2.))
+        self.assertAlmostEqual(22/3, monitor.mean)
+        self.assertEqual(NEESMonitor.SENTINEL, monitor.score)
+
+    def test_update_non_finite(self):
+        monitor = NEESMonitor(burn_in = 10)
+        self.assertFalse(monitor.update(np.nan))
+        self.assertTrue(monitor.aborted)
+
+
 class Benchmark1RadarCATestCase(Benchmark1RadarTestEnv,unittest.TestCase):
     def setUp(self):
         # Radar & States generation
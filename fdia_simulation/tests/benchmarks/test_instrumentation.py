@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 10:02:41 2026
+
+@author: qde
+"""
+
+import os
+import json
+import unittest
+import tempfile
+import numpy as np
+from fdia_simulation.models            import Radar
+from fdia_simulation.filters           import RadarFilterCA
+from fdia_simulation.anomaly_detectors import MahalanobisDetector
+from fdia_simulation.attackers         import Attacker
+from fdia_simulation.benchmarks        import Benchmark, Instrumentation, StageStatistics
+
+
+class StageStatisticsTestCase(unittest.TestCase):
+    def test_empty(self):
+        statistics = StageStatistics()
+        self.assertEqual(0 ,statistics.mean)
+        self.assertEqual(0.,statistics.percentile(99))
+        self.assertEqual(0.,statistics.to_dict()['min'])
+
+    def test_add(self):
+        statistics = StageStatistics()
+        durations  = [1e-4]*99 + [1e-2]
+        for duration in durations:
+            statistics.add(duration)
+        self.assertEqual(100,statistics.count)
+        self.assertAlmostEqual(sum(durations),statistics.total)
+        self.assertEqual(1e-4,statistics.min)
+        self.assertEqual(1e-2,statistics.max)
+        # The percentiles are the upper edges of the bins (less than 13% error)
+        self.assertTrue(1e-4 <= statistics.percentile(50) <= 1.13e-4)
+        self.assertTrue(1e-4 <= statistics.percentile(99) <= 1.13e-4)
+        self.assertEqual(1e-2,statistics.percentile(100))
+
+    def test_out_of_range(self):
+        statistics = StageStatistics()
+        statistics.add(0.)
+        statistics.add(1e3)
+        self.assertEqual(2,statistics.histogram.sum())
+        self.assertEqual(1,statistics.histogram[0])
+        self.assertEqual(1,statistics.histogram[-1])
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.radar = Radar(x=2000,y=2000)
+        self.radar.step = 1
+        self.states = np.array([[i,i/2,i/10]*3 for i in range(300)])
+        self.instrumentation = Instrumentation()
+
+    def gen_benchmark(self,instrumentation):
+        radar_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = self.radar,
+                                     detector = MahalanobisDetector())
+        attacker = Attacker(filter = radar_filter, radar = self.radar, radar_pos = 0,
+                            mag_vector = np.array([[1e3,0,0]]).T, t0 = 50, time = 20)
+        return Benchmark(radars = self.radar, radar_filter = radar_filter, states = self.states,
+                         attacker = attacker, instrumentation = instrumentation)
+
+    def test_wrap(self):
+        timed_sum = self.instrumentation.wrap('sum',sum)
+        self.assertEqual(6,timed_sum([1,2,3]))
+        self.assertEqual(1,self.instrumentation.stages['sum'].count)
+
+    def test_count(self):
+        self.instrumentation.count('steps')
+        self.instrumentation.count('steps',4)
+        self.assertEqual(5,self.instrumentation.counters['steps'])
+
+    def test_timing_detectors(self):
+        radar_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = self.radar,
+                                     detector = MahalanobisDetector())
+        with self.instrumentation.timing_detectors(radar_filter):
+            radar_filter.activate_detection()
+            radar_filter.predict()
+            radar_filter.update(np.array([[2800.,0.8,0.]]).T)
+        self.assertEqual(1,self.instrumentation.stages['detector'].count)
+        # The detector is restored
+        self.assertFalse('review_measurement' in vars(radar_filter.detector))
+
+    def test_process_filter(self):
+        np.random.seed(3)
+        benchmark = self.gen_benchmark(self.instrumentation)
+        benchmark.gen_data_set()
+        benchmark.process_filter(with_nees = True)
+        stages = self.instrumentation.stages
+        for stage in ['attacker','predict','update','nees','process_filter']:
+            self.assertTrue(stage in stages)
+        for stage in ['attacker','predict','update','nees']:
+            self.assertEqual(300,stages[stage].count)
+        self.assertEqual(1,stages['process_filter'].count)
+        self.assertEqual(300,self.instrumentation.counters['steps'])
+        self.assertEqual(benchmark.radar_filter.anomaly_counter,self.instrumentation.counters['anomalies'])
+        report = self.instrumentation.report()
+        self.assertTrue(report['throughput'] > 0)
+        summary = report['stages']['update']
+        self.assertTrue(summary['min'] <= summary['p50'] <= summary['p99'] <= summary['max'])
+
+    def test_same_results_as_uninstrumented(self):
+        np.random.seed(3)
+        benchmark = self.gen_benchmark(None)
+        benchmark.gen_data_set()
+        benchmark.process_filter(with_nees = True)
+        np.random.seed(3)
+        instrumented_benchmark = self.gen_benchmark(self.instrumentation)
+        instrumented_benchmark.gen_data_set()
+        instrumented_benchmark.process_filter(with_nees = True)
+        self.assertTrue(np.array_equal(benchmark.estimated_states,instrumented_benchmark.estimated_states))
+        self.assertTrue(np.array_equal(benchmark.nees,instrumented_benchmark.nees))
+
+    def test_launch_benchmark_report(self):
+        benchmark = self.gen_benchmark(self.instrumentation)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'report.json')
+            benchmark.launch_benchmark(with_nees = True, plot = False, report_path = path)
+            with open(path) as report_file:
+                report = json.load(report_file)
+        self.assertEqual(300,report['counters']['steps'])
+        self.assertEqual(1,report['stages']['data_generation']['count'])
+        self.assertEqual(300,report['stages']['update']['count'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:10:26 2026
+
+@author: qde
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+from fdia_simulation.models     import Radar, PeriodRadar
+from fdia_simulation.filters    import RadarFilterCA
+from fdia_simulation.attackers  import DriftAttacker
+from fdia_simulation.benchmarks import Benchmark, MeasurementSet
+
+
+class MeasurementSetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.radar = Radar(x=2000,y=2000)
+        self.radar.step = 1
+        self.states = np.array([[i,i/2,i/10]*3 for i in range(100)])
+        MeasurementSet.clear_cache()
+
+    def gen_benchmark(self,q = 100.,measurement_set = None,attacker = None):
+        radar_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = q, radar = self.radar)
+        return Benchmark(radars = self.radar, radar_filter = radar_filter, states = self.states,
+                         measurement_set = measurement_set, attacker = attacker)
+
+    def test_generate_same_as_benchmark(self):
+        measurement_set = MeasurementSet.generate(self.radar,self.states,seed = 3)
+        np.random.seed(3)
+        benchmark = self.gen_benchmark()
+        benchmark.gen_data_set()
+        self.assertTrue(np.array_equal(measurement_set.measured_values,benchmark.measured_values))
+        self.assertTrue(np.array_equal(measurement_set.measured_positions[0],benchmark.measured_positions[0]))
+        self.assertEqual(100,len(measurement_set))
+
+    def test_generate_period_radars(self):
+        radars = [PeriodRadar(x=2000,y=2000,dt=0.01),PeriodRadar(x=1000,y=1000,dt=0.02)]
+        measurement_set = MeasurementSet.generate(radars,self.states,seed = 3)
+        self.assertTrue(measurement_set.radar_is_period)
+        self.assertEqual((150,5),np.shape(measurement_set.tagged_values))
+        self.assertEqual([0,1],sorted(set(measurement_set.tagged_values[:,0])))
+        # The radars are not modified
+        self.assertEqual([0,0],[radar.tag for radar in radars])
+        self.assertTrue(np.all(np.diff(measurement_set.tagged_values[:,1]) >= 0))
+        self.assertIs(measurement_set.labeled_values,measurement_set.measurements)
+
+    def test_generate_missed_detections(self):
+        self.radar.detection_probability = 0.9
+        with self.assertRaises(ValueError):
+            MeasurementSet.generate(self.radar,self.states,seed = 3)
+        self.radar.detection_probability = 1.
+        self.radar.clutter_rate = 2.
+        with self.assertRaises(ValueError):
+            self.gen_benchmark().gen_data_set()
+
+    def test_get_cached_in_memory(self):
+        first  = MeasurementSet.get(self.radar,self.states,seed = 3)
+        second = MeasurementSet.get(self.radar,self.states,seed = 3)
+        other  = MeasurementSet.get(self.radar,self.states,seed = 4)
+        self.assertIs(first,second)
+        self.assertFalse(np.array_equal(first.measured_values,other.measured_values))
+
+    def test_get_cache_bounded(self):
+        first = MeasurementSet.get(self.radar,self.states,seed = 0)
+        for seed in range(1,MeasurementSet.CACHE_SIZE):
+            MeasurementSet.get(self.radar,self.states,seed = seed)
+        # The first set is used again: the second one is the least recently used
+        self.assertIs(first,MeasurementSet.get(self.radar,self.states,seed = 0))
+        MeasurementSet.get(self.radar,self.states,seed = MeasurementSet.CACHE_SIZE)
+        self.assertEqual(MeasurementSet.CACHE_SIZE,len(MeasurementSet._cache))
+        self.assertIn(MeasurementSet.compute_key(self.radar,self.states,0),MeasurementSet._cache)
+        self.assertNotIn(MeasurementSet.compute_key(self.radar,self.states,1),MeasurementSet._cache)
+
+    def test_get_without_seed(self):
+        with self.assertRaises(ValueError):
+            MeasurementSet.get(self.radar,self.states,seed = None)
+
+    def test_get_cached_on_disk(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = MeasurementSet.get(self.radar,self.states,seed = 3,cache_dir = cache_dir)
+            self.assertEqual(1,len(os.listdir(cache_dir)))
+            MeasurementSet.clear_cache()
+            second = MeasurementSet.get(self.radar,self.states,seed = 3,cache_dir = cache_dir)
+            self.assertIsNot(first,second)
+            self.assertTrue(np.array_equal(first.measured_values,second.measured_values))
+            self.assertTrue(np.array_equal(first.measured_positions[0],second.measured_positions[0]))
+            self.assertEqual(3,second.seed)
+
+    def test_shared_by_benchmarks(self):
+        measurement_set = MeasurementSet.generate(self.radar,self.states,seed = 3)
+        benchmark_1 = self.gen_benchmark(measurement_set = measurement_set)
+        benchmark_2 = self.gen_benchmark(measurement_set = measurement_set)
+        benchmark_1.process_filter(with_nees = True)
+        benchmark_2.process_filter(with_nees = True)
+        self.assertIs(benchmark_1.measured_values,measurement_set.measured_values)
+        self.assertTrue(np.array_equal(benchmark_1.estimated_states,benchmark_2.estimated_states))
+
+    def test_not_modified_by_attacker(self):
+        measurement_set = MeasurementSet.generate(self.radar,self.states,seed = 3)
+        measured_values = measurement_set.measured_values.copy()
+        benchmark = self.gen_benchmark(measurement_set = measurement_set)
+        benchmark.attacker = DriftAttacker(filter = benchmark.radar_filter, radar = self.radar,
+                                           radar_pos = 0, t0 = 10, time = 50)
+        benchmark.process_filter()
+        self.assertTrue(np.array_equal(measured_values,measurement_set.measured_values))
+
+    def test_load_measurement_set_wrong_radars(self):
+        radars = [PeriodRadar(x=2000,y=2000,dt=0.01),PeriodRadar(x=1000,y=1000,dt=0.02)]
+        measurement_set = MeasurementSet.generate(radars,self.states,seed = 3)
+        with self.assertRaises(ValueError):
+            self.gen_benchmark(measurement_set = measurement_set)
+
+
+if __name__ == "__main__":
+    unittest.main()
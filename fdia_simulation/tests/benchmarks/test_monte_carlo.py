@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:05:51 2026
+
+@author: qde
+"""
+
+import unittest
+import numpy as np
+from fdia_simulation.models            import Radar
+from fdia_simulation.filters           import RadarFilterCA
+from fdia_simulation.anomaly_detectors import MahalanobisDetector
+from fdia_simulation.benchmarks        import Benchmark, MonteCarlo, RunningStatistics
+
+
+def gen_scenario():
+    radar = Radar(x=2000,y=2000)
+    radar.step = 1.
+    states = np.array([[i,i/2,i/10]*3 for i in range(100)])
+    radar_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = radar,
+                                 detector = MahalanobisDetector())
+    return Benchmark(radars = radar, radar_filter = radar_filter, states = states)
+
+
+class RunningStatisticsTestCase(unittest.TestCase):
+    def test_statistics(self):
+        values = [1., 4., 2., 8., 5.]
+        statistics = RunningStatistics()
+        for value in values:
+            statistics.update(value)
+        self.assertEqual(statistics.count, 5)
+        self.assertAlmostEqual(statistics.mean, np.mean(values))
+        self.assertAlmostEqual(statistics.std, np.std(values, ddof = 1))
+        self.assertEqual(statistics.min, 1.)
+        self.assertEqual(statistics.max, 8.)
+
+
+class MonteCarloTestCase(unittest.TestCase):
+    def setUp(self):
+        self.monte_carlo = MonteCarlo(scenario = gen_scenario, nb_runs = 4,
+                                      nb_workers = 1, seed = 3)
+
+    def test_compute_seeds_independent(self):
+        seeds = self.monte_carlo.compute_seeds()
+        self.assertEqual(len(seeds), 4)
+        self.assertEqual(len(set(seeds)), 4)
+        self.assertEqual(seeds, self.monte_carlo.compute_seeds())
+        # The whole entropy of the seeds is used
+        self.assertTrue(all(len(seed) == MonteCarlo.SEED_WORDS for seed in seeds))
+        np.random.seed(np.array(seeds[0], dtype = np.uint32))
+        value = np.random.rand()
+        np.random.seed(seeds[0][0])
+        self.assertNotEqual(value, np.random.rand())
+
+    def test_launch_benchmark(self):
+        statistics = self.monte_carlo.launch_benchmark()
+        self.assertEqual(len(self.monte_carlo.summaries), 4)
+        for name in MonteCarlo.STATISTICS:
+            self.assertEqual(statistics[name].count, 4)
+        nees_means = [summary['nees_mean'] for summary in self.monte_carlo.summaries]
+        self.assertAlmostEqual(statistics['nees_mean'].mean, np.mean(nees_means))
+
+    def test_parallel_same_results(self):
+        self.monte_carlo.launch_benchmark()
+        parallel_monte_carlo = MonteCarlo(scenario = gen_scenario, nb_runs = 4,
+                                          nb_workers = 2, seed = 3)
+        parallel_monte_carlo.launch_benchmark()
+        for summary, parallel_summary in zip(self.monte_carlo.summaries,
+                                             parallel_monte_carlo.summaries):
+            self.assertEqual(summary, parallel_summary)
+
+if __name__ == "__main__":
+    unittest.main()
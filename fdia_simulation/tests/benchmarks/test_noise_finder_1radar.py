@@ -39,6 +39,37 @@ class NoiseFinder1RadarTestEnv(ABC):
         self.process_noise_finder.launch_benchmark()
         self.assertEqual(5,len(self.process_noise_finder.means_nees))
 
+    def test_gen_data_sets(self):
+        self.process_noise_finder.nb_iterations = 2
+        data_sets = self.process_noise_finder.gen_data_sets()
+        self.assertEqual(2,len(data_sets))
+        self.assertEqual(len(self.process_noise_finder.compute_nees(10)),len(data_sets[0]))
+
+    def test_iterate_same_simulation_common_random_numbers(self):
+        self.process_noise_finder.nb_iterations = 2
+        first  = self.process_noise_finder.iterate_same_simulation(q = 10)
+        second = self.process_noise_finder.iterate_same_simulation(q = 10)
+        self.assertEqual(first,second)
+
+    def test_evaluate_all_parallel(self):
+        self.process_noise_finder.seed = 3
+        self.process_noise_finder.evaluate_all([1.,10.])
+        serial_means_nees = self.process_noise_finder.means_nees
+        self.process_noise_finder.means_nees = {}
+        self.process_noise_finder.nb_workers = 2
+        self.process_noise_finder.evaluate_all([1.,10.])
+        self.assertEqual(serial_means_nees,self.process_noise_finder.means_nees)
+
+    def test_launch_adaptive_benchmark(self):
+        best_value = self.process_noise_finder.launch_adaptive_benchmark(nb_points = 3, nb_refinements = 2)
+        self.assertTrue(1. <= best_value <= 5.)
+        self.assertTrue(len(self.process_noise_finder.means_nees) <= 9)
+        self.assertEqual(best_value,self.process_noise_finder.best_value())
+
+    def test_evaluate_aborted(self):
+        self.process_noise_finder.nees_bound = 0.
+        self.assertEqual(np.inf,self.process_noise_finder.evaluate(10))
+
     def test_best_value(self):
         self.process_noise_finder.means_nees = {1.:0.3, 2.:0.4, 2:0.5}
         self.assertEqual(1.,self.process_noise_finder.best_value())
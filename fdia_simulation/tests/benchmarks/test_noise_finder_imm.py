@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 15:02:37 2026
+
+@author: qde
+"""
+
+import unittest
+import numpy as np
+from fdia_simulation.models     import Radar, PeriodRadar
+from fdia_simulation.filters    import (RadarIMM, RadarFilterCV, RadarFilterCA,
+                                        MultiplePeriodRadarsFilterCV, MultiplePeriodRadarsFilterCA)
+from fdia_simulation.benchmarks import NoiseFinderIMM1Radar, NoiseFinderIMMMultipleRadars
+
+
+class NoiseFinderIMM1RadarTestCase(unittest.TestCase):
+    def setUp(self):
+        self.radar  = Radar(x=2000,y=2000)
+        self.radar.step = 1
+        self.states = np.array([[i,i/2,i/10]*3 for i in range(300)])
+        self.process_noise_finder = NoiseFinderIMM1Radar(radar   = self.radar,
+                                                         states  = self.states,
+                                                         filters = [RadarFilterCV,RadarFilterCA],
+                                                         seed    = 3,
+                                                         screening_steps = 50)
+        # Reduction of the actual range for testing purposes
+        self.process_noise_finder.TO_TEST = [1.,100.]
+
+    def test_initialization_noise_finder(self):
+        self.assertEqual(2,self.process_noise_finder.nb_filters)
+        self.assertEqual([0.5,0.5],self.process_noise_finder.mu)
+        self.assertTrue(np.allclose(np.sum(self.process_noise_finder.trans,axis=1),1.))
+
+    def test_gen_filter(self):
+        imm = self.process_noise_finder.gen_filter([1.,10.])
+        self.assertIsInstance(imm,RadarIMM)
+        self.assertEqual(1. ,imm.filters[0].q)
+        self.assertEqual(10.,imm.filters[1].q)
+
+    def test_compute_nees(self):
+        self.assertEqual(300,len(self.process_noise_finder.compute_nees([1.,10.])))
+
+    def test_format_q(self):
+        self.assertEqual((10.,0.1),self.process_noise_finder.format_q([10**np.log10(10.),0.1]))
+
+    def test_evaluate_rejection(self):
+        self.process_noise_finder.gen_data_sets()
+        self.process_noise_finder.nees_threshold = 0.
+        self.assertEqual(np.inf,self.process_noise_finder.evaluate([1.,10.]))
+        self.process_noise_finder.nees_threshold = np.inf
+        self.assertTrue(np.isfinite(self.process_noise_finder.evaluate([1.,10.])))
+
+    def test_launch_benchmark(self):
+        best_value = self.process_noise_finder.launch_benchmark(nb_points = 3, nb_sweeps = 2)
+        self.assertEqual(2,len(best_value))
+        self.assertTrue(all(1. <= q <= 100. for q in best_value))
+        # 1 starting point + at most 3 candidates per coordinate and sweep
+        self.assertTrue(len(self.process_noise_finder.means_nees) <= 1 + 2*2*3)
+        self.assertEqual(np.inf,self.process_noise_finder.nees_threshold)
+
+    def test_launch_benchmark_screening_threshold(self):
+        finder     = self.process_noise_finder
+        thresholds = []
+        evaluate_all = finder.evaluate_all
+        def recording_evaluate_all(qs):
+            if finder.means_nees:
+                # Threshold of the candidates and screening nees of the best qs
+                thresholds.append((finder.nees_threshold,finder.screening_score(finder.best_value())))
+            evaluate_all(qs)
+        finder.evaluate_all = recording_evaluate_all
+        finder.launch_benchmark(nb_points = 3, nb_sweeps = 1, rejection_factor = 2.)
+        self.assertEqual(2,len(thresholds))
+        for threshold,best_screening_nees in thresholds:
+            self.assertEqual(2*best_screening_nees,threshold)
+        # The best qs are never rejected by their own screening nees
+        finder.nees_threshold = thresholds[-1][1]
+        self.assertTrue(np.isfinite(finder.evaluate(finder.best_value())))
+
+    def test_launch_benchmark_parallel(self):
+        serial_best_value = self.process_noise_finder.launch_benchmark(nb_points = 3, nb_sweeps = 1)
+        serial_means_nees = self.process_noise_finder.means_nees
+        self.process_noise_finder.means_nees = {}
+        self.process_noise_finder.nb_workers = 2
+        self.assertEqual(serial_best_value,self.process_noise_finder.launch_benchmark(nb_points = 3, nb_sweeps = 1))
+        self.assertEqual(serial_means_nees,self.process_noise_finder.means_nees)
+
+
+class NoiseFinderIMMMultipleRadarsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.radars = [PeriodRadar(x=2000,y=2000,dt=0.01),PeriodRadar(x=1000,y=1000,dt=0.02)]
+        self.states = np.array([[i,i/2,i/10]*3 for i in range(300)])
+        self.process_noise_finder = NoiseFinderIMMMultipleRadars(radars  = self.radars,
+                                                                 states  = self.states,
+                                                                 filters = [MultiplePeriodRadarsFilterCV,
+                                                                            MultiplePeriodRadarsFilterCA],
+                                                                 seed    = 3)
+        self.process_noise_finder.TO_TEST = [1.,100.]
+
+    def test_compute_nees(self):
+        self.assertEqual(450,len(self.process_noise_finder.compute_nees([1.,10.])))
+
+    def test_launch_benchmark(self):
+        best_value = self.process_noise_finder.launch_benchmark(nb_points = 3, nb_sweeps = 1)
+        self.assertEqual(2,len(best_value))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 15:03:48 2026
+
+@author: qde
+"""
+
+import os
+import io
+import json
+import unittest
+import tempfile
+from contextlib import redirect_stdout
+from fdia_simulation.benchmarks.perf_suite import PerfSuite, gen_perf_cases, main
+
+
+class PerfSuiteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = PerfSuite(cases = {'sum.small': lambda: (lambda: sum(range(10))),
+                                        'sum.large': lambda: (lambda: sum(range(1000)))},
+                               repeat = 2, min_time = 1e-3)
+
+    def test_gen_perf_cases(self):
+        cases = gen_perf_cases()
+        for name in ['track.gen_cruise','radar.gen_data','radar.sense','ekf_step.CV.single',
+                     'ekf_step.TA.multiple','ekf_step.CT.period','imm_step.4models',
+                     'detector.mahalanobis','benchmark.landing.CA']:
+            self.assertTrue(name in cases)
+
+    def test_cases_run(self):
+        # Each case can be set up and called
+        cases = gen_perf_cases()
+        for name in cases:
+            if name.startswith(('ekf_step','imm_step','detector')):
+                function = cases[name]()
+                function()
+                function()
+
+    def test_run(self):
+        results = self.suite.run()
+        self.assertEqual(['sum.small','sum.large'],list(results))
+        self.assertTrue(0 < results['sum.small'] < results['sum.large'])
+        self.assertEqual(['sum.large'],list(self.suite.run(pattern = 'large')))
+
+    def test_compare(self):
+        baseline   = {'a': 1., 'b': 1., 'c': 1.}
+        results    = {'a': 1.1, 'b': 1.5, 'c': 0.5, 'd': 1.}
+        comparison = {row['name']: row for row in PerfSuite.compare(results,baseline,tolerance = 0.2)}
+        self.assertEqual('ok'         ,comparison['a']['status'])
+        self.assertEqual('regression' ,comparison['b']['status'])
+        self.assertEqual('improvement',comparison['c']['status'])
+        self.assertEqual('new'        ,comparison['d']['status'])
+        self.assertAlmostEqual(1.5,comparison['b']['ratio'])
+        report = PerfSuite.format_report(list(comparison.values()))
+        self.assertTrue('1 regression(s) out of 4 cases' in report)
+
+    def test_baseline(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'baseline.json')
+            PerfSuite.save_baseline(path,{'a': 1.})
+            PerfSuite.save_baseline(path,{'b': 2.})
+            self.assertEqual({'a': 1., 'b': 2.},PerfSuite.load_baseline(path))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'baseline.json')
+            args = ['--baseline',path,'--filter','detector.euclidian','--repeat','1']
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(0,main(args + ['--update']))
+            PerfSuite.save_baseline(path,{'detector.euclidian': 1e-12})
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(1,main(args))
+            self.assertTrue('regression' in output.getvalue())
+
+    def write_foreign_baseline(self,path):
+        machine = dict(PerfSuite.describe_machine(),node = 'another-host')
+        with open(path,'w') as baseline_file:
+            json.dump({'machine': machine,'results': {'detector.euclidian': 1e-12,'a': 1.}},baseline_file)
+
+    def test_main_other_machine(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'baseline.json')
+            self.write_foreign_baseline(path)
+            args = ['--baseline',path,'--filter','detector.euclidian','--repeat','1']
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(0,main(args))
+            self.assertTrue('another machine' in output.getvalue())
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(1,main(args + ['--force']))
+
+    def test_save_baseline_other_machine(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'baseline.json')
+            self.write_foreign_baseline(path)
+            PerfSuite.save_baseline(path,{'b': 2.})
+            self.assertEqual({'b': 2.},PerfSuite.load_baseline(path))
+            self.assertEqual(PerfSuite.describe_machine(),PerfSuite.load_machine(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:20:43 2026
+
+@author: qde
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+from fdia_simulation.models            import Radar, PeriodRadar, LabeledMeasurement
+from fdia_simulation.filters           import RadarFilterCA
+from fdia_simulation.anomaly_detectors import MahalanobisDetector
+from fdia_simulation.attackers         import Attacker
+from fdia_simulation.benchmarks        import (Benchmark, Sink, StatisticsSink, FileSink,
+                                               sense_states, filter_measurements)
+
+
+class CollectorSink(Sink):
+    def __init__(self):
+        self.results = []
+        self.closed  = False
+
+    def add(self,result):
+        self.results.append(result)
+
+    def close(self):
+        self.closed = True
+
+
+class PipelineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.radar = Radar(x=2000,y=2000)
+        self.radar.step = 1
+        self.states = np.array([[i,i/2,i/10]*3 for i in range(100)])
+        self.radar_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = self.radar,
+                                          detector = MahalanobisDetector())
+        self.benchmark = Benchmark(radars = self.radar, radar_filter = self.radar_filter,
+                                   states = self.states)
+
+    def test_sink_abstract(self):
+        with self.assertRaises(TypeError):
+            Sink()
+
+    def test_sense_states(self):
+        radar2 = Radar(x=1000,y=1000)
+        radar2.step = 1
+        measurements = list(sense_states(iter(self.states),[self.radar,radar2]))
+        self.assertEqual(100,len(measurements))
+        state, measurement = measurements[10]
+        self.assertTrue(np.array_equal(self.states[10],state))
+        self.assertEqual((6,),np.shape(measurement))
+
+    def test_sense_states_missed_detections(self):
+        self.radar.detection_probability = 0.9
+        with self.assertRaises(ValueError):
+            list(sense_states(self.states,[self.radar]))
+
+    def test_sense_states_period(self):
+        radars = [PeriodRadar(x=2000,y=2000,dt=0.01),PeriodRadar(x=1000,y=1000,dt=0.02)]
+        radars[1].tag = 1
+        measurements = [measurement for _,measurement in sense_states(self.states,radars)]
+        self.assertEqual(150,len(measurements))
+        self.assertIsInstance(measurements[0],LabeledMeasurement)
+        times = [measurement.time for measurement in measurements]
+        self.assertEqual(sorted(times),times)
+        self.assertEqual(50,len([m for m in measurements if m.tag == 1]))
+
+    def test_filter_measurements(self):
+        measurements = sense_states(self.states,[self.radar])
+        results = list(filter_measurements(measurements,self.radar_filter))
+        self.assertEqual(100,len(results))
+        self.assertEqual(['anomaly','nees','probs','state','step','time'],sorted(results[0]))
+        self.assertEqual((9,),np.shape(results[0]['state']))
+        self.assertIsNone(results[0]['probs'])
+        anomalies = sum(result['anomaly'] for result in results)
+        self.assertEqual(self.radar_filter.anomaly_counter,anomalies)
+
+    def test_launch_pipeline(self):
+        statistics, collector = self.benchmark.launch_pipeline([StatisticsSink(burn_in = 10),CollectorSink()])
+        self.assertTrue(collector.closed)
+        self.assertEqual(100,statistics.nb_steps)
+        self.assertEqual(90,statistics.nees.count)
+        nees = [result['nees'] for result in collector.results[10:]]
+        self.assertAlmostEqual(np.mean(nees),statistics.nees.mean)
+        self.assertEqual(self.radar_filter.anomaly_counter,statistics.nb_anomalies)
+        # Nothing is stored by the benchmark
+        self.assertEqual(0,len(self.benchmark.estimated_states))
+
+    def test_launch_pipeline_generator_states(self):
+        states = (state for state in self.states)
+        collector, = self.benchmark.launch_pipeline([CollectorSink()],states = states,with_nees = False)
+        self.assertEqual(100,len(collector.results))
+        self.assertIsNone(collector.results[0]['nees'])
+
+    def test_launch_pipeline_attacked(self):
+        np.random.seed(3)
+        collector, = self.benchmark.launch_pipeline([CollectorSink()])
+        attacked_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = self.radar)
+        attacked_benchmark = Benchmark(radars = self.radar, radar_filter = attacked_filter, states = self.states)
+        attacked_benchmark.attacker = Attacker(filter = attacked_filter, radar = self.radar, radar_pos = 0,
+                                               mag_vector = np.array([[1e3,0,0]]).T, t0 = 50, time = 20)
+        np.random.seed(3)
+        attacked_collector, = attacked_benchmark.launch_pipeline([CollectorSink()])
+        self.assertEqual(100,attacked_benchmark.attacker.current_time)
+        for i in [0,49]:
+            self.assertTrue(np.array_equal(collector.results[i]['state'],attacked_collector.results[i]['state']))
+        self.assertTrue(attacked_collector.results[60]['nees'] > collector.results[60]['nees'])
+
+    def test_file_sink(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory,'results.bin')
+            file_sink, collector = self.benchmark.launch_pipeline([FileSink(path,buffer_size = 16),CollectorSink()])
+            records = np.fromfile(path).reshape((-1,file_sink.nb_columns))
+        self.assertEqual((100,13),np.shape(records))
+        self.assertTrue(np.array_equal(np.arange(100),records[:,0]))
+        self.assertTrue(np.array_equal(collector.results[42]['state'],records[42,2:11]))
+        self.assertEqual(collector.results[42]['nees'],records[42,11])
+
+
+if __name__ == "__main__":
+    unittest.main()
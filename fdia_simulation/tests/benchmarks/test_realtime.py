@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 16:12:55 2026
+
+@author: qde
+"""
+
+import time
+import unittest
+import numpy as np
+from fdia_simulation.models     import PeriodRadar
+from fdia_simulation.filters    import MultiplePeriodRadarsFilterCV
+from fdia_simulation.benchmarks import Benchmark, MeasurementSet, RealTimeReplay
+
+
+class RealTimeReplayTestCase(unittest.TestCase):
+    def setUp(self):
+        self.radars = [PeriodRadar(x=2000,y=2000,dt=0.01),PeriodRadar(x=1000,y=1000,dt=0.02)]
+        self.states = np.array([[i,i/2,i/10]*3 for i in range(100)])
+        self.measurement_set = MeasurementSet.generate(self.radars,self.states,seed = 3)
+        self.radar_filter = MultiplePeriodRadarsFilterCV(radars = self.radars, q = 10.)
+
+    def test_initialization(self):
+        replay = RealTimeReplay(self.radar_filter,self.measurement_set.labeled_values)
+        self.assertEqual([0,1],sorted(replay.streams))
+        self.assertEqual(100,len(replay.streams[0]))
+        self.assertEqual(50 ,len(replay.streams[1]))
+        with self.assertRaises(ValueError):
+            RealTimeReplay(self.radar_filter,[],drop_policy = 'random')
+
+    def test_launch_benchmark(self):
+        # 1 second of measurements replayed in 0.1 second
+        replay = RealTimeReplay(self.radar_filter,self.measurement_set.labeled_values,speed = 10.)
+        report = replay.launch_benchmark()
+        self.assertEqual(150,report['nb_received'])
+        self.assertEqual(150,report['nb_processed'])
+        self.assertEqual(0  ,report['nb_dropped'])
+        self.assertEqual(150,len(replay.estimated_states))
+        self.assertTrue(0 <= report['latency_p50'] <= report['latency_p99'] <= report['latency_max'])
+        self.assertTrue(report['service_time'] > 0)
+        self.assertTrue(report['queue_depth_max'] >= 1)
+
+    def test_same_estimation_as_benchmark(self):
+        # With one radar, the arrival order is the time order
+        radars = [PeriodRadar(x=2000,y=2000,dt=0.01)]
+        measurement_set = MeasurementSet.generate(radars,self.states,seed = 3)
+        benchmark = Benchmark(radars = radars, states = self.states,
+                              radar_filter = MultiplePeriodRadarsFilterCV(radars = radars, q = 10.),
+                              measurement_set = measurement_set)
+        benchmark.process_filter()
+        replay = RealTimeReplay(MultiplePeriodRadarsFilterCV(radars = radars, q = 10.),
+                                measurement_set.labeled_values, speed = 10.)
+        replay.launch_benchmark()
+        self.assertTrue(np.array_equal(benchmark.estimated_states,np.array(replay.estimated_states)))
+
+    def test_dropped_measurements(self):
+        for drop_policy in RealTimeReplay.DROP_POLICIES:
+            replay = RealTimeReplay(self.radar_filter,self.measurement_set.labeled_values,
+                                    speed = 1e6, queue_size = 2, drop_policy = drop_policy)
+            report = replay.launch_benchmark()
+            self.assertEqual(150,report['nb_received'])
+            self.assertTrue(report['nb_dropped'] > 0)
+            self.assertEqual(150,report['nb_processed'] + report['nb_dropped'])
+            self.assertTrue(report['queue_depth_max'] <= 2)
+
+    def test_slow_filter(self):
+        # A filter cycle lasting 20ms cannot follow 150 measurements per second:
+        # the queue fills and drops measurements while the producers keep their
+        # pace (the filter runs out of the event loop)
+        radar_filter = self.radar_filter
+        predict = radar_filter.predict
+        def slow_predict():
+            time.sleep(0.02)
+            predict()
+        radar_filter.predict = slow_predict
+        replay = RealTimeReplay(radar_filter,self.measurement_set.labeled_values,
+                                speed = 1., queue_size = 5)
+        begin  = time.monotonic()
+        report = replay.launch_benchmark()
+        self.assertTrue(time.monotonic() - begin < 1.5)
+        self.assertTrue(report['nb_dropped'] > 50)
+        self.assertEqual(150,report['nb_processed'] + report['nb_dropped'])
+        self.assertTrue(report['service_time'] >= 0.02)
+        self.assertTrue(report['emission_delay_max'] < 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 13:55:21 2026
+
+@author: qde
+"""
+
+import os
+import io
+import json
+import unittest
+import tempfile
+import threading
+import numpy as np
+from contextlib import redirect_stdout
+from fdia_simulation.models            import Radar, PeriodRadar
+from fdia_simulation.filters           import (RadarFilterCA, MultipleRadarsFilterCV,
+                                               MultiplePeriodRadarsFilterCT, RadarIMM)
+from fdia_simulation.attackers         import (DOSAttacker, CumulativeDriftAttacker,
+                                               DriftPeriodAttacker)
+from fdia_simulation.anomaly_detectors import MahalanobisDetector
+from fdia_simulation.benchmarks        import (DEFAULT_SCENARIO, Benchmark, load_scenarios,
+                                               complete_scenario, build_benchmark,
+                                               run_scenario, run_batch, simulate_scenario,
+                                               ProgressMonitor)
+from fdia_simulation.__main__          import main
+
+
+class ScenarioRunnerTestCase(unittest.TestCase):
+    def setUp(self):
+        # Short scenario: 5 seconds of cruise
+        self.scenario = {'name': 'cruise', 'seed': 3,
+                         'trajectory': {'name': 'cruise', 'params': {'t': 5}},
+                         'radars': [{'x': 1000, 'y': 4000}],
+                         'filters': [{'model': 'CA', 'q': 400., 'detector': 'Mahalanobis'}],
+                         'attacker': None}
+
+    def test_complete_scenario(self):
+        scenario = complete_scenario({'trajectory': 'take off'},position = 2)
+        self.assertEqual('scenario002',scenario['name'])
+        self.assertEqual({'name': 'take off'},scenario['trajectory'])
+        self.assertEqual(DEFAULT_SCENARIO['filters'],scenario['filters'])
+        # The default scenario is not modified
+        scenario['filters'].append({})
+        self.assertEqual(4,len(DEFAULT_SCENARIO['filters']))
+        with self.assertRaises(ValueError):
+            complete_scenario({'radar_type': 'Sonar'})
+        with self.assertRaises(ValueError):
+            complete_scenario({'filters': []})
+
+    def test_build_benchmark_single(self):
+        benchmark = build_benchmark(self.scenario)
+        self.assertIsInstance(benchmark,Benchmark)
+        self.assertEqual(500,len(benchmark.states))
+        self.assertIsInstance(benchmark.radars[0],Radar)
+        self.assertIsInstance(benchmark.radar_filter,RadarFilterCA)
+        self.assertIsInstance(benchmark.radar_filter.detector,MahalanobisDetector)
+        self.assertEqual(400.,benchmark.radar_filter.q)
+        # The filter starts on the first position of the trajectory
+        self.assertEqual(benchmark.states[0,0],benchmark.radar_filter.x[0,0])
+        self.assertIsNone(benchmark.attacker)
+
+    def test_build_benchmark_imm(self):
+        benchmark = build_benchmark({'trajectory': 'landing'})
+        self.assertEqual(2,len(benchmark.radars))
+        self.assertEqual(5.,benchmark.radars[0].r_std)
+        self.assertIsInstance(benchmark.radar_filter,RadarIMM)
+        self.assertIsInstance(benchmark.radar_filter.filters[0],MultipleRadarsFilterCV)
+        self.assertIsInstance(benchmark.attacker,CumulativeDriftAttacker)
+        self.assertEqual(300,benchmark.attacker.t0)
+        self.assertTrue(np.allclose(1.,np.sum(benchmark.radar_filter.M,axis = 1),atol = 1e-2))
+
+    def test_build_benchmark_period(self):
+        scenario = dict(self.scenario, radar_type = 'PeriodRadar',
+                        radars = DEFAULT_SCENARIO['radars'],
+                        filters = [{'model': 'CT', 'q': 25.}],
+                        attacker = {'type': 'Constant Drift', 'radar': 1, 't0': 10, 'time': 20,
+                                    'drift': [0,0,5]})
+        benchmark = build_benchmark(scenario)
+        self.assertIsInstance(benchmark.radars[1],PeriodRadar)
+        self.assertEqual(0.05,benchmark.radars[1].dt)
+        self.assertIsInstance(benchmark.radar_filter,MultiplePeriodRadarsFilterCT)
+        self.assertIsInstance(benchmark.attacker,DriftPeriodAttacker)
+        self.assertTrue(np.array_equal([[0],[0],[5]],benchmark.attacker.attack_drift))
+
+    def test_build_benchmark_errors(self):
+        with self.assertRaises(ValueError):
+            build_benchmark(dict(self.scenario, trajectory = 'loop'))
+        with self.assertRaises(ValueError):
+            build_benchmark(dict(self.scenario, filters = [{'model': 'CV', 'q': 1.}]*5))
+
+    def test_run_scenario(self):
+        summary = run_scenario(self.scenario)
+        self.assertEqual('cruise',summary['name'])
+        self.assertEqual(50,summary['nb_steps'])
+        for key in ['anomalies','nees_mean','nees_max','rmse','duration']:
+            self.assertTrue(key in summary)
+        # Same seed, same results
+        self.assertEqual(summary['rmse'],run_scenario(self.scenario)['rmse'])
+
+    def test_run_scenario_attacked(self):
+        attacked = dict(self.scenario, attacker = {'type': 'DOS', 'radar': 0, 't0': 10, 'time': 20})
+        self.assertIsInstance(build_benchmark(attacked).attacker,DOSAttacker)
+        self.assertTrue(run_scenario(attacked)['rmse'] > run_scenario(self.scenario)['rmse'])
+
+    def test_simulate_scenario_progress(self):
+        progress = []
+        monitor = ProgressMonitor(callback = progress.append, every = 20)
+        benchmark, summary = simulate_scenario(self.scenario,monitor = monitor)
+        self.assertFalse(summary['aborted'])
+        self.assertEqual(50,len(benchmark.estimated_states))
+        # Every 20 steps and at the last one
+        self.assertEqual([20,40,50],[report['step'] for report in progress])
+        self.assertEqual(50,progress[-1]['nb_steps'])
+        self.assertTrue(np.allclose(benchmark.estimated_states[-1][[0,3,6]],progress[-1]['position']))
+        self.assertEqual(summary['nees_mean'],run_scenario(self.scenario)['nees_mean'])
+
+    def test_simulate_scenario_cancelled(self):
+        monitor = ProgressMonitor(callback = lambda report: monitor.cancel(), every = 10)
+        benchmark, summary = simulate_scenario(self.scenario,monitor = monitor)
+        self.assertTrue(monitor.cancelled)
+        self.assertTrue(summary['aborted'])
+        self.assertEqual(10,summary['nb_steps'])
+        self.assertEqual(10,len(benchmark.nees))
+
+    def test_progress_monitor_thread(self):
+        # Cancellation requested by another thread before the first cycle
+        monitor = ProgressMonitor(callback = lambda report: None)
+        thread  = threading.Thread(target = monitor.cancel)
+        thread.start()
+        thread.join()
+        self.assertFalse(monitor.update(1.))
+        self.assertTrue(monitor.aborted)
+
+    def test_run_batch(self):
+        scenarios = [dict(self.scenario, name = 'cruise{0}'.format(i), seed = i) for i in range(3)]
+        with tempfile.TemporaryDirectory() as folder:
+            summaries = run_batch(scenarios,output_dir = folder,nb_workers = 2)
+            self.assertEqual(['cruise0','cruise1','cruise2'],[summary['name'] for summary in summaries])
+            with open(os.path.join(folder,'summary.json')) as summary_file:
+                self.assertEqual(summaries,json.load(summary_file))
+            with np.load(os.path.join(folder,'cruise1.npz')) as traces:
+                self.assertEqual((50,9),traces['estimated_states'].shape)
+        # Parallel and serial runs give the same results
+        serial = run_batch(scenarios)
+        self.assertEqual([summary['rmse'] for summary in summaries],
+                         [summary['rmse'] for summary in serial])
+        with self.assertRaises(ValueError):
+            run_batch([self.scenario,self.scenario])
+
+    def test_load_scenarios(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'scenarios.json')
+            with open(path,'w') as scenario_file:
+                json.dump({'defaults': self.scenario,
+                           'scenarios': [{'name': 'a'},{'name': 'b', 'seed': 4}]},scenario_file)
+            scenarios = load_scenarios(path)
+            self.assertEqual(['a','b'],[scenario['name'] for scenario in scenarios])
+            self.assertEqual([3,4],[scenario['seed'] for scenario in scenarios])
+            self.assertEqual(self.scenario['filters'],scenarios[1]['filters'])
+            with open(path,'w') as scenario_file:
+                json.dump(self.scenario,scenario_file)
+            self.assertEqual(1,len(load_scenarios(path)))
+
+    def test_load_scenarios_yaml(self):
+        try:
+            import yaml
+        except ImportError:
+            self.skipTest('PyYAML is not installed')
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'scenarios.yaml')
+            with open(path,'w') as scenario_file:
+                yaml.safe_dump([self.scenario],scenario_file)
+            self.assertEqual('cruise',load_scenarios(path)[0]['name'])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder,'scenarios.json')
+            with open(path,'w') as scenario_file:
+                json.dump([self.scenario],scenario_file)
+            output = os.path.join(folder,'results')
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(0,main([path,'-o',output]))
+            self.assertTrue(os.path.exists(os.path.join(output,'summary.json')))
+            self.assertTrue(os.path.exists(os.path.join(output,'cruise.npz')))
+
+    def test_main_several_files(self):
+        # The unnamed scenarios of different files get different names
+        scenario = {key: value for key,value in self.scenario.items() if key != 'name'}
+        with tempfile.TemporaryDirectory() as folder:
+            paths = [os.path.join(folder,name) for name in ['a.json','b.json']]
+            for path in paths:
+                with open(path,'w') as scenario_file:
+                    json.dump([scenario],scenario_file)
+            output = os.path.join(folder,'results')
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(0,main(paths + ['-o',output]))
+            with open(os.path.join(output,'summary.json')) as summary_file:
+                self.assertEqual(['a000','b000'],[summary['name'] for summary in json.load(summary_file)])
+
+
+if __name__ == "__main__":
+    unittest.main()
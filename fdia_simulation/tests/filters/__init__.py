@@ -11,10 +11,12 @@ __all__ = ["test_filters_ca",
            "test_filters_cv",
            "test_filters_ct",
            "test_filters_ta",
-           "test_filters_model"]
+           "test_filters_model",
+           "test_multi_target_tracker"]
 
 from .test_filters_ca    import *
 from .test_filters_cv    import *
 from .test_filters_ct    import *
 from .test_filters_ta    import *
 from .test_filters_model import *
+from .test_multi_target_tracker import *
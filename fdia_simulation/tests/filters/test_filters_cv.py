@@ -12,7 +12,7 @@ from math                    import sqrt,atan2
 from nose.tools              import raises
 from numpy.linalg            import inv
 from scipy.linalg            import block_diag
-from fdia_simulation.models  import Radar, LabeledMeasurement
+from fdia_simulation.models  import Radar, PeriodRadar, LabeledMeasurement, compute_batch_measurements, tagged2labeled
 from fdia_simulation.filters import RadarFilterCV, MultipleRadarsFilterCV, MultiplePeriodRadarsFilterCV
 
 
@@ -590,5 +590,60 @@ class MultiplePeriodRadarsCVTestCase(unittest.TestCase):
         self.assertTrue(np.allclose(filt.P,new_P))
         self.assertTrue(np.allclose(filt.x,new_X))
 
+    # ==========================================================================
+    # ===================== Out-of-sequence measurements =======================
+
+    def gen_measurements(self):
+        np.random.seed(0)
+        radars = [PeriodRadar(x = 800, y = 800, dt = 0.1), PeriodRadar(x = 200, y = 200, dt = 0.3)]
+        times = np.arange(300) * 0.01
+        positions = np.array([1000., 1000., 8000.]) + np.outer(times, [100., 100., 2.])
+        tagged_values = compute_batch_measurements(radars, positions)[:,1:]
+        return radars, tagged2labeled(tagged_values)
+
+    def run_filter(self, radars, measurements, **kwargs):
+        filt = MultiplePeriodRadarsFilterCV(dim_x = 9, dim_z = 3, q = self.q, radars = radars,
+                                            x0 = 1000, y0 = 1000, z0 = 8000, **kwargs)
+        for measurement in measurements:
+            filt.predict()
+            filt.update(measurement)
+        return filt
+
+    def test_out_of_sequence(self):
+        radars, measurements = self.gen_measurements()
+        expected = self.run_filter(radars, measurements)
+        # Some measurements arrive up to 4 steps late
+        received = list(measurements)
+        for late in [5, 12, 20, 27]:
+            received.insert(late + 4, received.pop(late))
+        filt = self.run_filter(radars, received, history_size = 10)
+        self.assertEqual(4, filt.oosm_counter)
+        self.assertEqual(0, filt.oosm_dropped)
+        self.assertEqual(measurements[-1].time, filt._last_t)
+        self.assertTrue(np.allclose(expected.x, filt.x))
+        self.assertTrue(np.allclose(expected.P, filt.P))
+        self.assertTrue(len(filt._history) <= 10)
+
+    def test_out_of_sequence_dropped(self):
+        radars, measurements = self.gen_measurements()
+        received = list(measurements)
+        received.append(received.pop(5))
+        filt = self.run_filter(radars, received, history_size = 10)
+        # The late measurement is ignored
+        expected = self.run_filter(radars, received[:-1])
+        self.assertEqual(1, filt.oosm_dropped)
+        self.assertTrue(np.allclose(expected.x, filt.x))
+        self.assertTrue(np.allclose(expected.P, filt.P))
+
+    def test_out_of_sequence_disabled(self):
+        radars, measurements = self.gen_measurements()
+        received = list(measurements)
+        received.insert(9, received.pop(5))
+        # Former behavior: the late measurement gives a negative time step
+        filt = self.run_filter(radars, received[:10], history_size = 0)
+        self.assertEqual(0, len(filt._history))
+        self.assertEqual(0, filt.oosm_counter)
+        self.assertTrue(filt.dt < 0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 15:41:07 2026
+
+@author: qde
+"""
+
+import unittest
+import numpy as np
+from fdia_simulation.models  import Radar, Track
+from fdia_simulation.filters import (RadarFilterCV, RadarFilterCA, MultiTargetTracker, TargetTrack,
+                                     measurement_predictions, measurement_jacobians,
+                                     wrap_innovations, spatial_candidates)
+
+
+class MultiTargetTrackerTestCase(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.radar  = Radar(x = 0, y = 0, dt = 1., r_std = 5., theta_std = 1e-5, phi_std = 1e-5)
+        self.starts = np.random.uniform([-20000,-20000,2000],[20000,20000,9000],(8,3))
+        self.velocities = np.random.uniform(-200,200,(8,3))
+        self.velocities[:,2] = 0
+
+    def positions(self,time):
+        return self.starts + self.velocities * time
+
+    def gen_scan(self,radar,time,nb_clutter = 0):
+        '''
+        Noisy measurements of the targets (in their order) followed by the
+        clutter measurements.
+        '''
+        zs  = np.column_stack(radar.gen_radar_values(*self.positions(time).T))
+        zs += np.random.randn(*zs.shape) * np.sqrt(np.diag(radar.R))
+        clutter = np.column_stack((np.random.uniform(0,40000,nb_clutter),
+                                   np.random.uniform(-np.pi,np.pi,nb_clutter),
+                                   np.random.uniform(0,0.5,nb_clutter)))
+        return np.vstack((zs,clutter))
+
+    def assert_tracked(self,tracker,time,max_error = 150.):
+        '''
+        Every target has a confirmed track and the tracks confirmed for a while
+        follow a target.
+        '''
+        positions = self.positions(time)
+        tracks    = tracker.confirmed_tracks
+        errors    = np.array([np.linalg.norm(positions - track.position,axis = 1) for track in tracks])
+        self.assertTrue(np.all(np.min(errors,axis = 0) < max_error))
+        for track,track_errors in zip(tracks,errors):
+            if track.nb_scans >= 10:
+                self.assertTrue(np.min(track_errors) < max_error)
+
+    def test_measurement_functions(self):
+        cv = RadarFilterCV(q = 1., radar = self.radar)
+        positions = self.starts[:3]
+        predictions = measurement_predictions(positions,self.radar.get_position())
+        jacobians   = measurement_jacobians(positions,self.radar.get_position())
+        for position,prediction,H in zip(positions,predictions,jacobians):
+            X = np.zeros((9,1))
+            X[[0,3,6],0] = position
+            self.assertTrue(np.allclose(cv.hx(X)[:,0],prediction))
+            self.assertTrue(np.allclose(cv.HJacob(X),H))
+
+    def test_wrap_innovations(self):
+        innovations = wrap_innovations([[1.,2*np.pi - 0.1,0.1],[1.,-0.2,0.]])
+        self.assertTrue(np.allclose([[1.,-0.1,0.1],[1.,-0.2,0.]],innovations))
+
+    def test_invalid_association(self):
+        with self.assertRaises(ValueError):
+            MultiTargetTracker([self.radar],association = 'MHT')
+
+    def test_gnn(self):
+        tracker = MultiTargetTracker([self.radar])
+        first_associations = None
+        for k in range(30):
+            associations = tracker.process_scan(self.gen_scan(self.radar,k),time = k)
+            if k == 5:
+                first_associations = associations
+        self.assert_tracked(tracker,29)
+        self.assertEqual(8,len(tracker.estimates()))
+        # Each track keeps its target
+        self.assertEqual(first_associations,associations)
+        self.assertEqual(0,len(tracker.terminated_tracks))
+        self.assertEqual(30,len(tracker.tracks[0].states))
+
+    def test_clutter(self):
+        clutter_density = 10 / (40000 * 2*np.pi * 0.5)
+        for association in ['GNN','JPDA']:
+            np.random.seed(1)
+            tracker = MultiTargetTracker([self.radar],association = association,
+                                         clutter_density = clutter_density)
+            for k in range(40):
+                tracker.process_scan(self.gen_scan(self.radar,k,nb_clutter = np.random.poisson(10)),time = k)
+            self.assert_tracked(tracker,39)
+            # The tracks initiated on the targets (first measurements of the
+            # first scan) are never lost
+            confirmed_ids = [track.track_id for track in tracker.confirmed_tracks]
+            self.assertTrue(all(track_id in confirmed_ids for track_id in range(8)))
+
+    def test_two_radars(self):
+        radars  = [self.radar, Radar(x = 5000, y = -3000, dt = 1., r_std = 5., theta_std = 1e-5, phi_std = 1e-5)]
+        tracker = MultiTargetTracker(radars,filter_class = RadarFilterCA,q = 10.)
+        for k in range(40):
+            tag = k % 2
+            tracker.process_scan(self.gen_scan(radars[tag],k/2),tag = tag,time = k/2)
+        self.assert_tracked(tracker,19.5)
+
+    def test_scans_in_time_order(self):
+        tracker = MultiTargetTracker([self.radar])
+        tracker.process_scan(self.gen_scan(self.radar,0),time = 0)
+        tracker.process_scan(self.gen_scan(self.radar,2),time = 2)
+        states = [track.filter.x.copy() for track in tracker.tracks]
+        with self.assertRaises(ValueError):
+            tracker.process_scan(self.gen_scan(self.radar,1),time = 1)
+        # The tracks are not updated with the late scan
+        self.assertTrue(all(np.array_equal(x,track.filter.x) for x,track in zip(states,tracker.tracks)))
+        self.assertEqual(2,tracker.time)
+        # Scans at the same time (e.g. several radars) are accepted
+        tracker.process_scan(self.gen_scan(self.radar,2),time = 2)
+        self.assertTrue(all(isinstance(track,TargetTrack) for track in tracker.tracks))
+        self.assertFalse(TargetTrack is Track)
+
+    def test_track_deletion(self):
+        tracker = MultiTargetTracker([self.radar],max_misses = 3)
+        for k in range(10):
+            tracker.process_scan(self.gen_scan(self.radar,k),time = k)
+        self.assertEqual(8,len(tracker.confirmed_tracks))
+        # The targets disappear, then the scans are empty
+        for k in range(10,12):
+            tracker.process_scan(np.zeros((0,3)),time = k)
+        self.assertEqual(8,len(tracker.confirmed_tracks))
+        tracker.process_scan([],time = 12)
+        self.assertEqual(0,len(tracker.tracks))
+        self.assertEqual(8,len(tracker.terminated_tracks))
+
+    def test_spatial_candidates(self):
+        centers = np.array([[0.,0.,0.],[100.,0.,0.]])
+        points  = np.array([[5.,0.,0.],[95.,0.,0.],[50.,0.,0.],[1000.,0.,0.]])
+        centers_indices, points_indices = spatial_candidates(centers,[10.,60.],points)
+        self.assertEqual([(0,0),(1,1),(1,2)],sorted(zip(centers_indices,points_indices)))
+        self.assertEqual(0,len(spatial_candidates(centers,[10.,10.],np.zeros((0,3)))[0]))
+
+    def test_spatial_index(self):
+        # The coarse gating does not change the results of the exact gate
+        trackers = [MultiTargetTracker([self.radar],association = 'JPDA',spatial_index = spatial_index)
+                    for spatial_index in [True,False]]
+        for k in range(15):
+            zs = self.gen_scan(self.radar,k,nb_clutter = 10)
+            for tracker in trackers:
+                tracker.process_scan(zs,time = k)
+        estimates = [tracker.estimates() for tracker in trackers]
+        self.assertEqual(estimates[0].keys(),estimates[1].keys())
+        for track_id in estimates[0]:
+            self.assertTrue(np.allclose(estimates[0][track_id],estimates[1][track_id]))
+        # Same gated pairs, fewer tested pairs
+        tracker = trackers[0]
+        gates = tracker.compute_gates(tracker.tracks,zs,self.radar)
+        tracker.spatial_index = False
+        self.assertTrue(np.array_equal(gates[1],tracker.compute_gates(tracker.tracks,zs,self.radar)[1]))
+        tracker.spatial_index = True
+        positions = np.array([track.position for track in tracker.tracks])
+        track_indices, _ = tracker.candidate_pairs(positions,gates[4],gates[5],zs,self.radar)
+        self.assertTrue(len(track_indices) < len(tracker.tracks) * len(zs) / 4)
+
+    def test_gate_clusters(self):
+        clusters = MultiTargetTracker.gate_clusters(np.array([0,1,1,3]),np.array([0,0,2,1]),4,3)
+        self.assertEqual(2,len(clusters))
+        tracks, measurements, pairs = clusters[0]
+        self.assertEqual([0,1],list(tracks))
+        self.assertEqual([0,2],list(measurements))
+        self.assertEqual([0,1,2],list(pairs))
+        self.assertEqual([3],list(clusters[1][0]))
+
+    def test_association_probabilities(self):
+        tracker = MultiTargetTracker([self.radar],association = 'JPDA')
+        distances = np.array([[1.,4.,50.],
+                              [3.,1.,2.],
+                              [50.,50.,50.]])
+        S = np.tile(np.eye(3),(3,1,1))
+        betas, beta0s = tracker.association_probabilities(distances,S)
+        self.assertTrue(np.allclose(1.,np.sum(betas,axis = 1)[:2] + beta0s[:2]))
+        self.assertTrue(np.all(np.sum(betas,axis = 0) <= 1.))
+        # Nothing in the gate of the last track
+        self.assertEqual(1.,beta0s[2])
+        self.assertEqual(0.,betas[0,2])
+        self.assertTrue(betas[0,0] > betas[0,1] and betas[1,1] > betas[1,0])
+        # The approximation follows the exact probabilities
+        tracker.max_hypotheses = 1
+        approximated, _ = tracker.association_probabilities(distances,S)
+        self.assertTrue(np.allclose(betas,approximated,atol = 0.1))
+
+    def test_association_probabilities_clusters(self):
+        # Each cluster of gate_clusters() is solved alone as process_scan() does
+        tracker   = MultiTargetTracker([self.radar],association = 'JPDA')
+        distances = np.full((4,4),50.)
+        distances[:2,:2] = [[1.,4.],[3.,1.]]
+        distances[2:,2:] = [[2.,5.],[6.,1.]]
+        S = np.tile(np.eye(3),(4,1,1))
+        betas, beta0s = tracker.association_probabilities(distances,S)
+        for block in (slice(0,2),slice(2,4)):
+            cluster_betas, cluster_beta0s = tracker.association_probabilities(distances[block,block],S[block])
+            self.assertTrue(np.allclose(betas[block,block],cluster_betas))
+            self.assertTrue(np.allclose(beta0s[block],cluster_beta0s))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 10:02:44 2026
+
+@author: qde
+"""
+
+from __future__ import absolute_import
+
+__all__ = ["test_results_store",
+           "test_decimation",
+           "test_csv_writer"]
+
+from .test_results_store import *
+from .test_decimation    import *
+from .test_csv_writer    import *
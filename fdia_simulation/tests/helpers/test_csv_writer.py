@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 09:14:02 2026
+
+@author: qde
+"""
+
+import os
+import unittest
+import tempfile
+from fdia_simulation.helpers import CSVWriter
+
+
+class CSVWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.writer = CSVWriter(os.path.join(self.directory.name,'results.csv'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_rows(self):
+        self.writer.write_rows([('CA-1Radar','3200'),('CV-1Radar','300')])
+        self.writer.write_row('CT-1Radar','50')
+        with open(self.writer.filename) as csv_file:
+            lines = csv_file.read().splitlines()
+        self.assertEqual(['CA-1Radar,3200','CV-1Radar,300','CT-1Radar,50'],lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
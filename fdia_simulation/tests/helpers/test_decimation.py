@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 11:02:15 2026
+
+@author: qde
+"""
+
+import unittest
+import numpy as np
+from fdia_simulation.helpers import (minmax_envelope, stride_indices, spatial_subsample,
+                                     EnvelopeBuffer)
+
+
+class DecimationTestCase(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.values = np.random.randn(10001)
+        self.values[1234] = 50.
+        self.values[8765] = -50.
+
+    def test_minmax_envelope(self):
+        indices, values = minmax_envelope(self.values, max_points = 500)
+        self.assertTrue(len(indices) <= 500)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertTrue(np.array_equal(self.values[indices], values))
+        # The peaks are kept
+        self.assertTrue(1234 in indices and 8765 in indices)
+        self.assertEqual(50., np.max(values))
+        # Short series are not decimated, column vectors are flattened
+        indices, values = minmax_envelope(self.values[:100, None], max_points = 500)
+        self.assertTrue(np.array_equal(np.arange(100), indices))
+        self.assertEqual((100,), values.shape)
+
+    def test_stride_indices(self):
+        self.assertTrue(np.array_equal([0, 3, 6, 9], stride_indices(10, 4)))
+        self.assertTrue(np.array_equal(np.arange(5), stride_indices(5, 10)))
+
+    def test_spatial_subsample(self):
+        t = np.linspace(0, 100, 100000)
+        points = np.column_stack((1000 * np.cos(t), 1000 * np.sin(t), t))
+        points[10] = [1e5, 0, 0]
+        points[20] = [np.nan, 0, 0]
+        indices = spatial_subsample(points, max_points = 2000)
+        self.assertTrue(0 < len(indices) <= 2000)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        # The outlier is kept, the non-finite point is dropped
+        self.assertTrue(10 in indices)
+        self.assertFalse(20 in indices)
+        self.assertTrue(np.array_equal([0, 1, 3], spatial_subsample(points[[0, 1, 20, 3]])))
+
+    def test_envelope_buffer(self):
+        envelope = EnvelopeBuffer(max_points = 500)
+        for value in self.values:
+            envelope.append(value)
+        indices, values = envelope.get()
+        self.assertEqual(len(self.values), envelope.nb_values)
+        self.assertTrue(len(indices) <= 500)
+        self.assertTrue(envelope.bucket_size > 1)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertTrue(np.array_equal(self.values[indices], values))
+        self.assertTrue(1234 in indices and 8765 in indices)
+        # The last sample is part of the envelope of the last bucket
+        self.assertTrue(indices[-1] >= len(self.values) - envelope.bucket_size)
+
+    def test_envelope_buffer_short(self):
+        envelope = EnvelopeBuffer()
+        for value in [3., 1., 2.]:
+            envelope.append(value)
+        indices, values = envelope.get()
+        self.assertTrue(np.array_equal([0, 1, 2], indices))
+        self.assertTrue(np.array_equal([3., 1., 2.], values))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 10:03:18 2026
+
+@author: qde
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+from fdia_simulation.models            import Radar
+from fdia_simulation.filters           import RadarFilterCA
+from fdia_simulation.anomaly_detectors import MahalanobisDetector
+from fdia_simulation.benchmarks        import Benchmark
+from fdia_simulation.helpers           import ResultsStore, benchmark_traces
+
+
+class ResultsStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path  = os.path.join(self.directory.name,'store')
+        self.store = ResultsStore(self.path, chunk_size = 2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def gen_traces(self,i):
+        return {'nees'  : np.full((i+1,1),float(i)),
+                'states': np.full((i+1,9),float(i))}
+
+    def test_add_run_bulk_writes(self):
+        self.store.add_run(self.gen_traces(0), model = 'CA')
+        self.assertEqual(0,len(self.store.chunk_files()))
+        self.store.add_run(self.gen_traces(1), model = 'CV')
+        self.assertEqual(1,len(self.store.chunk_files()))
+        self.store.add_run(self.gen_traces(2), model = 'CA')
+        self.store.flush()
+        self.assertEqual(2,len(self.store.chunk_files()))
+        self.assertEqual(3,self.store.nb_runs)
+
+    def test_load(self):
+        with self.store:
+            for i in range(5):
+                self.store.add_run(self.gen_traces(i), model = 'CA' if i%2 else 'CV', q = np.float64(i))
+        store = ResultsStore(self.path)
+        self.assertEqual(5,store.nb_runs)
+        self.assertEqual([1,3],store.query(model = 'CA'))
+        self.assertEqual([4],store.query(model = 'CV', q = 4.))
+        nees = store.load_trace('nees',[1,4])
+        self.assertEqual([1,4],sorted(nees))
+        self.assertTrue(np.array_equal(self.gen_traces(4)['nees'],nees[4]))
+        run = store.load_run(3)
+        self.assertTrue(np.array_equal(self.gen_traces(3)['states'],run['states']))
+        self.assertEqual(5,len(store.load_trace('states')))
+        with self.assertRaises(KeyError):
+            store.load_run(10)
+
+    def test_load_run_empty_store(self):
+        with self.assertRaises(KeyError):
+            self.store.load_run(0)
+
+    def test_reopened_store_appends(self):
+        with self.store:
+            self.store.add_run(self.gen_traces(0))
+        with ResultsStore(self.path) as store:
+            self.assertEqual(1,store.add_run(self.gen_traces(1)))
+        self.assertEqual([0,1],[metadata['run_id'] for metadata in ResultsStore(self.path).load_metadata()])
+
+    def test_concurrent_writers(self):
+        other = ResultsStore(self.path, chunk_size = 2)
+        with other:
+            other.add_run(self.gen_traces(1), worker = 1)
+        # The chunk of the other writer is written after this one listed the chunks
+        self.store.chunk_files = lambda: []
+        with self.store:
+            self.store.add_run(self.gen_traces(0), worker = 0)
+        store = ResultsStore(self.path)
+        self.assertEqual(2,len(store.chunk_files()))
+        self.assertEqual([0,1],sorted(metadata['worker'] for metadata in store.load_metadata()))
+        self.assertFalse(any(name.startswith('tmp-') for name in os.listdir(self.path)))
+
+    def test_schema(self):
+        self.store.add_run(self.gen_traces(0))
+        with self.assertRaises(ValueError):
+            self.store.add_run({'nees': np.zeros((3,1))})
+        with self.assertRaises(ValueError):
+            self.store.add_run({'nees': np.zeros((3,2)), 'states': np.zeros((3,9))})
+
+    def test_add_benchmark(self):
+        radar = Radar(x=2000,y=2000)
+        radar.step = 1
+        states = np.array([[i,i/2,i/10]*3 for i in range(50)])
+        radar_filter = RadarFilterCA(dim_x = 9, dim_z = 3, q = 100., radar = radar,
+                                     detector = MahalanobisDetector())
+        benchmark = Benchmark(radars = radar, radar_filter = radar_filter, states = states)
+        benchmark.gen_data_set()
+        benchmark.process_filter(with_nees = True)
+        traces = benchmark_traces(benchmark)
+        self.assertEqual(['detector0_results','detector0_values','estimated_states','nees','state_ids'],
+                         sorted(traces))
+        run_id = self.store.add_benchmark(benchmark, model = 'CA')
+        self.store.flush()
+        run = self.store.load_run(run_id)
+        self.assertTrue(np.array_equal(benchmark.estimated_states,run['estimated_states']))
+        self.assertEqual(bool,run['detector0_results'].dtype)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,9 +10,11 @@ from __future__ import absolute_import
 __all__ = ["test_maneuvered_airplane",
            "test_maneuvered_bicycle",
            "test_maneuvered_system",
-           "test_radar"]
+           "test_radar",
+           "test_replay"]
 
 from .test_maneuvered_airplane import *
 from .test_maneuvered_bicycle  import *
 from .test_maneuvered_system       import *
 from .test_radar               import *
+from .test_replay              import *
@@ -8,7 +8,8 @@ Created on Mon Jun 24 10:20:16 2019
 import unittest
 import numpy as np
 from math                   import sqrt,atan2, isclose
-from fdia_simulation.models import Radar, PeriodRadar
+from fdia_simulation.models import (Radar, PeriodRadar, LabeledMeasurement, tagged2labeled,
+                                    compute_batch_measurements)
 
 class RadarTestCase(unittest.TestCase):
     def setUp(self):
@@ -94,6 +95,57 @@ class RadarTestCase(unittest.TestCase):
         self.assertTrue(np.allclose(position_data,computed_position_data))
 
 
+    # ==========================================================================
+    # ============================ Scan generation =============================
+    def test_gen_scan_detections(self):
+        np.random.seed(0)
+        positions = np.array([[1000., 2000., 3000.], [-5000., 100., 800.]])
+        measurements, target_ids = self.radar.gen_scan(positions)
+        self.assertEqual((2,3), measurements.shape)
+        self.assertTrue(np.array_equal([0,1], target_ids))
+        expected = np.column_stack(self.radar.gen_radar_values(*positions.T))
+        stds = [self.radar.r_std, self.radar.theta_std, self.radar.phi_std]
+        self.assertTrue(np.all(np.abs(expected - measurements) < 5 * np.array(stds)))
+        # Out of range targets are not detected
+        self.radar.max_range = 4000.
+        _, target_ids = self.radar.gen_scan(positions)
+        self.assertTrue(np.array_equal([0], target_ids))
+
+    def test_gen_scan_elevation(self):
+        np.random.seed(0)
+        self.radar.max_elevation = 0.5
+        # Above the horizon, under the ground and above max_elevation
+        positions = np.array([[5000., 0., 1000.], [5000., 0., -1000.], [1000., 0., 5000.]])
+        _, target_ids = self.radar.gen_scan(positions)
+        self.assertTrue(np.array_equal([0], target_ids))
+        rs, _, phis = self.radar.gen_radar_values(*positions.T)
+        self.assertTrue(np.array_equal([True, False, False], self.radar.in_field_of_view(rs, phis)))
+
+    def test_gen_scan_detection_probability(self):
+        np.random.seed(0)
+        self.radar.detection_probability = 0.7
+        positions = np.random.uniform(-10000, 10000, (10000,3))
+        positions[:,2] = np.abs(positions[:,2])
+        _, target_ids = self.radar.gen_scan(positions)
+        self.assertTrue(abs(len(target_ids) / 10000 - 0.7) < 0.02)
+        self.assertTrue(np.all(np.diff(target_ids) > 0))
+
+    def test_gen_clutter(self):
+        np.random.seed(0)
+        self.assertEqual(0, len(self.radar.gen_clutter(10)[0]))
+        self.radar.clutter_rate  = 20.
+        self.radar.max_range     = 40000.
+        self.radar.max_elevation = 0.5
+        scan_indices, clutter = self.radar.gen_clutter(1000)
+        self.assertTrue(abs(len(clutter) / 1000 - 20.) < 0.5)
+        self.assertTrue(np.all(np.diff(scan_indices) >= 0))
+        self.assertTrue(np.all((clutter >= [0., -np.pi, 0.]) & (clutter <= [40000., np.pi, 0.5])))
+        self.assertTrue(isclose(20. / (40000. * 2*np.pi * 0.5), self.radar.clutter_density))
+        measurements, target_ids = self.radar.gen_scan([[3000., 2000., 1000.]])
+        self.assertEqual(len(measurements), len(target_ids))
+        self.assertEqual(0, target_ids[0])
+        self.assertTrue(np.all(target_ids[1:] == -1))
+
     # def test_sense(self):
     #     radar_data = np.array([[0, 0, 0],[1, 1, 1],[2, 2, 2],[3, 3, 3],[4, 4, 4],
     #                            [5, 5, 5],[6, 6, 6],[7, 7, 7],[8, 8, 8],[9, 9, 9]])
@@ -130,5 +182,73 @@ class PeriodRadarTestCase(RadarTestCase):
          for labeled_meas in labeled_measurements:
              self.assertEqual(labeled_meas.tag, self.radar.tag)
 
+    def test_compute_tagged_measurements(self):
+         position_data = np.array([[i, i, i] for i in range(10)])
+         self.radar.tag = 1
+         tagged_values = self.radar.compute_tagged_measurements(position_data)
+         self.assertEqual(np.shape(tagged_values),(10,5))
+         self.assertTrue(all(tagged_values[:,0] == self.radar.tag))
+         self.assertEqual(tagged_values[0,1], 0)
+
+    def test_tagged2labeled(self):
+         tagged_values = np.array([[1, 0.5, 10., 0.1, 0.2]])
+         labeled_measurements = tagged2labeled(tagged_values)
+         expected = LabeledMeasurement(tag = 1, time = 0.5, value = np.array([[10., 0.1, 0.2]]).T)
+         self.assertEqual(labeled_measurements, [expected])
+
+class BatchMeasurementsTestCase(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.radars = [Radar(x = 200, y = 200, dt = 0.1, r_std = 1e-6, theta_std = 1e-9, phi_std = 1e-9),
+                       PeriodRadar(x = -3000, y = 1000, dt = 0.4, r_std = 1e-6, theta_std = 1e-9,
+                                   phi_std = 1e-9, time_std = 0.)]
+        times = np.arange(100) * 0.01
+        starts = np.array([[1000., 2000., 3000.], [-5000., 100., 800.], [0., -4000., 2000.]])
+        self.positions = starts[:, None, :] + 100 * times[None, :, None]
+
+    def test_batch_measurements(self):
+        measurements = compute_batch_measurements(self.radars, self.positions)
+        # 10 scans of the first radar and 3 of the second one for 3 targets
+        self.assertEqual((3 * (10 + 3), 6), measurements.shape)
+        self.assertTrue(np.all(np.diff(measurements[:, 2]) >= 0))
+        for target in range(3):
+            for tag, radar in enumerate(self.radars):
+                rows = measurements[(measurements[:, 0] == target) & (measurements[:, 1] == tag)]
+                sampled = self.positions[target, ::int(radar.step)]
+                expected = np.column_stack(radar.gen_radar_values(*sampled.T))
+                self.assertTrue(np.allclose(expected, rows[:, 3:]))
+                self.assertTrue(np.allclose(np.arange(len(rows)) * radar.dt, rows[:, 2]))
+        # The rows of a target are tagged measurements
+        rows = measurements[measurements[:, 0] == 1][:, 1:]
+        labeled_measurements = tagged2labeled(rows)
+        self.assertEqual(len(rows), len(labeled_measurements))
+        self.assertEqual({0, 1}, {measurement.tag for measurement in labeled_measurements})
+
+    def test_batch_single_target(self):
+        measurements = compute_batch_measurements(self.radars[0], self.positions[0])
+        self.assertEqual((10, 6), measurements.shape)
+        self.assertTrue(np.all(measurements[:, :2] == 0))
+
+    def test_batch_detections_clutter(self):
+        for radar in self.radars:
+            radar.detection_probability = 0.5
+            radar.clutter_rate = 4.
+        positions = np.repeat(self.positions, 100, axis = 0)
+        measurements = compute_batch_measurements(self.radars, positions)
+        targets = measurements[:, 0]
+        self.assertTrue(abs(np.sum(targets >= 0) / (300 * 13) - 0.5) < 0.03)
+        # 4 clutter returns per scan on average
+        self.assertTrue(abs(np.sum(targets == -1) / 13 - 4.) < 1.5)
+        self.assertTrue(np.all(np.diff(measurements[:, 2]) >= 0))
+
+    def test_batch_elevation(self):
+        self.radars[1].max_elevation = 0.5
+        # The first target is seen under an elevation of about 0.63 by the second radar
+        measurements = compute_batch_measurements(self.radars, self.positions)
+        rows = measurements[measurements[:, 1] == 1]
+        self.assertEqual(2 * 3, len(rows))
+        self.assertTrue(np.all(rows[:, 0] > 0))
+        self.assertEqual(3 * 10, np.sum(measurements[:, 1] == 0))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 11:52:06 2026
+
+@author: qde
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+from fdia_simulation.models     import (PeriodRadar, LabeledMeasurement, MeasurementReplay,
+                                        record_measurements, tagged2labeled)
+from fdia_simulation.filters    import MultiplePeriodRadarsFilterCV
+from fdia_simulation.benchmarks import Benchmark, MeasurementSet
+
+
+class MeasurementReplayTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tagged_values = np.array([[0, 0.01, 10., 0.1, 0.2],
+                                       [1, 0.02, 20., 0.3, 0.4],
+                                       [0, 0.03, 30., 0.5, 0.6]])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def gen_path(self,name):
+        return os.path.join(self.directory.name,name)
+
+    def test_replay_raw_file(self):
+        path = self.gen_path('stream.bin')
+        record_measurements(path,self.tagged_values)
+        replay = MeasurementReplay(path)
+        self.assertEqual(3,len(replay))
+        self.assertEqual(tagged2labeled(self.tagged_values),list(replay))
+
+    def test_replay_npy_file(self):
+        path = self.gen_path('stream.npy')
+        record_measurements(path,self.tagged_values)
+        replay = MeasurementReplay(path)
+        self.assertTrue(np.array_equal(self.tagged_values,replay.tagged_values))
+        measurement = next(iter(replay))
+        self.assertIsInstance(measurement,LabeledMeasurement)
+        self.assertEqual((3,1),np.shape(measurement.value))
+
+    def test_iter_chunks_zero_copy(self):
+        path = self.gen_path('stream.bin')
+        record_measurements(path,self.tagged_values)
+        replay = MeasurementReplay(path, chunk_size = 2)
+        chunks = list(replay.iter_chunks())
+        self.assertEqual([2,1],[len(chunk) for chunk in chunks])
+        self.assertTrue(all(np.shares_memory(chunk,replay.tagged_values) for chunk in chunks))
+        self.assertFalse(chunks[0].flags.writeable)
+        self.assertEqual(1,len(list(replay.iter_chunks(start = 1, stop = 2))[0]))
+
+    def test_wrong_recording(self):
+        path = self.gen_path('stream.bin')
+        np.zeros(7).tofile(path)
+        with self.assertRaises(ValueError):
+            MeasurementReplay(path)
+        with self.assertRaises(ValueError):
+            record_measurements(path,np.zeros((3,4)))
+
+    def test_process_filter_replay(self):
+        radars = [PeriodRadar(x=2000,y=2000,dt=0.01),PeriodRadar(x=1000,y=1000,dt=0.02)]
+        states = np.array([[i,i/2,i/10]*3 for i in range(100)])
+        measurement_set = MeasurementSet.generate(radars,states,seed = 3)
+        path = self.gen_path('stream.bin')
+        record_measurements(path,measurement_set.tagged_values)
+        benchmarks = [Benchmark(radars = radars, states = states,
+                                radar_filter = MultiplePeriodRadarsFilterCV(radars = radars, q = 10.))
+                      for _ in range(2)]
+        benchmarks[0].process_filter(measurements = measurement_set.labeled_values, with_nees = True)
+        benchmarks[1].process_filter(measurements = MeasurementReplay(path, chunk_size = 16), with_nees = True)
+        self.assertTrue(np.array_equal(benchmarks[0].estimated_states,benchmarks[1].estimated_states))
+        self.assertTrue(np.array_equal(benchmarks[0].nees,benchmarks[1].nees))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 09:17:35 2026
+
+@author: qde
+"""
+
+import os
+import sys
+import json
+import unittest
+import subprocess
+import fdia_simulation
+
+# Import time of each subpackage in a fresh interpreter (seconds). The
+# budget is generous: it catches a heavy library imported at module level,
+# not small variations.
+IMPORT_BUDGET = 3.
+
+# Libraries only needed by the plotting and the sympy examples
+LAZY_MODULES = ['matplotlib','sympy']
+
+CHECK_IMPORT = '''
+import sys, json, time
+begin = time.perf_counter()
+import {0}
+print(json.dumps({{"duration": time.perf_counter() - begin,
+                  "modules": [name for name in {1} if name in sys.modules]}}))
+'''
+
+def measure_import(module):
+    '''
+    Imports a module in a new interpreter.
+    Returns
+    -------
+    result: dictionary
+        "duration" of the import (seconds) and list of the LAZY_MODULES that
+        were imported ("modules").
+    '''
+    # The package is imported from the same folder as the tests
+    root = os.path.dirname(os.path.dirname(os.path.abspath(fdia_simulation.__file__)))
+    env  = dict(os.environ, PYTHONPATH = os.pathsep.join([root,os.environ.get('PYTHONPATH','')]))
+    output = subprocess.check_output([sys.executable,'-c',CHECK_IMPORT.format(module,LAZY_MODULES)],
+                                     env = env)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_lazy_imports(self):
+        for module in ['fdia_simulation.models','fdia_simulation.filters',
+                       'fdia_simulation.anomaly_detectors','fdia_simulation.attackers',
+                       'fdia_simulation.helpers','fdia_simulation.benchmarks']:
+            result = measure_import(module)
+            self.assertEqual([],result['modules'],module)
+
+    def test_import_budget(self):
+        result = measure_import('fdia_simulation.benchmarks')
+        self.assertTrue(result['duration'] < IMPORT_BUDGET,
+                        'Import time: {0:.2f}s'.format(result['duration']))
+
+
+if __name__ == "__main__":
+    unittest.main()